@@ -0,0 +1,6 @@
+"""
+Benchmarks for the cache, rate limiter, queue and load balancer implementations
+
+Run from the repository root, e.g.:
+    python -m benchmarks.concurrent_lru_throughput
+"""
@@ -0,0 +1,69 @@
+"""
+Tail latency of load balancers over backends of different speeds (simulated)
+
+Runs system_design.lb_simulator: Poisson arrivals are routed by each
+balancer to single-worker FIFO backends with exponential service times.
+--slow of the --servers backends are --slowdown times slower. The arrival
+rate is --load times the combined capacity, so a balancer that ignores
+speed overloads the slow backends long before the pool as a whole is busy.
+Every balancer sees the same arrival and service-time stream.
+"""
+
+import argparse
+import random
+
+from system_design.lb_simulator import Backend, exponential, poisson_arrivals, simulate
+from system_design.load_balancer import (
+    LeastConnectionsBalancer, PowerOfTwoChoicesBalancer, RoundRobinBalancer
+)
+
+KINDS = ("round-robin", "least-conn", "p2c-peak-ewma")
+
+
+def run(kind: str, servers: int, slow: int, slowdown: float, load: float,
+        requests: int, service_ms: float, seed: int = 0) -> dict:
+    means = [service_ms / 1000 * (slowdown if i < slow else 1) for i in range(servers)]
+    backends = [Backend(f"server-{i}", exponential(mean)) for i, mean in enumerate(means)]
+    arrivals = poisson_arrivals(load * sum(1 / mean for mean in means), requests, seed=seed)
+    pool = []
+
+    def balancer(servers, clock):
+        pool.extend(servers)  # kept to count requests sent to the slow backends
+        if kind == "round-robin":
+            return RoundRobinBalancer(servers)
+        if kind == "least-conn":
+            return LeastConnectionsBalancer(servers)
+        return PowerOfTwoChoicesBalancer(servers, clock=clock, rng=random.Random(seed))
+
+    result = simulate(balancer, backends, arrivals, seed=seed + 1)
+    to_slow = sum(server.total_requests for server in pool[:slow])
+    return {"p50": result.response_time["p50"] * 1000,
+            "p99": result.response_time["p99"] * 1000,
+            "p999": result.response_time["p999"] * 1000,
+            "slow_share": to_slow / requests}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", type=int, default=10)
+    parser.add_argument("--slow", type=int, default=2, help="how many backends are slow")
+    parser.add_argument("--slowdown", type=float, default=5.0)
+    parser.add_argument("--service-ms", type=float, default=10.0, help="fast backend mean")
+    parser.add_argument("--load", type=float, nargs="+", default=[0.5, 0.7, 0.9])
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    fair = args.slow / args.slowdown / (args.servers - args.slow + args.slow / args.slowdown)
+    print(f"{args.servers} backends, {args.slow} of them {args.slowdown:g}x slower, "
+          f"{args.requests:,} requests (capacity-proportional slow share {fair:.1%})")
+    print(f"{'load':>5} {'balancer':>13} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9} {'to slow':>8}")
+    for load in args.load:
+        for kind in KINDS:
+            r = run(kind, args.servers, args.slow, args.slowdown, load,
+                    args.requests, args.service_ms)
+            print(f"{load:>5.0%} {kind:>13} {r['p50']:>9.1f} {r['p99']:>9.1f} "
+                  f"{r['p999']:>9.1f} {r['slow_share']:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
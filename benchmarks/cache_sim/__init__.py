@@ -0,0 +1,15 @@
+"""
+Cache trace simulator
+
+Streams key-access traces (generated Zipf/uniform/loop/scan, or a file of
+keys) through any cache with get/put and reports hit ratio, ops/sec,
+p50/p99 op latency and peak memory as JSON.
+
+    python -m benchmarks.cache_sim --cache lru lfu w-tinylfu --trace zipf scan
+"""
+
+from benchmarks.cache_sim.adapters import CACHES, Cache, resolve
+from benchmarks.cache_sim.runner import simulate
+from benchmarks.cache_sim.traces import GENERATORS
+
+__all__ = ["CACHES", "Cache", "GENERATORS", "resolve", "simulate"]
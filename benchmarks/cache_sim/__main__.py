@@ -0,0 +1,91 @@
+"""
+Command line entry point: python -m benchmarks.cache_sim --help
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from functools import partial
+
+from benchmarks.cache_sim.adapters import CACHES, resolve
+from benchmarks.cache_sim.runner import simulate
+from benchmarks.cache_sim.traces import GENERATORS, from_file
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.cache_sim",
+        description="Replay key-access traces through cache classes and report JSON metrics",
+    )
+    parser.add_argument("--cache", nargs="+", default=sorted(CACHES),
+                        help=f"registry names {sorted(CACHES)} or 'package.module:ClassName'")
+    parser.add_argument("--trace", nargs="+", default=["zipf"],
+                        help=f"generated traces {sorted(GENERATORS)}")
+    parser.add_argument("--trace-file", action="append", default=[],
+                        help="file with one key per line (repeatable)")
+    parser.add_argument("--capacity", type=int, nargs="+", default=[1_000])
+    parser.add_argument("--length", type=int, default=200_000, help="accesses per trace")
+    parser.add_argument("--universe", type=int, default=100_000, help="distinct generated keys")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-every", type=int, default=10,
+                        help="sample op latency every N ops (0 disables)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.trace if name not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown trace(s) {unknown}; choose from {sorted(GENERATORS)}")
+    return args
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+
+    traces = {
+        name: partial(GENERATORS[name], args.length, args.universe, seed=args.seed)
+        for name in args.trace
+    }
+    for path in args.trace_file:
+        traces[f"file:{path}"] = partial(from_file, path, args.length)
+
+    results = []
+    for cache_name in args.cache:
+        factory = resolve(cache_name)
+        for trace_name, trace_factory in traces.items():
+            for capacity in args.capacity:
+                metrics = simulate(factory, capacity, trace_factory,
+                                   latency_every=args.latency_every,
+                                   measure_memory=not args.no_memory)
+                results.append({"cache": cache_name, "trace": trace_name,
+                                "capacity": capacity, **metrics})
+                print(f"{cache_name:>16} {trace_name:>12} cap={capacity:<8} "
+                      f"hit={metrics['hit_ratio']:.2%} ops/s={metrics['ops_per_sec']:,.0f}",
+                      file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "length": args.length,
+            "universe": args.universe,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Common protocol for every cache class in the repository
+
+The caches disagree on how a miss looks (LRUCache returns -1, the
+system_design caches return None). The simulator sidesteps that by storing
+one sentinel object as every value: a lookup is a hit exactly when the
+sentinel comes back.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, Hashable
+
+try:
+    from typing import Protocol
+except ImportError:  # Python < 3.8
+    Protocol = object
+
+from dsa.design_patterns.compact_lru_cache import CompactLRUCache
+from dsa.design_patterns.concurrent_lru_cache import ConcurrentLRUCache
+from dsa.design_patterns.lru_cache import LRUCache
+from system_design.cache_strategies import FIFOCache, LFUCache, TimeBasedCache, WTinyLFUCache
+
+CACHED = object()  # the value stored for every key
+
+
+class Cache(Protocol):
+    """Anything with get(key) and put(key, value)"""
+
+    def get(self, key: Hashable) -> Any: ...
+
+    def put(self, key: Hashable, value: Any) -> None: ...
+
+
+# name -> factory(capacity)
+CACHES: Dict[str, Callable[[int], Cache]] = {
+    "fifo": FIFOCache,
+    "lru": LRUCache,
+    "compact-lru": CompactLRUCache,
+    "concurrent-lru": ConcurrentLRUCache,
+    "lfu": LFUCache,
+    # TTL has no capacity bound: it shows the hit ratio of unbounded memory
+    "ttl": lambda capacity: TimeBasedCache(default_ttl=3600),
+    "w-tinylfu": WTinyLFUCache,
+}
+
+
+def resolve(name: str) -> Callable[[int], Cache]:
+    """
+    Look up a cache factory by registry name, or import one given as
+    'package.module:ClassName' (called with the capacity)
+    """
+    if name in CACHES:
+        return CACHES[name]
+
+    if ":" not in name:
+        raise ValueError(f"Unknown cache {name!r}; choose from {sorted(CACHES)} "
+                         "or pass 'package.module:ClassName'")
+
+    module_name, class_name = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), class_name)
@@ -0,0 +1,87 @@
+"""
+Replay a trace through a cache and collect metrics
+
+Two passes over the same (regenerated) trace:
+    1. timing pass: wall-clock ops/sec, plus per-op latency sampled every
+       latency_every ops with perf_counter_ns
+    2. memory pass (optional): tracemalloc peak while filling the cache,
+       kept separate because tracing slows every allocation down. The peak
+       includes at most one chunk of pending trace keys
+"""
+
+import time
+import tracemalloc
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Optional
+
+from benchmarks.cache_sim.adapters import CACHED, Cache
+
+
+def percentile(sorted_samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))
+    return sorted_samples[index]
+
+
+def _replay(cache: Cache, trace: Iterable, latency_every: int = 0) -> Dict[str, object]:
+    """Read-through replay: get(key), put(key) on a miss"""
+    get, put = cache.get, cache.put
+    clock = time.perf_counter_ns
+    hits = ops = 0
+    samples = []
+
+    start = time.perf_counter()
+    for key in trace:
+        if latency_every and ops % latency_every == 0:
+            op_start = clock()
+            if get(key) is CACHED:
+                hits += 1
+            else:
+                put(key, CACHED)
+            samples.append(clock() - op_start)
+        elif get(key) is CACHED:
+            hits += 1
+        else:
+            put(key, CACHED)
+        ops += 1
+    elapsed = time.perf_counter() - start
+
+    return {"ops": ops, "hits": hits, "elapsed": elapsed, "samples": samples}
+
+
+def simulate(cache_factory: Callable[[int], Cache], capacity: int,
+             trace_factory: Callable[[], Iterable], latency_every: int = 10,
+             measure_memory: bool = True) -> Dict[str, Optional[float]]:
+    """
+    Run one cache over one trace
+    trace_factory: Returns a fresh iterator over the same keys each call
+    """
+    timing = _replay(cache_factory(capacity), trace_factory(), latency_every)
+    samples = sorted(timing["samples"])
+    ops = timing["ops"]
+
+    peak_memory = None
+    if measure_memory:
+        # Start the generator before tracing so its setup (e.g. the Zipf
+        # weight table) is not charged to the cache
+        keys = iter(trace_factory())
+        head = list(islice(keys, 1))
+        cache = cache_factory(capacity)
+        tracemalloc.start()
+        try:
+            _replay(cache, chain(head, keys))
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "ops": ops,
+        "hits": timing["hits"],
+        "hit_ratio": timing["hits"] / ops if ops else 0.0,
+        "ops_per_sec": ops / timing["elapsed"] if timing["elapsed"] else 0.0,
+        "p50_ns": percentile(samples, 0.50),
+        "p99_ns": percentile(samples, 0.99),
+        "peak_memory_bytes": peak_memory,
+    }
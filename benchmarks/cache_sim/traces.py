@@ -0,0 +1,73 @@
+"""
+Key-access trace generators
+
+Every generator yields keys lazily, so traces of any length stream through
+the simulator in constant memory. Generators are deterministic for a given
+seed, which lets the runner replay the same trace for a second pass.
+"""
+
+import random
+from itertools import accumulate, islice
+from typing import Callable, Dict, Iterator
+
+_CHUNK = 4_096
+
+
+def zipf(length: int, universe: int, s: float = 0.9, seed: int = 0) -> Iterator[int]:
+    """Keys drawn from a Zipf(s) distribution over universe keys"""
+    rng = random.Random(seed)
+    keys = range(universe)
+    cum_weights = list(accumulate(1.0 / rank ** s for rank in range(1, universe + 1)))
+    remaining = length
+    while remaining > 0:
+        chunk = min(_CHUNK, remaining)
+        yield from rng.choices(keys, cum_weights=cum_weights, k=chunk)
+        remaining -= chunk
+
+
+def uniform(length: int, universe: int, seed: int = 0) -> Iterator[int]:
+    """Keys drawn uniformly at random from universe keys"""
+    rng = random.Random(seed)
+    for _ in range(length):
+        yield rng.randrange(universe)
+
+
+def loop(length: int, universe: int, seed: int = 0) -> Iterator[int]:
+    """0, 1, ..., universe - 1 repeated (LRU's worst case when universe > capacity)"""
+    for i in range(length):
+        yield i % universe
+
+
+def scan(length: int, universe: int, seed: int = 0,
+         scan_length: int = 2_000, scan_every: int = 20_000) -> Iterator[int]:
+    """
+    Zipf workload interrupted by sequential scans of never-repeated keys
+    (a table scan or crawler passing through a hot cache)
+    """
+    base = zipf(length, universe, seed=seed)
+    next_scan_key = universe
+    emitted = 0
+    while emitted < length:
+        for key in islice(base, min(scan_every, length - emitted)):
+            yield key
+            emitted += 1
+        scan_keys = min(scan_length, max(0, length - emitted))
+        yield from range(next_scan_key, next_scan_key + scan_keys)
+        next_scan_key += scan_keys
+        emitted += scan_keys
+
+
+def from_file(path: str, length: int = 0) -> Iterator[str]:
+    """One key per line; blank lines skipped; length 0 reads the whole file"""
+    with open(path) as f:
+        keys = (line.strip() for line in f)
+        keys = (key for key in keys if key)
+        yield from islice(keys, length) if length else keys
+
+
+GENERATORS: Dict[str, Callable[..., Iterator]] = {
+    "zipf": zipf,
+    "uniform": uniform,
+    "loop": loop,
+    "scan": scan,
+}
@@ -0,0 +1,80 @@
+"""
+Multi-threaded throughput: ConcurrentLRUCache with 1, 4, 16 and 64 shards
+
+One shard is equivalent to wrapping LRUCache in a single global mutex,
+which is the baseline the sharded cache replaces.
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import List
+
+from dsa.design_patterns.concurrent_lru_cache import ConcurrentLRUCache
+
+
+def run(num_shards: int, num_threads: int, ops_per_thread: int,
+        capacity: int, key_space: int, read_ratio: float) -> float:
+    """Run the workload once, return total ops/sec"""
+    cache = ConcurrentLRUCache(capacity, num_shards=num_shards)
+    for key in range(capacity):
+        cache.put(key, key)
+
+    # Pre-generate each thread's operations so the timed loop is cache calls only
+    workloads: List[List[tuple]] = []
+    for seed in range(num_threads):
+        rng = random.Random(seed)
+        workloads.append([
+            (rng.random() < read_ratio, rng.randrange(key_space))
+            for _ in range(ops_per_thread)
+        ])
+
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(ops: List[tuple]) -> None:
+        get, put = cache.get, cache.put
+        barrier.wait()
+        for is_read, key in ops:
+            if is_read:
+                if get(key) == -1:
+                    put(key, key)
+            else:
+                put(key, key)
+
+    threads = [threading.Thread(target=worker, args=(ops,)) for ops in workloads]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return num_threads * ops_per_thread / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=100_000, help="operations per thread")
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--key-space", type=int, default=20_000)
+    parser.add_argument("--read-ratio", type=float, default=0.9)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.ops} ops, capacity={args.capacity}, "
+          f"keys={args.key_space}, reads={args.read_ratio:.0%}")
+    print(f"{'shards':>8} {'ops/sec':>14} {'vs 1 shard':>11}")
+
+    baseline = None
+    for num_shards in (1, 4, 16, 64):
+        ops_per_sec = run(num_shards, args.threads, args.ops,
+                          args.capacity, args.key_space, args.read_ratio)
+        baseline = baseline or ops_per_sec
+        print(f"{num_shards:>8} {ops_per_sec:>14,.0f} {ops_per_sec / baseline:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Consistent-hash vs modulo-hash routing: lookup throughput and key movement
+
+For each server count, routes the same keys before and after adding one
+server and after removing one, and reports the share of keys that changed
+server (ideal: 1/(n+1) on add, 1/n on remove). Load spread is the busiest
+server's key count over the mean.
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from system_design.load_balancer import ConsistentHashBalancer, Server, stable_hash
+
+
+class ModuloHashBalancer:
+    """stable_hash(key) % len(servers), the scheme the ring replaces"""
+
+    def __init__(self, servers):
+        self.servers = list(servers)
+
+    def add_server(self, server):
+        self.servers.append(server)
+
+    def remove_server(self, server_id):
+        self.servers = [s for s in self.servers if s.id != server_id]
+
+    def get_server(self, key):
+        return self.servers[stable_hash(key) % len(self.servers)]
+
+
+def routes(balancer, keys):
+    return [balancer.get_server(key).id for key in keys]
+
+
+def moved(before, after) -> float:
+    return sum(a != b for a, b in zip(before, after)) / len(before)
+
+
+def run(kind: str, servers: int, keys: list, vnodes: int) -> dict:
+    pool = [Server(f"server-{i}") for i in range(servers)]
+    if kind == "ring":
+        balancer = ConsistentHashBalancer(pool, vnodes=vnodes)
+    else:
+        balancer = ModuloHashBalancer(pool)
+
+    start = time.perf_counter()
+    base = routes(balancer, keys)
+    elapsed = time.perf_counter() - start
+    counts = Counter(base)
+
+    balancer.add_server(Server("new"))
+    added = routes(balancer, keys)
+    balancer.remove_server("new")
+    balancer.remove_server("server-0")
+    removed = routes(balancer, keys)
+
+    return {"lookups_per_sec": len(keys) / elapsed,
+            "spread": max(counts.values()) / (len(keys) / servers),
+            "moved_add": moved(base, added),
+            "moved_remove": moved(base, removed)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--keys", type=int, default=200_000)
+    parser.add_argument("--vnodes", type=int, default=100, help="ring points per server")
+    args = parser.parse_args()
+
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.keys)]
+    print(f"{args.keys:,} keys, {args.vnodes} virtual nodes per server")
+    print(f"{'servers':>7} {'scheme':>7} {'lookups/s':>11} {'spread':>7} "
+          f"{'moved +1':>9} {'moved -1':>9} {'ideal':>7}")
+    for servers in args.servers:
+        for kind in ("modulo", "ring"):
+            r = run(kind, servers, keys, args.vnodes)
+            print(f"{servers:>7} {kind:>7} {r['lookups_per_sec']:>11,.0f} {r['spread']:>7.2f} "
+                  f"{r['moved_add']:>9.1%} {r['moved_remove']:>9.1%} {1 / servers:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+MessageQueue delayed delivery: scheduling cost and delivery lateness
+
+Schedules messages with random delays spread over --window seconds (each
+message carries its due time) while a consumer thread drains the queue and
+records how late each message became visible. Scheduling is a heap push
+and all messages share one timer thread, so cost per message should stay
+flat as the count grows.
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from system_design.message_queue import MessageQueue
+
+
+def run(messages: int, window: float, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    delays = [rng.uniform(0.05, window) for _ in range(messages)]
+    queue = MessageQueue()
+    lateness = []
+
+    def consume():
+        while len(lateness) < messages:
+            # Block for the next message, then take whatever else is already due
+            batch = [queue.get()] + queue.get_batch(4096, max_wait=0)
+            now = time.monotonic()
+            lateness.extend(now - due for due in batch)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    start = time.perf_counter()
+    base = time.monotonic()
+    for delay in delays:
+        queue.put(base + delay, delay=delay - (time.monotonic() - base))
+    schedule_elapsed = time.perf_counter() - start
+    consumer.join()
+
+    lateness.sort()
+    pick = lambda q: lateness[min(len(lateness) - 1, int(len(lateness) * q))] * 1e3
+    return {
+        "schedule_ns": schedule_elapsed / messages * 1e9,
+        "p50_ms": pick(0.50),
+        "p99_ms": pick(0.99),
+        "max_ms": lateness[-1] * 1e3,
+        "early": sum(1 for value in lateness if value < 0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--window", type=float, default=5.0,
+                        help="delays are uniform in [0.05, window] seconds")
+    args = parser.parse_args()
+
+    print(f"{'messages':>10} {'ns/schedule':>12} {'late p50 ms':>12} {'late p99 ms':>12} "
+          f"{'late max ms':>12} {'early':>6}")
+    for messages in args.messages:
+        r = run(messages, args.window)
+        print(f"{messages:>10,} {r['schedule_ns']:>12,.0f} {r['p50_ms']:>12.2f} "
+              f"{r['p99_ms']:>12.2f} {r['max_ms']:>12.2f} {r['early']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+DurableMessageQueue throughput under each fsync policy
+
+Messages are put one at a time and with put_batch (one write and at most
+one fsync per batch), then drained with get_batch and committed. The
+in-memory MessageQueue is shown as the baseline.
+"""
+
+import argparse
+import tempfile
+import time
+
+from system_design.durable_queue import FSYNC_POLICIES, DurableMessageQueue
+from system_design.message_queue import MessageQueue
+
+
+def run(make_queue, messages: int, batch_size: int, payload: bytes) -> dict:
+    """Return put and get messages/sec"""
+    queue = make_queue()
+    try:
+        start = time.perf_counter()
+        if batch_size == 1:
+            for _ in range(messages):
+                queue.put(payload)
+        else:
+            batch = [payload] * batch_size
+            for _ in range(messages // batch_size):
+                queue.put_batch(batch)
+        put_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        received = 0
+        while received < messages:
+            received += len(queue.get_batch(1024, max_wait=0))
+        if hasattr(queue, "commit"):
+            queue.commit()
+        get_elapsed = time.perf_counter() - start
+    finally:
+        if hasattr(queue, "close"):
+            queue.close()
+
+    return {"put_per_sec": messages / put_elapsed, "get_per_sec": messages / get_elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--always-messages", type=int, default=2_000,
+                        help="fewer messages for unbatched fsync=always (one fsync each)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--payload-bytes", type=int, default=100)
+    parser.add_argument("--fsync-interval-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    payload = b"x" * args.payload_bytes
+    print(f"{args.payload_bytes}-byte messages, put_batch size {args.batch_size}")
+    print(f"{'queue':>16} {'batch':>6} {'messages':>9} {'put/sec':>12} {'get/sec':>12}")
+
+    configs = [("memory", None)] + [(policy, policy) for policy in FSYNC_POLICIES]
+    for name, policy in configs:
+        for batch_size in (1, args.batch_size):
+            messages = args.messages
+            if policy == "always" and batch_size == 1:
+                messages = args.always_messages
+            messages -= messages % batch_size
+
+            with tempfile.TemporaryDirectory() as directory:
+                if policy is None:
+                    make_queue = MessageQueue
+                else:
+                    def make_queue(policy=policy, directory=directory):
+                        return DurableMessageQueue(directory, fsync=policy,
+                                                   fsync_interval_ms=args.fsync_interval_ms)
+                result = run(make_queue, messages, batch_size, payload)
+
+            print(f"{name:>16} {batch_size:>6} {messages:>9,} "
+                  f"{result['put_per_sec']:>12,.0f} {result['get_per_sec']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
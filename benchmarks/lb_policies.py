@@ -0,0 +1,96 @@
+"""
+Load balancing policies compared in the discrete-event simulator
+
+Every balancer in system_design.load_balancer is driven over the same
+backends (--servers, of which --slow are --slowdown times slower, lognormal
+service times) with Poisson, bursty and diurnal arrivals at --load of total
+capacity. Reports queueing delay percentiles, the busiest and idlest
+backend's utilisation, the balancer's own decisions/sec and how many
+simulated requests per wall-clock second the simulator handled.
+"""
+
+import argparse
+
+import numpy as np
+
+from system_design.lb_simulator import (
+    Backend, bursty_arrivals, diurnal_arrivals, lognormal, poisson_arrivals, simulate
+)
+from system_design.load_balancer import (
+    ConsistentHashBalancer, LeastConnectionsBalancer, LeastConnectionsHeapBalancer,
+    PowerOfTwoChoicesBalancer, RoundRobinBalancer, SmoothWeightedRoundRobinBalancer
+)
+
+BALANCERS = {
+    "round-robin": RoundRobinBalancer,
+    "smooth-wrr": SmoothWeightedRoundRobinBalancer,
+    "wrr-precomputed": lambda servers: SmoothWeightedRoundRobinBalancer(servers, precompute=True),
+    "least-conn": LeastConnectionsBalancer,
+    "least-conn-heap": LeastConnectionsHeapBalancer,
+    "p2c-peak-ewma": PowerOfTwoChoicesBalancer,
+    "consistent-hash": ConsistentHashBalancer,
+}
+
+
+def make_backends(servers: int, slow: int, slowdown: float, service_ms: float):
+    """Slow backends get weight 1, fast ones weight slowdown (for the WRR policies)"""
+    backends = []
+    for i in range(servers):
+        is_slow = i < slow
+        mean = service_ms / 1000 * (slowdown if is_slow else 1)
+        backends.append(Backend(f"server-{i}", lognormal(mean, sigma=0.8),
+                                weight=1 if is_slow else int(round(slowdown))))
+    return backends
+
+
+def make_arrivals(process: str, rate: float, count: int, seed: int) -> np.ndarray:
+    if process == "poisson":
+        return poisson_arrivals(rate, count, seed=seed)
+    if process == "bursty":
+        return bursty_arrivals(rate, count, burst_factor=4, burst_fraction=0.1,
+                               mean_burst=0.5, seed=seed)
+    # Four daily cycles squeezed into the run, peaking at 1.5x the mean rate
+    return diurnal_arrivals(rate, count, period=count / rate / 4, amplitude=0.5, seed=seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--servers", type=int, default=10)
+    parser.add_argument("--slow", type=int, default=2)
+    parser.add_argument("--slowdown", type=float, default=3.0)
+    parser.add_argument("--service-ms", type=float, default=10.0, help="fast backend mean")
+    parser.add_argument("--load", type=float, default=0.7, help="share of total capacity")
+    parser.add_argument("--arrivals", nargs="+", default=["poisson", "bursty", "diurnal"],
+                        choices=["poisson", "bursty", "diurnal"])
+    parser.add_argument("--balancers", nargs="+", default=list(BALANCERS), choices=list(BALANCERS))
+    parser.add_argument("--clients", type=int, default=10_000, help="distinct consistent-hash keys")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backends = make_backends(args.servers, args.slow, args.slowdown, args.service_ms)
+    capacity = sum(1000 / (args.service_ms * (args.slowdown if i < args.slow else 1))
+                   for i in range(args.servers))
+    rate = args.load * capacity
+    keys = [f"client-{k}" for k in
+            np.random.default_rng(args.seed).integers(0, args.clients, args.requests)]
+
+    print(f"{args.requests:,} requests, {args.servers} backends ({args.slow} are "
+          f"{args.slowdown:g}x slower), {rate:,.0f} req/s = {args.load:.0%} of capacity")
+    print(f"{'arrivals':>8} {'balancer':>15} {'p50 ms':>8} {'p99 ms':>9} {'p999 ms':>9} "
+          f"{'util max':>8} {'util min':>8} {'decisions/s':>12} {'sim req/s':>10}")
+    for process in args.arrivals:
+        arrivals = make_arrivals(process, rate, args.requests, args.seed)
+        for name in args.balancers:
+            result = simulate(BALANCERS[name], backends, arrivals, seed=args.seed,
+                              keys=keys if name == "consistent-hash" else None,
+                              record_latency=name == "p2c-peak-ewma")
+            delay = result.queue_delay
+            utilisation = result.utilisation.values()
+            print(f"{process:>8} {name:>15} {delay['p50'] * 1000:>8.1f} {delay['p99'] * 1000:>9.1f} "
+                  f"{delay['p999'] * 1000:>9.1f} {max(utilisation):>8.0%} {min(utilisation):>8.0%} "
+                  f"{result.decisions_per_sec:>12,.0f} {result.requests / result.wall_seconds:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
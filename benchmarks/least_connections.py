@@ -0,0 +1,77 @@
+"""
+Least-connections dispatch cost: min() scan vs indexed heap
+
+Keeps 2 requests per server in flight; every step completes a random
+in-flight request and dispatches a new one (get_server + handle_request),
+so each step changes two servers' connection counts. Also runs the heap
+balancer's acquire() from several threads.
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from system_design.load_balancer import (
+    LeastConnectionsBalancer, LeastConnectionsHeapBalancer, Server
+)
+
+
+def run(kind: str, servers: int, steps: int) -> float:
+    pool = [Server(f"server-{i}", weight=1 + i % 3) for i in range(servers)]
+    balancer = (LeastConnectionsBalancer if kind == "min" else LeastConnectionsHeapBalancer)(pool)
+    rng = random.Random(0)
+    in_flight = []
+    for _ in range(2 * servers):
+        server = balancer.get_server()
+        server.handle_request()
+        in_flight.append(server)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        i = rng.randrange(len(in_flight))
+        in_flight[i].complete_request()
+        server = balancer.get_server()
+        server.handle_request()
+        in_flight[i] = server
+    return steps / (time.perf_counter() - start)
+
+
+def run_threaded(servers: int, steps: int, threads: int) -> float:
+    balancer = LeastConnectionsHeapBalancer([Server(f"server-{i}") for i in range(servers)])
+
+    def dispatch():
+        for _ in range(steps // threads):
+            with balancer.acquire():
+                pass
+
+    workers = [threading.Thread(target=dispatch) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    assert all(s.active_connections == 0 for s in balancer.servers)
+    return steps // threads * threads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--steps", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.steps:,} complete+dispatch steps")
+    print(f"{'servers':>7} {'min() steps/s':>14} {'heap steps/s':>13} "
+          f"{'heap acquire/s':>15} ({args.threads} threads)")
+    for servers in args.servers:
+        scan = run("min", servers, args.steps)
+        heap = run("heap", servers, args.steps)
+        threaded = run_threaded(servers, args.steps, args.threads)
+        print(f"{servers:>7} {scan:>14,.0f} {heap:>13,.0f} {threaded:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
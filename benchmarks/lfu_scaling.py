@@ -0,0 +1,55 @@
+"""
+LFUCache per-operation latency from 1k to 1M entries
+
+The cache is filled to capacity first, so every put of a new key in the
+timed loop triggers an eviction. With frequency buckets the cost per
+operation should stay flat as capacity grows.
+"""
+
+import argparse
+import random
+import time
+
+from system_design.cache_strategies import LFUCache
+
+
+def run(capacity: int, ops: int, seed: int = 0) -> dict:
+    """Time a mixed get/put workload on a full cache"""
+    rng = random.Random(seed)
+    cache = LFUCache(capacity)
+    for key in range(capacity):
+        cache.put(key, key)
+
+    # Half reads of resident keys, half inserts of new keys (each one evicts)
+    workload = [
+        (rng.random() < 0.5, rng.randrange(capacity) if i % 2 else capacity + i)
+        for i in range(ops)
+    ]
+
+    get, put = cache.get, cache.put
+    start = time.perf_counter()
+    for is_read, key in workload:
+        if is_read:
+            get(key)
+        else:
+            put(key, key)
+    elapsed = time.perf_counter() - start
+
+    return {"ns_per_op": elapsed / ops * 1e9, "ops_per_sec": ops / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--capacities", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'capacity':>10} {'ns/op':>10} {'ops/sec':>12}")
+    for capacity in args.capacities:
+        result = run(capacity, args.ops)
+        print(f"{capacity:>10,} {result['ns_per_op']:>10.0f} {result['ops_per_sec']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
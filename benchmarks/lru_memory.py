@@ -0,0 +1,75 @@
+"""
+Memory per entry: LRUCache (ListNode objects) vs CompactLRUCache (arrays)
+
+Memory is measured with tracemalloc, so it counts every Python allocation
+made while filling the cache: the key -> node/slot dict, the nodes or
+buffers, and the slot indices. Keys and values are preallocated ints shared
+by both caches, so they are not counted.
+
+GC cost is reported as the number of GC-tracked objects the cache adds and
+the time of one full gc.collect() with the filled cache alive.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from dsa.design_patterns.compact_lru_cache import CompactLRUCache
+from dsa.design_patterns.lru_cache import LRUCache
+
+
+def measure(cache_class, keys: list) -> dict:
+    """Fill a cache to capacity with keys, return per-entry cost figures"""
+    entries = len(keys)
+    gc.collect()
+    tracked_before = len(gc.get_objects())
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    cache = cache_class(entries)
+    start = time.perf_counter()
+    for key in keys:
+        cache.put(key, key)
+    put_elapsed = time.perf_counter() - start
+
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for key in keys:
+        cache.get(key)
+    get_elapsed = time.perf_counter() - start
+
+    tracked = len(gc.get_objects()) - tracked_before
+    start = time.perf_counter()
+    gc.collect()
+    gc_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "bytes_per_entry": used / entries,
+        "gc_objects_per_entry": tracked / entries,
+        "gc_ms": gc_ms,
+        "puts_per_sec": entries / put_elapsed,
+        "gets_per_sec": entries / get_elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'cache':>16} {'bytes/entry':>12} {'gc objs/entry':>14} "
+          f"{'full gc ms':>11} {'puts/sec':>12} {'gets/sec':>12}")
+    for entries in args.entries:
+        keys = list(range(entries))
+        for cache_class in (LRUCache, CompactLRUCache):
+            r = measure(cache_class, keys)
+            print(f"{entries:>10,} {cache_class.__name__:>16} {r['bytes_per_entry']:>12.1f} "
+                  f"{r['gc_objects_per_entry']:>14.2f} {r['gc_ms']:>11.1f} "
+                  f"{r['puts_per_sec']:>12,.0f} {r['gets_per_sec']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
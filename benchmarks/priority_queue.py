@@ -0,0 +1,102 @@
+"""
+PriorityQueue put/get throughput: heap vs the previous sort-on-put list
+
+The legacy queue re-sorts on every put and pops from the front on every
+get, so each operation is O(n). It is only run up to --legacy-max messages;
+beyond that a single run would take hours.
+"""
+
+import argparse
+import random
+import time
+from threading import Lock
+
+from system_design.message_queue import PriorityQueue
+
+
+class LegacyPriorityQueue:
+    """The list-based PriorityQueue this module replaced, kept for comparison"""
+
+    def __init__(self):
+        self.queue = []
+        self.lock = Lock()
+
+    def put(self, message, priority=0):
+        with self.lock:
+            self.queue.append((priority, message))
+            self.queue.sort(reverse=True, key=lambda x: x[0])
+
+    def get(self):
+        with self.lock:
+            if not self.queue:
+                return None
+            return self.queue.pop(0)[1]
+
+
+def run(queue_cls, messages: int, priorities: int = 10, seed: int = 0) -> dict:
+    """Put messages with random priorities, then drain; time both phases"""
+    rng = random.Random(seed)
+    items = [(i, rng.randrange(priorities)) for i in range(messages)]
+    queue = queue_cls()
+
+    put, get = queue.put, queue.get
+    start = time.perf_counter()
+    for message, priority in items:
+        put(message, priority)
+    put_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(messages):
+        get()
+    get_elapsed = time.perf_counter() - start
+
+    return {
+        "put_per_sec": messages / put_elapsed,
+        "get_per_sec": messages / get_elapsed,
+        "total_sec": put_elapsed + get_elapsed,
+    }
+
+
+def run_bulk(messages: int, priorities: int = 10, seed: int = 0) -> dict:
+    """Same workload through put_many/get_many"""
+    rng = random.Random(seed)
+    items = [(i, rng.randrange(priorities)) for i in range(messages)]
+    queue = PriorityQueue()
+
+    start = time.perf_counter()
+    queue.put_many(items)
+    put_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    queue.get_many(messages)
+    get_elapsed = time.perf_counter() - start
+
+    return {
+        "put_per_sec": messages / put_elapsed,
+        "get_per_sec": messages / get_elapsed,
+        "total_sec": put_elapsed + get_elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=10_000,
+                        help="largest size to run the O(n) legacy queue at")
+    args = parser.parse_args()
+
+    print(f"{'messages':>10} {'queue':>8} {'put/sec':>12} {'get/sec':>12} {'total s':>9}")
+    for size in args.sizes:
+        rows = [("heap", run(PriorityQueue, size)), ("bulk", run_bulk(size))]
+        if size <= args.legacy_max:
+            rows.append(("legacy", run(LegacyPriorityQueue, size)))
+        for name, result in rows:
+            print(f"{size:>10,} {name:>8} {result['put_per_sec']:>12,.0f} "
+                  f"{result['get_per_sec']:>12,.0f} {result['total_sec']:>9.2f}")
+        if size > args.legacy_max:
+            print(f"{size:>10,} {'legacy':>8} {'skipped (O(n) per op)':>35}")
+
+
+if __name__ == "__main__":
+    main()
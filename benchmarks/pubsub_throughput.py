@@ -0,0 +1,78 @@
+"""
+Pub/sub throughput with several partitions and consumer groups
+
+Producer threads publish keyed messages in batches; every group has its own
+consumer threads polling their assigned partitions. Each group receives
+every message (fan-out by offsets, not by copying), so delivered/sec is
+reported per group and in total.
+"""
+
+import argparse
+import threading
+import time
+
+from system_design.pubsub import PubSub
+
+
+def run(partitions: int, groups: int, consumers: int, producers: int,
+        messages: int, batch: int) -> dict:
+    broker = PubSub()
+    topic = broker.create_topic("bench", partitions=partitions)
+    members = [[broker.subscribe("bench", f"group-{g}", f"consumer-{c}") for c in range(consumers)]
+               for g in range(groups)]
+    per_producer = messages // producers
+    total = per_producer * producers
+    received = [[0] * consumers for _ in range(groups)]
+    payload = b"x" * 100
+
+    def produce(worker: int):
+        items = [(payload, f"key-{worker}-{i}") for i in range(batch)]
+        for start in range(0, per_producer, batch):
+            topic.publish_batch(items[:min(batch, per_producer - start)])
+
+    def consume(g: int, c: int):
+        consumer = members[g][c]
+        while sum(received[g]) < total:
+            received[g][c] += len(consumer.poll(max_items=1000, timeout=0.05))
+
+    threads = [threading.Thread(target=consume, args=(g, c))
+               for g in range(groups) for c in range(consumers)]
+    threads += [threading.Thread(target=produce, args=(w,)) for w in range(producers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads[-producers:]:
+        t.join()
+    publish_elapsed = time.perf_counter() - start
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    assert all(sum(counts) == total for counts in received)
+    return {"published_per_sec": total / publish_elapsed,
+            "delivered_per_sec": total * groups / elapsed,
+            "per_group_per_sec": total / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--groups", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--consumers", type=int, default=4, help="consumers per group")
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.messages:,} messages, {args.producers} producers, "
+          f"{args.consumers} consumers per group, publish batch {args.batch}")
+    print(f"{'partitions':>10} {'groups':>6} {'published/s':>12} {'per group/s':>12} {'delivered/s':>12}")
+    for partitions in args.partitions:
+        for groups in args.groups:
+            r = run(partitions, groups, args.consumers, args.producers, args.messages, args.batch)
+            print(f"{partitions:>10} {groups:>6} {r['published_per_sec']:>12,.0f} "
+                  f"{r['per_group_per_sec']:>12,.0f} {r['delivered_per_sec']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
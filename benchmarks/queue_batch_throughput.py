@@ -0,0 +1,85 @@
+"""
+MessageQueue throughput by batch size: put/get vs put_batch/get_batch
+
+Producers and consumers run in separate threads over a bounded queue.
+Batch size 1 uses plain put()/get(); larger sizes move that many messages
+per lock acquisition.
+"""
+
+import argparse
+import threading
+import time
+
+from system_design.message_queue import MessageQueue
+
+
+def run(batch_size: int, messages: int, producers: int, consumers: int, max_size: int) -> float:
+    """Return messages/sec for moving messages from producers to consumers"""
+    queue = MessageQueue(max_size=max_size)
+    per_producer = messages // producers
+    total = per_producer * producers
+    received = [0] * consumers
+    remaining = [total]
+    counter_lock = threading.Lock()
+
+    def produce():
+        if batch_size == 1:
+            for i in range(per_producer):
+                queue.put(i)
+            return
+        batch = list(range(batch_size))
+        for start in range(0, per_producer, batch_size):
+            queue.put_batch(batch[:min(batch_size, per_producer - start)])
+
+    def consume(index: int):
+        while True:
+            if batch_size == 1:
+                got = 0 if queue.get(timeout=0.05) is None else 1
+            else:
+                got = len(queue.get_batch(batch_size, max_wait=0.05))
+            received[index] += got
+            with counter_lock:
+                remaining[0] -= got
+                if remaining[0] <= 0:
+                    return
+
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+    threads += [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads[consumers:]:
+        t.join()
+    while queue.size():  # let consumers finish, then release any still waiting
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    with counter_lock:
+        remaining[0] = 0
+    for t in threads[:consumers]:
+        t.join()
+
+    assert sum(received) == total
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096])
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--consumers", type=int, default=2)
+    parser.add_argument("--max-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{args.producers} producers, {args.consumers} consumers, "
+          f"{args.messages:,} messages, max_size={args.max_size}")
+    print(f"{'batch':>6} {'msgs/sec':>12} {'speedup':>8}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        rate = run(batch_size, args.messages, args.producers, args.consumers, args.max_size)
+        baseline = baseline or rate
+        print(f"{batch_size:>6} {rate:>12,.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
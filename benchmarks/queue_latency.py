@@ -0,0 +1,161 @@
+"""
+MessageQueue producer-to-consumer handoff latency and idle CPU
+
+Latency: producers put perf_counter_ns() stamps, consumers record how long
+each message took to arrive. Idle: many consumers block in get() on an
+empty queue and the process CPU time burnt while they wait is measured.
+Timeout: how late get(timeout) returns on an empty queue.
+All runs compare the current queue with the previous polling one.
+"""
+
+import argparse
+import threading
+import time
+from collections import deque
+from threading import Condition, Lock
+from typing import Any, List, Optional
+
+from system_design.message_queue import MessageQueue
+
+_STOP = object()
+
+
+class PollingMessageQueue:
+    """The previous MessageQueue (0.1s polling waits), kept for comparison"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.queue = deque()
+        self.max_size = max_size
+        self.lock = Lock()
+        self.not_empty = Condition(self.lock)
+        self.not_full = Condition(self.lock)
+
+    def put(self, message: Any, timeout: Optional[float] = None) -> bool:
+        with self.lock:
+            if self.max_size is not None:
+                end_time = time.time() + timeout if timeout else None
+                while len(self.queue) >= self.max_size:
+                    if timeout and time.time() >= end_time:
+                        return False
+                    self.not_full.wait(timeout=0.1)
+            self.queue.append(message)
+            self.not_empty.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        with self.lock:
+            end_time = time.time() + timeout if timeout else None
+            while not self.queue:
+                if timeout and time.time() >= end_time:
+                    return None
+                self.not_empty.wait(timeout=0.1)
+            message = self.queue.popleft()
+            self.not_full.notify()
+            return message
+
+
+def percentile(sorted_values: List[int], fraction: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def handoff_latency(queue_cls, producers: int, consumers: int, messages: int,
+                    max_size: Optional[int], gap: float) -> dict:
+    """Latency of messages paced by gap seconds per producer"""
+    queue = queue_cls(max_size=max_size)
+    latencies: List[List[int]] = [[] for _ in range(consumers)]
+
+    def produce():
+        for _ in range(messages // producers):
+            queue.put(time.perf_counter_ns())
+            if gap:
+                time.sleep(gap)
+
+    def consume(out: List[int]):
+        while True:
+            stamp = queue.get()
+            if stamp is _STOP:
+                return
+            out.append(time.perf_counter_ns() - stamp)
+
+    consumer_threads = [threading.Thread(target=consume, args=(out,)) for out in latencies]
+    producer_threads = [threading.Thread(target=produce) for _ in range(producers)]
+    for t in consumer_threads + producer_threads:
+        t.start()
+    for t in producer_threads:
+        t.join()
+    for _ in consumer_threads:
+        queue.put(_STOP)
+    for t in consumer_threads:
+        t.join()
+
+    values = sorted(v for out in latencies for v in out)
+    return {"p50_us": percentile(values, 0.50) / 1e3, "p99_us": percentile(values, 0.99) / 1e3,
+            "max_us": values[-1] / 1e3}
+
+
+def idle_cpu(queue_cls, consumers: int, seconds: float) -> float:
+    """CPU seconds used while consumers wait on an empty queue"""
+    queue = queue_cls()
+    threads = [threading.Thread(target=queue.get) for _ in range(consumers)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)  # let every consumer reach its wait
+
+    start = time.process_time()
+    time.sleep(seconds)
+    used = time.process_time() - start
+
+    for _ in threads:
+        queue.put(None)
+    for t in threads:
+        t.join()
+    return used
+
+
+def timeout_overshoot(queue_cls, timeout: float, trials: int) -> float:
+    """Mean milliseconds get(timeout) returns late on an empty queue"""
+    queue = queue_cls()
+    late = 0.0
+    for _ in range(trials):
+        start = time.monotonic()
+        queue.get(timeout=timeout)
+        late += time.monotonic() - start - timeout
+    return late / trials * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--consumers", type=int, default=32)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--max-size", type=int, default=64)
+    parser.add_argument("--gap", type=float, default=0.0005,
+                        help="seconds each producer sleeps between puts")
+    parser.add_argument("--idle-consumers", type=int, default=1000)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=0.15)
+    args = parser.parse_args()
+
+    queues = [("current", MessageQueue), ("polling", PollingMessageQueue)]
+
+    print(f"Handoff: {args.producers} producers, {args.consumers} consumers, "
+          f"{args.messages:,} messages, max_size={args.max_size}")
+    print(f"{'queue':>8} {'p50 us':>10} {'p99 us':>10} {'max us':>10}")
+    for name, cls in queues:
+        result = handoff_latency(cls, args.producers, args.consumers, args.messages,
+                                 args.max_size, args.gap)
+        print(f"{name:>8} {result['p50_us']:>10.1f} {result['p99_us']:>10.1f} {result['max_us']:>10.1f}")
+
+    print(f"\nIdle: {args.idle_consumers} consumers blocked for {args.idle_seconds}s")
+    print(f"{'queue':>8} {'cpu s':>10}")
+    for name, cls in queues:
+        print(f"{name:>8} {idle_cpu(cls, args.idle_consumers, args.idle_seconds):>10.3f}")
+
+    print(f"\nget(timeout={args.timeout}) on an empty queue")
+    print(f"{'queue':>8} {'late ms':>10}")
+    for name, cls in queues:
+        print(f"{name:>8} {timeout_overshoot(cls, args.timeout, 10):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
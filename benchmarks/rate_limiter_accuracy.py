@@ -0,0 +1,138 @@
+"""
+Memory and accuracy: SlidingWindowCounter and GCRA vs SlidingWindowLog
+
+Memory: bytes held by one key's limiter at steady state when traffic runs
+at exactly the limit (default 10k req/s over a 60s window).
+
+Accuracy: every limiter sees the same random arrivals (Poisson at twice
+the limit, plus periodic bursts). SlidingWindowLog is exact, so it is the
+reference: we report how many requests each limiter admitted, the most it
+admitted inside any sliding window (the limit is the ceiling), and how
+often its decisions agreed with the log. GCRA allows burst requests back
+to back on top of its sustained rate, so like a token bucket it can admit
+up to twice the limit inside one window.
+
+Both runs drive the limiters from a simulated clock.
+"""
+
+import argparse
+import gc
+import random
+import sys
+from collections import deque
+from typing import Callable, Dict, List
+
+from system_design.rate_limiter import GCRA, SlidingWindowCounter, SlidingWindowLog
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+LIMITERS: Dict[str, Callable] = {
+    "SlidingWindowLog": lambda limit, window, clock: SlidingWindowLog(limit, window, clock=clock),
+    "SlidingWindowCounter": lambda limit, window, clock: SlidingWindowCounter(limit, window, clock=clock),
+    "SlidingWindowCounter(10)": lambda limit, window, clock: SlidingWindowCounter(
+        limit, window, sub_windows=10, clock=clock),
+    "GCRA": lambda limit, window, clock: GCRA(limit, window, clock=clock),
+}
+
+
+def deep_sizeof(obj: object, skip: set) -> int:
+    """Size of obj plus everything it references, excluding ids in skip"""
+    seen, stack, total = set(skip), [obj], 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        stack.extend(gc.get_referents(current))
+    return total
+
+
+def steady_state_bytes(factory: Callable, rate: int, window: float) -> int:
+    """Memory retained by one limiter after a full window at exactly the limit"""
+    limit = int(rate * window)
+    clock = FakeClock()
+    limiter = factory(limit, window, clock)
+    step = 1.0 / rate
+    for _ in range(int(limit * 1.1)):
+        clock.now += step
+        limiter.allow_request()
+    # The clock is shared by every key, so it is not charged to the limiter
+    return deep_sizeof(limiter, {id(clock)})
+
+
+def arrivals(limit: int, window: float, windows: int, seed: int = 0) -> List[float]:
+    """Poisson arrivals at 2x the limit plus a burst of limit requests every 10 windows"""
+    rng = random.Random(seed)
+    rate = 2 * limit / window
+    times, now, end = [], 0.0, windows * window
+    while now < end:
+        now += rng.expovariate(rate)
+        times.append(now)
+    for burst_start in range(0, windows, 10):
+        at = burst_start * window + window / 2
+        times.extend([at] * limit)
+    times.sort()
+    return times
+
+
+def max_in_window(accepted: List[float], window: float) -> int:
+    """Most accepted timestamps inside any half-open window of length window"""
+    best, inside = 0, deque()
+    for t in accepted:
+        inside.append(t)
+        while inside[0] <= t - window:
+            inside.popleft()
+        best = max(best, len(inside))
+    return best
+
+
+def accuracy(limit: int, window: float, windows: int) -> None:
+    times = arrivals(limit, window, windows)
+    decisions = {}
+    for name, factory in LIMITERS.items():
+        clock = FakeClock()
+        limiter = factory(limit, window, clock)
+        result = []
+        for t in times:
+            clock.now = t
+            result.append(limiter.allow_request())
+        decisions[name] = result
+
+    reference = decisions["SlidingWindowLog"]
+    print(f"\nAccuracy: limit {limit} per {window}s, {len(times):,} arrivals over {windows} windows")
+    print(f"{'limiter':>26} {'admitted':>9} {'max/window':>11} {'agree w/ log':>13}")
+    for name, result in decisions.items():
+        accepted = [t for t, ok in zip(times, result) if ok]
+        agree = sum(a == b for a, b in zip(result, reference)) / len(result)
+        print(f"{name:>26} {len(accepted):>9,} {max_in_window(accepted, window):>11,} {agree:>13.2%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=10_000, help="limit in requests/sec")
+    parser.add_argument("--window", type=float, default=60.0, help="window in seconds")
+    parser.add_argument("--accuracy-limit", type=int, default=100)
+    parser.add_argument("--accuracy-windows", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"Memory per key at {args.rate:,} req/s, {args.window:g}s window "
+          f"({int(args.rate * args.window):,} requests in flight):")
+    for name, factory in LIMITERS.items():
+        used = steady_state_bytes(factory, args.rate, args.window)
+        print(f"{name:>26} {used:>14,} bytes")
+
+    accuracy(args.accuracy_limit, 1.0, args.accuracy_windows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+SharedMemoryQueue vs multiprocessing.Queue for small and large messages
+
+Producer and consumer processes move a fixed number of messages; the
+consumers touch one byte per message (zero-copy view for the shared memory
+queue, the unpickled bytes for multiprocessing.Queue).
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from system_design.shm_queue import SharedMemoryQueue
+
+
+def _produce_shm(queue, count: int, size: int) -> None:
+    payload = b"x" * size
+    for _ in range(count):
+        queue.put(payload)
+    queue.close()
+
+
+def _consume_shm(queue, done) -> None:
+    received = 0
+    while True:
+        with queue.get_view() as view:
+            if len(view) == 0:
+                break
+            view[0]
+            received += 1
+    done.put(received)
+    queue.close()
+
+
+def _produce_mp(queue, count: int, size: int) -> None:
+    payload = b"x" * size
+    for _ in range(count):
+        queue.put(payload)
+
+
+def _consume_mp(queue, done) -> None:
+    received = 0
+    while True:
+        message = queue.get()
+        if len(message) == 0:
+            break
+        message[0]
+        received += 1
+    done.put(received)
+
+
+def run(kind: str, messages: int, size: int, producers: int, consumers: int,
+        ring_bytes: int) -> float:
+    """Return messages/sec from first put to last consumer exit"""
+    if kind == "shm":
+        queue = SharedMemoryQueue(capacity=ring_bytes)
+        produce, consume = _produce_shm, _consume_shm
+    else:
+        queue = multiprocessing.Queue(maxsize=max(1, ring_bytes // (size + 8)))
+        produce, consume = _produce_mp, _consume_mp
+    done = multiprocessing.Queue()
+    per_producer = messages // producers
+
+    consumer_procs = [multiprocessing.Process(target=consume, args=(queue, done))
+                      for _ in range(consumers)]
+    producer_procs = [multiprocessing.Process(target=produce, args=(queue, per_producer, size))
+                      for _ in range(producers)]
+    for p in consumer_procs:
+        p.start()
+
+    start = time.perf_counter()
+    for p in producer_procs:
+        p.start()
+    for p in producer_procs:
+        p.join()
+    for _ in consumer_procs:
+        queue.put(b"")  # stop marker
+    received = sum(done.get() for _ in consumer_procs)
+    elapsed = time.perf_counter() - start
+    for p in consumer_procs:
+        p.join()
+
+    if kind == "shm":
+        queue.close()
+        queue.unlink()
+    assert received == per_producer * producers
+    return received / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 65_536])
+    parser.add_argument("--bytes-per-run", type=int, default=256 << 20,
+                        help="total payload moved per run (caps message count)")
+    parser.add_argument("--max-messages", type=int, default=100_000)
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--consumers", type=int, default=2)
+    parser.add_argument("--ring-bytes", type=int, default=4 << 20)
+    args = parser.parse_args()
+
+    print(f"{args.producers} producers, {args.consumers} consumers, "
+          f"{args.ring_bytes >> 10} KB of buffering")
+    print(f"{'size':>8} {'messages':>9} {'queue':>12} {'msgs/sec':>12} {'MB/sec':>9}")
+    for size in args.sizes:
+        messages = min(args.max_messages, args.bytes_per_run // size)
+        for kind, label in (("shm", "shared mem"), ("mp", "mp.Queue")):
+            rate = run(kind, messages, size, args.producers, args.consumers, args.ring_bytes)
+            print(f"{size:>8,} {messages:>9,} {label:>12} {rate:>12,.0f} {rate * size / 1e6:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+TimeBasedCache: mixed puts, gets and expiry sweeps
+
+Compares the heap-indexed cleanup() against the previous full-scan sweep
+(reimplemented below as FullScanTTLCache) on the same workload. A fake
+clock advances by a fixed step per operation, so both caches see exactly
+the same expiries and the run is deterministic.
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, Optional
+
+from system_design.cache_strategies import TimeBasedCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FullScanTTLCache:
+    """The old TimeBasedCache strategy: cleanup() scans every entry"""
+
+    def __init__(self, default_ttl: int, clock):
+        self.cache: Dict[Any, tuple] = {}
+        self.default_ttl = default_ttl
+        self.clock = clock
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if self.clock() > entry[1]:
+            del self.cache[key]
+            return None
+        return entry[0]
+
+    def put(self, key: Any, value: Any, ttl: Optional[int] = None) -> None:
+        self.cache[key] = (value, self.clock() + (ttl or self.default_ttl))
+
+    def cleanup(self) -> int:
+        now = self.clock()
+        expired = [key for key, (_, expiry) in self.cache.items() if now > expiry]
+        for key in expired:
+            del self.cache[key]
+        return len(expired)
+
+
+def run(cache_factory, live_keys: int, ops: int, sweep_every: int, seed: int = 0) -> dict:
+    """Replay the workload, return timings for ops and sweeps"""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    cache = cache_factory(clock)
+
+    # Steady state: TTLs are sized so roughly live_keys entries are alive
+    step = 0.001
+    mean_ttl = live_keys * step / 0.3  # 30% of ops are puts
+    for key in range(live_keys):
+        cache.put(key, key, ttl=rng.uniform(0.5, 1.5) * mean_ttl)
+
+    next_key = live_keys
+    op_time = sweep_time = 0.0
+    sweeps = removed = 0
+    for i in range(ops):
+        clock.now += step
+        start = time.perf_counter()
+        if rng.random() < 0.3:
+            cache.put(next_key, next_key, ttl=rng.uniform(0.5, 1.5) * mean_ttl)
+            next_key += 1
+        else:
+            cache.get(rng.randrange(max(0, next_key - live_keys), next_key))
+        op_time += time.perf_counter() - start
+
+        if i % sweep_every == 0:
+            start = time.perf_counter()
+            removed += cache.cleanup()
+            sweep_time += time.perf_counter() - start
+            sweeps += 1
+
+    return {
+        "ops_per_sec": ops / op_time,
+        "sweep_ms": sweep_time / sweeps * 1000,
+        "removed": removed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--sweep-every", type=int, default=1_000)
+    args = parser.parse_args()
+
+    caches = {
+        "heap": lambda clock: TimeBasedCache(default_ttl=60, clock=clock),
+        "full-scan": lambda clock: FullScanTTLCache(default_ttl=60, clock=clock),
+    }
+
+    print(f"{'live keys':>10} {'cache':>10} {'ops/sec':>12} {'ms/sweep':>10} {'expired':>9}")
+    for size in args.sizes:
+        for name, factory in caches.items():
+            r = run(factory, size, args.ops, args.sweep_every)
+            print(f"{size:>10,} {name:>10} {r['ops_per_sec']:>12,.0f} "
+                  f"{r['sweep_ms']:>10.3f} {r['removed']:>9,}")
+
+
+if __name__ == "__main__":
+    main()
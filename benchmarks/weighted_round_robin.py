@@ -0,0 +1,108 @@
+"""
+Weighted round-robin picks/sec: previous balancer vs smooth vs precomputed
+
+Servers get random weights in [1, --max-weight]. Besides throughput, reports
+the longest run of consecutive picks of one server (burstiness) and the
+cost of one Server.set_weight in precompute mode. The legacy balancer
+re-scans every weight inside its loop, so it is only run for --legacy-picks.
+
+A second table shows the longest run with one heavy server (weight 20)
+among nine of weight 1, where an ideal interleaving never picks it more
+than 3 times in a row.
+"""
+
+import argparse
+import random
+import time
+
+from system_design.load_balancer import Server, SmoothWeightedRoundRobinBalancer
+
+
+class LegacyWeightedRoundRobinBalancer:
+    """The interleaved WRR this module replaced, kept for comparison"""
+
+    def __init__(self, servers):
+        self.servers = servers
+        self.current_weight = 0
+        self.current_index = -1
+
+    def get_server(self):
+        while True:
+            self.current_index = (self.current_index + 1) % len(self.servers)
+
+            if self.current_index == 0:
+                self.current_weight -= min(s.weight for s in self.servers)
+                if self.current_weight <= 0:
+                    self.current_weight = sum(s.weight for s in self.servers)
+
+            if self.servers[self.current_index].weight >= self.current_weight:
+                return self.servers[self.current_index]
+
+
+def longest_run(picks) -> int:
+    best = run = 1
+    for previous, server in zip(picks, picks[1:]):
+        run = run + 1 if server is previous else 1
+        best = max(best, run)
+    return best
+
+
+def run(kind: str, servers: int, picks: int, max_weight: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    pool = [Server(f"server-{i}", weight=rng.randint(1, max_weight)) for i in range(servers)]
+    if kind == "legacy":
+        balancer = LegacyWeightedRoundRobinBalancer(pool)
+    else:
+        balancer = SmoothWeightedRoundRobinBalancer(pool, precompute=kind == "precomputed")
+
+    get_server = balancer.get_server
+    start = time.perf_counter()
+    chosen = [get_server() for _ in range(picks)]
+    elapsed = time.perf_counter() - start
+
+    result = {"picks_per_sec": picks / elapsed, "longest_run": longest_run(chosen)}
+    if kind == "precomputed":
+        start = time.perf_counter()
+        for i in range(10):
+            pool[i].set_weight(pool[i].weight + 1)
+        result["set_weight_ms"] = (time.perf_counter() - start) / 10 * 1000
+    return result
+
+
+def skewed_runs() -> dict:
+    runs = {}
+    for kind in ("legacy", "smooth", "precomputed"):
+        pool = [Server("heavy", weight=20)] + [Server(f"light-{i}") for i in range(9)]
+        if kind == "legacy":
+            balancer = LegacyWeightedRoundRobinBalancer(pool)
+        else:
+            balancer = SmoothWeightedRoundRobinBalancer(pool, precompute=kind == "precomputed")
+        runs[kind] = longest_run([balancer.get_server() for _ in range(290)])
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--servers", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--picks", type=int, default=200_000)
+    parser.add_argument("--legacy-picks", type=int, default=20_000)
+    parser.add_argument("--max-weight", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"weights uniform in [1, {args.max_weight}]")
+    print(f"{'servers':>7} {'balancer':>12} {'picks/s':>12} {'longest run':>12} {'set_weight ms':>14}")
+    for servers in args.servers:
+        for kind in ("legacy", "smooth", "precomputed"):
+            picks = args.legacy_picks if kind == "legacy" else args.picks
+            r = run(kind, servers, picks, args.max_weight)
+            set_weight = f"{r['set_weight_ms']:.2f}" if "set_weight_ms" in r else "-"
+            print(f"{servers:>7} {kind:>12} {r['picks_per_sec']:>12,.0f} "
+                  f"{r['longest_run']:>12} {set_weight:>14}")
+
+    print("\nweights 20 + 9 x 1, longest run of the heavy server:")
+    for kind, longest in skewed_runs().items():
+        print(f"{kind:>12} {longest:>3}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Compact LRU Cache - Array-backed doubly linked list
+Frequency: 40% (Follow-up: "Your LRU uses too much memory at millions of keys")
+
+Same behaviour as LRUCache, but instead of one ListNode object per entry the
+linked list lives in preallocated parallel buffers:
+    prev / next -> array('i') of slot indices (4 bytes each, no objects)
+    keys / vals -> plain lists indexed by slot
+Slot 0 is a sentinel that acts as both head and tail of a circular list.
+Free slots are chained through the next buffer, so eviction and delete
+recycle slots without allocating nodes.
+
+Nothing per entry is tracked by the garbage collector (arrays, lists and
+ints are not GC-tracked objects), so full collections stay cheap no matter
+how many entries the cache holds.
+
+Time Complexity: O(1) for get, put and delete
+Space Complexity: O(capacity), allocated up front
+"""
+
+from array import array
+from typing import Any, Dict, Hashable
+
+_SENTINEL = 0
+
+
+class CompactLRUCache:
+    """
+    LRU Cache using HashMap (key -> slot) + index-linked arrays
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.cache: Dict[Hashable, int] = {}  # key -> slot
+
+        size = capacity + 1  # slot 0 is the sentinel
+        self.prev = array('i', [_SENTINEL]) * size
+        self.next = array('i', range(1, size + 1))
+        self.keys = [None] * size
+        self.vals = [None] * size
+
+        # Empty circular list: sentinel points at itself
+        self.prev[_SENTINEL] = _SENTINEL
+        self.next[_SENTINEL] = _SENTINEL
+
+        # Free list: 1 -> 2 -> ... -> capacity -> end (0)
+        self.free = 1 if capacity > 0 else _SENTINEL
+        if capacity > 0:
+            self.next[capacity] = _SENTINEL
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _add_slot(self, slot: int):
+        """Link slot right after the sentinel (most recently used)"""
+        prev, nxt = self.prev, self.next
+        first = nxt[_SENTINEL]
+        prev[slot] = _SENTINEL
+        nxt[slot] = first
+        prev[first] = slot
+        nxt[_SENTINEL] = slot
+
+    def _remove_slot(self, slot: int):
+        """Unlink slot from the list"""
+        prev, nxt = self.prev, self.next
+        before, after = prev[slot], nxt[slot]
+        nxt[before] = after
+        prev[after] = before
+
+    def _release_slot(self, slot: int):
+        """Clear slot and push it onto the free list"""
+        self.keys[slot] = None
+        self.vals[slot] = None
+        self.next[slot] = self.free
+        self.free = slot
+
+    def get(self, key: Hashable) -> Any:
+        """Get value by key (-1 if missing, same as LRUCache)"""
+        slot = self.cache.get(key)
+
+        if slot is None:
+            self.misses += 1
+            return -1
+
+        self.hits += 1
+        if self.next[_SENTINEL] != slot:
+            self._remove_slot(slot)
+            self._add_slot(slot)
+        return self.vals[slot]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or update value"""
+        if self.capacity <= 0:
+            return
+
+        slot = self.cache.get(key)
+
+        if slot is not None:
+            # Update existing
+            self.vals[slot] = value
+            self._remove_slot(slot)
+            self._add_slot(slot)
+            return
+
+        if self.free == _SENTINEL:
+            # Full: recycle the LRU slot (tail = sentinel's prev)
+            slot = self.prev[_SENTINEL]
+            self._remove_slot(slot)
+            del self.cache[self.keys[slot]]
+            self.evictions += 1
+        else:
+            slot = self.free
+            self.free = self.next[slot]
+
+        self.keys[slot] = key
+        self.vals[slot] = value
+        self.cache[key] = slot
+        self._add_slot(slot)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove key, return True if it was present"""
+        slot = self.cache.pop(key, None)
+
+        if slot is None:
+            return False
+
+        self._remove_slot(slot)
+        self._release_slot(slot)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size"""
+        return {
+            "size": len(self.cache),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Test cases
+if __name__ == "__main__":
+    lru = CompactLRUCache(2)
+
+    lru.put(1, 1)
+    lru.put(2, 2)
+    print(f"Get 1: {lru.get(1)}")  # Returns 1
+
+    lru.put(3, 3)  # Evicts key 2
+    print(f"Get 2: {lru.get(2)}")  # Returns -1 (not found)
+
+    lru.put(4, 4)  # Evicts key 1, reusing its slot
+    print(f"Get 1: {lru.get(1)}")  # Returns -1 (not found)
+    print(f"Get 3: {lru.get(3)}")  # Returns 3
+    print(f"Get 4: {lru.get(4)}")  # Returns 4
@@ -0,0 +1,102 @@
+"""
+Concurrent LRU Cache - Lock Striping
+Frequency: 60% (Common follow-up to LRU Cache in system design rounds)
+
+Make LRU Cache safe for many threads without one global mutex.
+The key space is split across N shards; each shard is an independent
+LRUCache guarded by its own lock, so threads touching different shards
+never wait on each other.
+
+Trade-off: eviction is LRU per shard, not globally. With a reasonable
+hash spread the result is very close to a global LRU of the same size.
+Shard capacities add up to exactly capacity; with fewer slots than shards
+the shard count is lowered so every shard holds at least one entry.
+
+Time Complexity: O(1) for get, put and delete
+Space Complexity: O(capacity)
+"""
+
+from threading import Lock
+from typing import Dict, Hashable, List
+
+from dsa.design_patterns.lru_cache import LRUCache
+
+
+class ConcurrentLRUCache:
+    """
+    Sharded LRU Cache: N independently locked LRUCache shards
+    """
+
+    def __init__(self, capacity: int, num_shards: int = 16):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self.num_shards = num_shards = min(num_shards, capacity)
+
+        # Spread capacity evenly: the first capacity % num_shards shards get
+        # one extra slot, so the total is exactly capacity
+        base, extra = divmod(capacity, num_shards)
+        self.shards: List[LRUCache] = [LRUCache(base + (i < extra)) for i in range(num_shards)]
+        self.locks: List[Lock] = [Lock() for _ in range(num_shards)]
+
+    def _shard_index(self, key: Hashable) -> int:
+        """Pick the shard responsible for key"""
+        return hash(key) % self.num_shards
+
+    def get(self, key: Hashable) -> int:
+        """Get value by key (-1 if missing, same as LRUCache)"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].get(key)
+
+    def put(self, key: Hashable, value: int) -> None:
+        """Insert or update value"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            self.shards[index].put(key, value)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove key, return True if it was present"""
+        index = self._shard_index(key)
+        with self.locks[index]:
+            return self.shards[index].delete(key)
+
+    def __len__(self) -> int:
+        total = 0
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                total += len(shard)
+        return total
+
+    def stats(self) -> Dict[str, int]:
+        """Counters summed across all shards"""
+        totals = {"size": 0, "capacity": 0, "hits": 0, "misses": 0, "evictions": 0}
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                for name, value in shard.stats().items():
+                    totals[name] += value
+        totals["shards"] = self.num_shards
+        return totals
+
+
+# Test cases
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = ConcurrentLRUCache(capacity=1000, num_shards=8)
+
+    def worker(worker_id: int) -> None:
+        for i in range(500):
+            cache.put((worker_id, i), i)
+            cache.get((worker_id, i))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(worker, range(4)))
+
+    print(f"Size: {len(cache)}")  # <= 1000
+    print(f"Stats: {cache.stats()}")
+    print(f"Delete (3, 499): {cache.delete((3, 499))}")
+    print(f"Get (3, 499): {cache.get((3, 499))}")  # Returns -1
@@ -8,11 +8,13 @@ Time Complexity: O(1) for both get and put
 Space Complexity: O(capacity)
 """
 
-from typing import Optional
+from typing import Dict, Optional
 
 
 class ListNode:
     """Doubly linked list node"""
+    __slots__ = ("key", "val", "prev", "next")
+    
     def __init__(self, key: int = 0, val: int = 0):
         self.key = key
         self.val = val
@@ -34,6 +36,11 @@ class LRUCache:
         self.tail = ListNode()
         self.head.next = self.tail
         self.tail.prev = self.head
+        
+        # Counters reported by stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
     
     def _add_node(self, node: ListNode):
         """Add node right after head"""
@@ -67,9 +74,11 @@ class LRUCache:
         node = self.cache.get(key)
         
         if not node:
+            self.misses += 1
             return -1
         
         # Move to head (mark as recently used)
+        self.hits += 1
         self._move_to_head(node)
         return node.val
     
@@ -85,6 +94,7 @@ class LRUCache:
                 # Remove LRU
                 tail = self._pop_tail()
                 del self.cache[tail.key]
+                self.evictions += 1
             
             self.cache[key] = new_node
             self._add_node(new_node)
@@ -92,6 +102,29 @@ class LRUCache:
             # Update existing
             node.val = value
             self._move_to_head(node)
+    
+    def delete(self, key: int) -> bool:
+        """Remove key, return True if it was present"""
+        node = self.cache.pop(key, None)
+        
+        if not node:
+            return False
+        
+        self._remove_node(node)
+        return True
+    
+    def __len__(self) -> int:
+        return len(self.cache)
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size"""
+        return {
+            "size": len(self.cache),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 
 # Test cases
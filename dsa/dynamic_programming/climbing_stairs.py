@@ -9,7 +9,7 @@ Time Complexity: O(n)
 Space Complexity: O(1) optimized, O(n) with memoization
 """
 
-from typing import Dict
+from utils.memoize import memoize
 
 
 def climb_stairs_recursive(n: int) -> int:
@@ -21,21 +21,15 @@ def climb_stairs_recursive(n: int) -> int:
     return climb_stairs_recursive(n - 1) + climb_stairs_recursive(n - 2)
 
 
-def climb_stairs_memo(n: int, memo: Dict[int, int] = None) -> int:
+@memoize(policy="lru", maxsize=256, fill_from=1)
+def climb_stairs_memo(n: int) -> int:
     """
-    Memoization: O(n) time, O(n) space
+    Memoization: O(n) time, O(1) space (bounded LRU memo)
+    Subproblems are filled bottom-up, so recursion depth does not grow with n
     """
-    if memo is None:
-        memo = {}
-    
-    if n in memo:
-        return memo[n]
-    
     if n <= 2:
         return n
-    
-    memo[n] = climb_stairs_memo(n - 1, memo) + climb_stairs_memo(n - 2, memo)
-    return memo[n]
+    return climb_stairs_memo(n - 1) + climb_stairs_memo(n - 2)
 
 
 def climb_stairs_dp(n: int) -> int:
@@ -12,6 +12,8 @@ Space Complexity: O(amount)
 
 from typing import List
 
+from utils.memoize import memoize
+
 
 def coin_change(coins: List[int], amount: int) -> int:
     """
@@ -32,15 +34,12 @@ def coin_change_memo(coins: List[int], amount: int) -> int:
     """
     Top-down memoization approach
     """
-    memo = {}
-    
+    @memoize(policy="lru", maxsize=max(1, amount + 1), fill_from=1)
     def dfs(remaining: int) -> int:
         if remaining == 0:
             return 0
         if remaining < 0:
             return float('inf')
-        if remaining in memo:
-            return memo[remaining]
         
         min_coins = float('inf')
         for coin in coins:
@@ -48,7 +47,6 @@ def coin_change_memo(coins: List[int], amount: int) -> int:
             if result != float('inf'):
                 min_coins = min(min_coins, result + 1)
         
-        memo[remaining] = min_coins
         return min_coins
     
     result = dfs(amount)
@@ -0,0 +1,194 @@
+"""
+Async Rate Limiter - System Design Pattern
+Token bucket for asyncio code: await acquire() instead of polling
+
+Reservation model: acquire() takes its tokens immediately and lets the
+balance go negative (debt). The caller then sleeps exactly debt / refill_rate
+seconds, the moment its tokens have been refilled. Each new caller adds to
+the debt, so wake-up times are strictly increasing in arrival order: waiters
+are served FIFO with one timer each and no lock or polling loop. Everything
+between awaits runs atomically on the event loop, so no lock is needed.
+"""
+
+import asyncio
+import json
+import math
+from typing import Any, Awaitable, Callable, Dict, Optional
+import time
+
+from system_design.rate_limiter import MultiTenantLimiter
+
+
+class AsyncTokenBucket:
+    """
+    Token Bucket Rate Limiter for asyncio
+    Allows bursts up to bucket capacity, then queues callers FIFO
+    """
+
+    def __init__(self, capacity: int, refill_rate: float,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        capacity: Maximum tokens in bucket
+        refill_rate: Tokens added per second
+        """
+        if refill_rate <= 0:
+            raise ValueError("refill_rate must be positive")
+
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock
+        self.tokens = float(capacity)  # negative while callers are waiting
+        self.last_refill = clock()
+
+    def _refill(self) -> None:
+        """Refill tokens based on time elapsed"""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def _check(self, tokens: int) -> None:
+        if tokens > self.capacity:
+            raise ValueError(f"cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+
+    def wait_time(self, tokens: int = 1) -> float:
+        """Seconds until acquire(tokens) would return, queued waiters included"""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.refill_rate)
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens only if available now (never jumps ahead of waiters)"""
+        self._check(tokens)
+        self._refill()
+
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    allow_request = try_acquire
+
+    async def acquire(self, tokens: int = 1, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait until tokens are available and take them
+
+        max_wait: Give up immediately (returning False, taking nothing) if
+            the wait would be longer than this; None waits as long as needed
+        """
+        self._check(tokens)
+        delay = self.wait_time(tokens)
+        if max_wait is not None and delay > max_wait:
+            return False
+
+        self.tokens -= tokens  # reserve: later callers queue behind us
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._refill()
+                self.tokens = min(self.capacity, self.tokens + tokens)
+                raise
+        return True
+
+    def is_idle(self, now: float, idle_timeout: float = 0.0) -> bool:
+        """True if full and unused for idle_timeout seconds (never with waiters)"""
+        elapsed = now - self.last_refill
+        return (elapsed >= idle_timeout
+                and self.tokens + elapsed * self.refill_rate >= self.capacity)
+
+
+class AsyncRateLimiter(MultiTenantLimiter):
+    """
+    Multi-user async token bucket limiter
+
+    Runs on one event loop, so a single shard is enough; idle buckets are
+    evicted the same way as in ShardedRateLimiter.
+    """
+
+    def __init__(self, capacity: int, refill_rate: float,
+                 idle_timeout: float = 60.0, min_sweep_size: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        super().__init__(lambda: AsyncTokenBucket(capacity, refill_rate, clock), 1,
+                         idle_timeout, min_sweep_size, clock)
+
+    def try_acquire(self, user_id: str, tokens: int = 1) -> bool:
+        """Take user's tokens only if available now"""
+        return self._bucket(user_id).try_acquire(tokens)
+
+    async def acquire(self, user_id: str, tokens: int = 1,
+                      max_wait: Optional[float] = None) -> bool:
+        """Wait for user's tokens (see AsyncTokenBucket.acquire)"""
+        return await self._bucket(user_id).acquire(tokens, max_wait)
+
+    def retry_after(self, user_id: str, tokens: int = 1) -> float:
+        """Seconds until user could be served"""
+        return self._bucket(user_id).wait_time(tokens)
+
+
+def client_host(scope: Dict[str, Any]) -> str:
+    """Default middleware key: the client's IP address"""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying an AsyncRateLimiter to every HTTP request
+
+    Requests wait (without blocking the event loop) for up to max_wait
+    seconds; beyond that they get 429 with a Retry-After header.
+    Works with FastAPI/Starlette via app.add_middleware(RateLimitMiddleware, ...)
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], limiter: AsyncRateLimiter,
+                 key_func: Callable[[Dict[str, Any]], str] = client_host,
+                 max_wait: float = 0.0):
+        self.app = app
+        self.limiter = limiter
+        self.key_func = key_func
+        self.max_wait = max_wait
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = self.key_func(scope)
+        if await self.limiter.acquire(key, max_wait=self.max_wait):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = math.ceil(self.limiter.retry_after(key))
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Example usage
+if __name__ == "__main__":
+    async def main():
+        bucket = AsyncTokenBucket(capacity=2, refill_rate=10.0)  # 10 tokens/second
+        start = time.monotonic()
+
+        async def request(i: int):
+            await bucket.acquire()
+            print(f"Request {i} served at {time.monotonic() - start:.2f}s")
+
+        # 2 served at once, the rest 0.1s apart in arrival order
+        await asyncio.gather(*(request(i) for i in range(6)))
+
+        limiter = AsyncRateLimiter(capacity=1, refill_rate=1.0)
+        print(f"user1: {await limiter.acquire('user1', max_wait=0.1)}")  # True
+        print(f"user1: {await limiter.acquire('user1', max_wait=0.1)}")  # False (1s wait)
+        print(f"user2: {limiter.try_acquire('user2')}")  # True
+
+    asyncio.run(main())
@@ -1,11 +1,13 @@
 """
 Cache Strategies - System Design Patterns
-LRU, LFU, FIFO, and Time-based expiration
+LRU, LFU, FIFO, Time-based expiration and W-TinyLFU
 """
 
-from typing import Optional, Dict, Any
-from collections import OrderedDict
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable, List
+from collections import OrderedDict, defaultdict
+from itertools import count
+from threading import Event, Lock, Thread
+import heapq
 import time
 
 
@@ -31,91 +33,342 @@ class FIFOCache:
             self.cache.popitem(last=False)
         
         self.cache[key] = value
+    
+    def __len__(self) -> int:
+        return len(self.cache)
 
 
 class LFUCache:
     """
-    Least Frequently Used Cache
+    Least Frequently Used Cache - O(1) get and put
+
+    Keys are grouped into frequency buckets. Each bucket is an OrderedDict
+    (a hash map over a doubly linked list), so within one frequency the
+    least recently used key is evicted first. min_freq always points at the
+    lowest non-empty bucket, so eviction never scans.
     """
     
     def __init__(self, capacity: int):
         self.capacity = capacity
         self.cache: Dict[str, Any] = {}
         self.freq: Dict[str, int] = {}
+        self.buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)
         self.min_freq = 0
     
+    def _touch(self, key: str) -> None:
+        """Move key from its bucket to the next frequency bucket"""
+        count = self.freq[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        
+        if not bucket:
+            del self.buckets[count]
+            if self.min_freq == count:
+                self.min_freq = count + 1
+        
+        self.freq[key] = count + 1
+        self.buckets[count + 1][key] = None
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value by key"""
         if key not in self.cache:
             return None
         
-        # Update frequency
-        self.freq[key] = self.freq.get(key, 0) + 1
+        self._touch(key)
         return self.cache[key]
     
     def put(self, key: str, value: Any) -> None:
         """Put key-value pair"""
-        if self.capacity == 0:
+        if self.capacity <= 0:
             return
         
         if key in self.cache:
             self.cache[key] = value
-            self.freq[key] = self.freq.get(key, 0) + 1
-        else:
-            if len(self.cache) >= self.capacity:
-                # Remove least frequently used
-                lfu_key = min(self.freq.keys(), key=lambda k: self.freq[k])
-                del self.cache[lfu_key]
-                del self.freq[lfu_key]
-            
-            self.cache[key] = value
-            self.freq[key] = 1
+            self._touch(key)
+            return
+        
+        if len(self.cache) >= self.capacity:
+            # Remove least frequently used (oldest within the lowest bucket)
+            bucket = self.buckets[self.min_freq]
+            lfu_key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_freq]
+            del self.cache[lfu_key]
+            del self.freq[lfu_key]
+        
+        self.cache[key] = value
+        self.freq[key] = 1
+        self.buckets[1][key] = None
+        self.min_freq = 1
+    
+    def __len__(self) -> int:
+        return len(self.cache)
 
 
 class TimeBasedCache:
     """
     Time-based expiration cache
+
+    Expiry deadlines are indexed in a min-heap of (expiry, seq, key), so
+    cleanup() only touches entries that have actually expired: O(k log n)
+    for k expired keys instead of a scan over the whole cache. Overwritten
+    keys leave stale heap entries behind; they are skipped when popped and
+    the heap is rebuilt once stale entries outnumber live ones.
+
+    Deadlines use a monotonic clock, so wall-clock jumps (NTP, DST) never
+    expire or resurrect entries. An optional background reaper thread calls
+    cleanup() every reaper_interval seconds.
     """
     
-    def __init__(self, default_ttl: int = 3600):
+    def __init__(self, default_ttl: int = 3600,
+                 reaper_interval: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
         """
         default_ttl: Default time-to-live in seconds
+        reaper_interval: Seconds between background sweeps (None = no thread)
+        clock: Monotonic time source in seconds
         """
-        self.cache: Dict[str, tuple] = {}
+        self.cache: Dict[str, tuple] = {}  # key -> (value, expiry)
+        self.expiry_heap: List[tuple] = []  # (expiry, seq, key)
         self.default_ttl = default_ttl
+        self.clock = clock
+        self.lock = Lock()
+        self._seq = count()
+        self._reaper: Optional[Thread] = None
+        self._stop_reaper = Event()
+        
+        if reaper_interval is not None:
+            self.start_reaper(reaper_interval)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value by key (returns None if expired)"""
-        if key not in self.cache:
-            return None
-        
-        value, expiry_time = self.cache[key]
-        
-        if datetime.now() > expiry_time:
-            # Expired, remove it
-            del self.cache[key]
-            return None
-        
-        return value
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            
+            value, expiry_time = entry
+            if self.clock() > expiry_time:
+                # Expired, remove it (its heap entry becomes stale)
+                del self.cache[key]
+                return None
+            
+            return value
     
     def put(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Put key-value pair with optional TTL"""
         ttl = ttl or self.default_ttl
-        expiry_time = datetime.now() + timedelta(seconds=ttl)
-        self.cache[key] = (value, expiry_time)
-    
-    def cleanup(self) -> int:
-        """Remove expired entries, return count removed"""
-        now = datetime.now()
-        expired_keys = [
-            key for key, (_, expiry) in self.cache.items()
-            if now > expiry
+        with self.lock:
+            expiry_time = self.clock() + ttl
+            self.cache[key] = (value, expiry_time)
+            heapq.heappush(self.expiry_heap, (expiry_time, next(self._seq), key))
+            
+            if len(self.expiry_heap) > 2 * len(self.cache) + 64:
+                self._rebuild_heap()
+    
+    def delete(self, key: str) -> bool:
+        """Remove key, return True if it was present (its heap entry goes stale)"""
+        with self.lock:
+            return self.cache.pop(key, None) is not None
+    
+    def _rebuild_heap(self) -> None:
+        """Drop stale heap entries (caller holds the lock)"""
+        self.expiry_heap = [
+            (expiry, next(self._seq), key)
+            for key, (_, expiry) in self.cache.items()
         ]
+        heapq.heapify(self.expiry_heap)
+    
+    def cleanup(self, max_items: Optional[int] = None) -> int:
+        """
+        Remove expired entries, return count removed
+        max_items: Stop after this many removals to bound lock hold time
+        """
+        removed = 0
+        with self.lock:
+            now = self.clock()
+            heap = self.expiry_heap
+            while heap and heap[0][0] < now:
+                if max_items is not None and removed >= max_items:
+                    break
+                expiry, _, key = heapq.heappop(heap)
+                entry = self.cache.get(key)
+                # Skip stale entries: key gone or re-put with a new deadline
+                if entry is not None and entry[1] == expiry:
+                    del self.cache[key]
+                    removed += 1
+        
+        return removed
+    
+    def start_reaper(self, interval: float) -> None:
+        """Start a daemon thread that calls cleanup() every interval seconds"""
+        if self._reaper is not None:
+            return
+        
+        self._stop_reaper.clear()
+        
+        def run():
+            while not self._stop_reaper.wait(interval):
+                self.cleanup()
+        
+        self._reaper = Thread(target=run, name="TimeBasedCache-reaper", daemon=True)
+        self._reaper.start()
+    
+    def stop_reaper(self) -> None:
+        """Stop the background reaper thread"""
+        if self._reaper is None:
+            return
+        
+        self._stop_reaper.set()
+        self._reaper.join()
+        self._reaper = None
+    
+    def __len__(self) -> int:
+        """Number of stored entries (may include expired, not yet swept)"""
+        return len(self.cache)
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch frequency estimator with periodic aging
+
+    depth rows of small saturating counters (max 15, like the 4-bit counters
+    in TinyLFU). estimate() returns the minimum over the rows, so it never
+    underestimates. After sample_size increments every counter is halved,
+    so old popularity fades and the sketch tracks the recent workload.
+    """
+    
+    _MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    
+    def __init__(self, width: int, depth: int = 4, sample_size: Optional[int] = None):
+        if not 1 <= depth <= len(self._SEEDS):
+            raise ValueError(f"depth must be between 1 and {len(self._SEEDS)}")
+        
+        # Round width up to a power of two so indexing is a mask
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.mask = self.width - 1
+        self.seeds = self._SEEDS[:depth]
+        self.rows = [bytearray(self.width) for _ in range(depth)]
+        self.sample_size = sample_size or 10 * width
+        self.additions = 0
+    
+    def increment(self, key: Any) -> None:
+        """Count one occurrence of key"""
+        h = hash(key)
+        mask = self.mask
+        for row, seed in zip(self.rows, self.seeds):
+            index = ((h * seed) >> 32) & mask
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+        
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+    
+    def estimate(self, key: Any) -> int:
+        """Estimated recent frequency of key"""
+        h = hash(key)
+        mask = self.mask
+        return min([row[((h * seed) >> 32) & mask] for row, seed in zip(self.rows, self.seeds)])
+    
+    def _age(self) -> None:
+        """Halve every counter"""
+        halve = bytes(count >> 1 for count in range(256))
+        self.rows = [row.translate(halve) for row in self.rows]
+        self.additions //= 2
+
+
+class WTinyLFUCache:
+    """
+    W-TinyLFU Cache (the policy behind Caffeine)
+
+    - Window: small LRU (window_ratio of capacity) that absorbs new keys,
+      so bursts of recent keys still get hits
+    - Main: segmented LRU, split into probation (20%) and protected (80%).
+      A hit in probation promotes the key to protected
+    - Admission: when a key falls out of the window and main is full, it
+      only replaces main's LRU victim if the Count-Min Sketch says it is
+      accessed more often. One-hit wonders from scans never displace the
+      hot set
+
+    All operations are O(1) (sketch depth is constant).
+    """
+    
+    def __init__(self, capacity: int, window_ratio: float = 0.01):
+        self.capacity = capacity
+        self.window_capacity = max(1, int(capacity * window_ratio)) if capacity > 1 else 0
+        main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(main_capacity * 0.8)
+        self.main_capacity = main_capacity
+        
+        self.window: OrderedDict = OrderedDict()
+        self.probation: OrderedDict = OrderedDict()
+        self.protected: OrderedDict = OrderedDict()
+        self.sketch = CountMinSketch(max(capacity, 16))
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value by key"""
+        self.sketch.increment(key)
+        
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._promote(key, value)
+            return value
+        
+        return None
+    
+    def _promote(self, key: str, value: Any) -> None:
+        """Move a probation hit into protected, demoting protected's LRU"""
+        self.protected[key] = value
+        if len(self.protected) > self.protected_capacity:
+            demoted_key, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted_key] = demoted_value
+    
+    def put(self, key: str, value: Any) -> None:
+        """Put key-value pair"""
+        if self.capacity <= 0:
+            return
+        
+        for segment in (self.window, self.protected, self.probation):
+            if key in segment:
+                segment[key] = value
+                self.get(key)
+                return
+        
+        self.sketch.increment(key)
+        
+        if self.window_capacity == 0:
+            self._admit(key, value)
+            return
         
-        for key in expired_keys:
-            del self.cache[key]
+        self.window[key] = value
+        if len(self.window) > self.window_capacity:
+            candidate_key, candidate_value = self.window.popitem(last=False)
+            self._admit(candidate_key, candidate_value)
+    
+    def _admit(self, key: str, value: Any) -> None:
+        """Offer a window evictee to the main segments"""
+        if len(self.probation) + len(self.protected) < self.main_capacity:
+            self.probation[key] = value
+            return
         
-        return len(expired_keys)
+        victims = self.probation if self.probation else self.protected
+        victim_key = next(iter(victims))
+        if self.sketch.estimate(key) > self.sketch.estimate(victim_key):
+            del victims[victim_key]
+            self.probation[key] = value
+    
+    def __len__(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
 
 
 # Example usage
@@ -146,4 +399,15 @@ if __name__ == "__main__":
     print(f"Get immediately: {tbc.get('temp')}")
     time.sleep(3)
     print(f"Get after 3 seconds: {tbc.get('temp')}")  # Should be None
+    
+    # W-TinyLFU Cache
+    print("\n=== W-TinyLFU Cache ===")
+    tiny = WTinyLFUCache(capacity=100)
+    for _ in range(5):
+        for i in range(50):
+            tiny.put(f"hot{i}", i)  # Hot set, seen many times
+    for i in range(1000):
+        tiny.put(f"scan{i}", i)  # One-off scan keys
+    hot_hits = sum(tiny.get(f"hot{i}") is not None for i in range(50))
+    print(f"Hot keys still cached after scan: {hot_hits}/50")
 
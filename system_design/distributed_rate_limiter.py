@@ -0,0 +1,264 @@
+"""
+Distributed Rate Limiter - System Design Pattern
+Token buckets whose state lives in a shared backend, so N worker processes
+enforce one global limit instead of N independent ones.
+
+    backend = RedisBackend(url="redis://localhost:6379/0")
+    limiter = LeasedRateLimiter(backend, capacity=100, refill_rate=10.0)
+    limiter.allow_request("user42")
+
+Backend contract: acquire() atomically refills the key's bucket and takes
+tokens from it in one step (check-and-decrement), so concurrent workers
+can never both spend the same token.
+
+Token leasing: instead of one round trip per request, a worker takes a
+lease of up to lease_size tokens and spends them locally. Leases expire
+after lease_ttl so unused tokens do not sit in an idle worker forever.
+Tokens only ever leave the shared bucket, so leasing can under-admit
+(tokens parked in other workers) but never over-admit. After a denial the
+worker waits until the next token could exist before asking again, so a
+throttled user does not cost a round trip per rejected request.
+"""
+
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Callable, Dict, List
+import time
+
+
+class RateLimitBackend(ABC):
+    """Shared token bucket state with an atomic check-and-decrement"""
+
+    @abstractmethod
+    def acquire(self, key: str, tokens: int, capacity: int, refill_rate: float,
+                partial: bool = False) -> int:
+        """
+        Refill key's bucket for elapsed time, then take tokens from it
+
+        partial=False: all-or-nothing, returns tokens or 0
+        partial=True: takes as many whole tokens as available (up to tokens)
+        Returns the number of tokens granted.
+        """
+
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    In-process backend: the local stand-in for Redis
+    (shares state between threads, not processes)
+
+    Like the Redis keys, buckets that would have refilled completely are
+    dropped (a fresh bucket is identical); buckets with refill_rate=0 never
+    refill, so they are kept.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, min_sweep_size: int = 1024):
+        """
+        min_sweep_size: Full buckets are swept whenever the table doubles
+            past this size, so one-off keys cannot grow it without bound
+        """
+        self.clock = clock
+        # key -> [tokens, last_refill, capacity, refill_rate]
+        self.buckets: Dict[str, List[float]] = {}
+        self.min_sweep_size = min_sweep_size
+        self.sweep_at = min_sweep_size
+        self.lock = Lock()
+
+    def acquire(self, key: str, tokens: int, capacity: int, refill_rate: float,
+                partial: bool = False) -> int:
+        with self.lock:
+            now = self.clock()
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                if len(self.buckets) >= self.sweep_at:
+                    self._drop_full(now)
+                    self.sweep_at = max(self.min_sweep_size, 2 * len(self.buckets))
+                bucket = self.buckets[key] = [float(capacity), now, capacity, refill_rate]
+            bucket[2] = capacity
+            bucket[3] = refill_rate
+
+            available = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+            if available >= tokens:
+                granted = tokens
+            elif partial:
+                granted = int(available)
+            else:
+                granted = 0
+
+            bucket[0] = available - granted
+            bucket[1] = now
+            return granted
+
+    def _drop_full(self, now: float) -> int:
+        """Drop buckets that have refilled to capacity by now (caller holds the lock)"""
+        full = [key for key, (tokens, last, capacity, rate) in self.buckets.items()
+                if rate > 0 and tokens + (now - last) * rate >= capacity]
+        for key in full:
+            del self.buckets[key]
+        return len(full)
+
+    def release_full(self) -> int:
+        """Drop fully refilled buckets, return how many were removed"""
+        with self.lock:
+            return self._drop_full(self.clock())
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Redis backend: the bucket is a hash {tokens, ts} updated by a Lua script,
+    which Redis runs atomically. Time comes from the Redis server (TIME), so
+    worker clock skew does not matter. Keys expire once a bucket would have
+    refilled completely, so idle users cost no memory. With refill_rate=0 a
+    bucket never refills, so its key is kept: expiring it would hand the
+    user a fresh, full bucket.
+    """
+
+    LUA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local partial = ARGV[4] == '1'
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_rate)
+
+local granted = 0
+if tokens >= requested then
+    granted = requested
+elseif partial then
+    granted = math.floor(tokens)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - granted), 'ts', tostring(now))
+if refill_rate > 0 then
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_rate * 1000) + 1000)
+end
+return granted
+"""
+
+    def __init__(self, client=None, url: str = "redis://localhost:6379/0",
+                 prefix: str = "ratelimit:"):
+        """
+        client: An existing redis.Redis client (else one is built from url)
+        prefix: Prepended to every bucket key
+        """
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+        # EVALSHA with automatic SCRIPT LOAD on NOSCRIPT
+        self.script = client.register_script(self.LUA_SCRIPT)
+
+    def acquire(self, key: str, tokens: int, capacity: int, refill_rate: float,
+                partial: bool = False) -> int:
+        granted = self.script(keys=[self.prefix + key],
+                              args=[capacity, refill_rate, tokens, int(partial)])
+        return int(granted)
+
+
+class LeasedRateLimiter:
+    """
+    Multi-user rate limiter over a shared backend with local token leases
+    """
+
+    def __init__(self, backend: RateLimitBackend, capacity: int, refill_rate: float,
+                 lease_size: int = 10, lease_ttl: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, min_sweep_size: int = 1024):
+        """
+        lease_size: Tokens fetched per backend round trip (1 = no leasing)
+        lease_ttl: Seconds a lease stays usable; unused tokens are then dropped
+        min_sweep_size: Expired leases are swept whenever the table doubles
+            past this size, so one-off users cannot grow it without bound
+        """
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.lease_size = max(1, min(lease_size, capacity))
+        self.lease_ttl = lease_ttl
+        self.clock = clock
+        # key -> [tokens left, expires_at, retry_at]
+        self.leases: Dict[str, List[float]] = {}
+        self.min_sweep_size = min_sweep_size
+        self.sweep_at = min_sweep_size
+        self.lock = Lock()
+        self.backend_calls = 0
+
+    def _take_local(self, user_id: str, tokens: int, now: float) -> bool:
+        """Spend from the local lease (caller holds the lock)"""
+        lease = self.leases.get(user_id)
+        if lease is None or lease[1] <= now:
+            return False
+        if lease[0] >= tokens:
+            lease[0] -= tokens
+            return True
+        return False
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """Check if user's request is allowed"""
+        with self.lock:
+            now = self.clock()
+            if self._take_local(user_id, tokens, now):
+                return True
+            lease = self.leases.get(user_id)
+            if lease is not None and now < lease[2]:
+                return False  # Denied recently, backend cannot have refilled yet
+
+        # Round trip outside the lock so other users are not blocked on I/O
+        granted = self.backend.acquire(user_id, max(tokens, self.lease_size),
+                                       self.capacity, self.refill_rate, partial=True)
+
+        with self.lock:
+            self.backend_calls += 1
+            now = self.clock()
+            lease = self.leases.get(user_id)
+            if lease is None or lease[1] <= now:
+                lease = self.leases[user_id] = [0, now + self.lease_ttl, now]
+                if len(self.leases) >= self.sweep_at:
+                    self._drop_expired(now)
+                    self.sweep_at = max(self.min_sweep_size, 2 * len(self.leases))
+            lease[0] += granted
+            if self._take_local(user_id, tokens, now):
+                return True
+
+            # Earliest moment the missing tokens could have been refilled
+            if self.refill_rate > 0:
+                wait = min(self.lease_ttl, (tokens - lease[0]) / self.refill_rate)
+            else:
+                wait = self.lease_ttl
+            lease[2] = now + wait
+            return False
+
+    def _drop_expired(self, now: float) -> int:
+        """Drop leases expired at now (caller holds the lock)"""
+        expired = [key for key, lease in self.leases.items() if lease[1] <= now]
+        for key in expired:
+            del self.leases[key]
+        return len(expired)
+
+    def release_expired(self) -> int:
+        """Drop expired leases, return how many were removed"""
+        with self.lock:
+            return self._drop_expired(self.clock())
+
+
+# Example usage
+if __name__ == "__main__":
+    # Two "workers" share one backend: the limit is global, not per worker
+    backend = InMemoryBackend()
+    workers = [LeasedRateLimiter(backend, capacity=20, refill_rate=1.0, lease_size=5)
+               for _ in range(2)]
+
+    allowed = 0
+    for i in range(40):
+        if workers[i % 2].allow_request("user1"):
+            allowed += 1
+
+    print(f"Allowed {allowed}/40 requests across 2 workers (capacity 20)")
+    print(f"Backend round trips: {sum(w.backend_calls for w in workers)}")
@@ -0,0 +1,311 @@
+"""
+Durable Message Queue - System Design Pattern
+MessageQueue whose messages are written ahead to append-only segment files
+
+    mq = DurableMessageQueue("/var/lib/app/jobs", fsync="interval", fsync_interval_ms=50)
+    mq.put({"job": 1})
+    job = mq.get()
+    ...process job...
+    mq.commit()
+
+Same put/get/put_batch/get_batch/task_done/join interface as MessageQueue
+(it only overrides the storage hooks). Pending messages are also kept in
+memory, so get() never touches the disk. Delayed delivery (put(delay=),
+put_at() in the future) raises ValueError: the deadline heap lives in
+memory only, so a crash would silently lose scheduled messages.
+
+Directory layout:
+    00000000000000000000.log   segment files named after their first offset;
+                               records: offset | length | crc | pickled message
+    offsets                    committed offset checkpoint (atomic replace)
+
+Offsets: every message gets a sequential offset. get() hands messages out
+in offset order; commit() checkpoints the offset of the next undelivered
+message. On restart everything from the committed offset on is replayed:
+delivery is at-least-once (auto_commit=True commits on every get instead,
+making it at-most-once). Segments entirely below the committed offset are
+deleted.
+
+fsync policies (durability against power loss / OS crash; every record is
+written to the OS immediately, so a crash of the process alone never loses
+an acknowledged put):
+    "always"    fsync before put() returns (one fsync per put_batch)
+    "interval"  a background thread fsyncs every fsync_interval_ms if dirty
+    "never"     leave it to the OS
+"""
+
+from threading import Event, Thread
+from typing import Any, List, Optional
+import os
+import pickle
+import struct
+import zlib
+
+from system_design.message_queue import MessageQueue
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class DurableMessageQueue(MessageQueue):
+    """
+    Write-ahead-logged message queue with consumer offset checkpoints
+    """
+
+    RECORD_HEADER = struct.Struct("<QII")  # offset, length, crc32
+    CHECKPOINT = struct.Struct("<QI")  # committed offset, crc32
+    SEGMENT_SUFFIX = ".log"
+
+    def __init__(self, directory: str, max_size: Optional[int] = None,
+                 fsync: str = "interval", fsync_interval_ms: float = 100,
+                 segment_bytes: int = 64 << 20, auto_commit: bool = False):
+        """
+        directory: Where segments and the offset checkpoint live (created if missing)
+        max_size: Maximum queue size (None for unlimited)
+        fsync: "always", "interval" or "never" (see module docstring)
+        fsync_interval_ms: Flush period for the "interval" policy
+        segment_bytes: Roll to a new segment file once the current one is this big
+        auto_commit: Commit the offset on every get (at-most-once delivery)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+
+        super().__init__(max_size)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.checkpoint_path = os.path.join(directory, "offsets")
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.segment_bytes = segment_bytes
+        self.auto_commit = auto_commit
+
+        self.segments: List[int] = []  # base offsets, ascending
+        self.segment = None
+        self.segment_size = 0
+        self.dirty = False
+        self.closed = False
+
+        self.committed = self._read_checkpoint()
+        self.read_offset = self.committed  # offset of the next message get() returns
+        self.write_offset = self.committed  # offset the next put() gets
+        self._recover()
+        self.unfinished_tasks = len(self.queue)
+
+        self._stop_flusher = Event()
+        self._flusher: Optional[Thread] = None
+        if fsync == "interval":
+            self._flusher = Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    # ---- files ----
+
+    def _segment_path(self, base: int) -> str:
+        return os.path.join(self.directory, f"{base:020d}{self.SEGMENT_SUFFIX}")
+
+    def _read_checkpoint(self) -> int:
+        try:
+            with open(self.checkpoint_path, "rb") as f:
+                data = f.read(self.CHECKPOINT.size)
+        except FileNotFoundError:
+            return 0
+
+        if len(data) == self.CHECKPOINT.size:
+            offset, crc = self.CHECKPOINT.unpack(data)
+            if crc == zlib.crc32(data[:8]):
+                return offset
+        raise ValueError(f"{self.checkpoint_path} is corrupt")
+
+    def _write_checkpoint(self, offset: int) -> None:
+        data = self.CHECKPOINT.pack(offset, zlib.crc32(struct.pack("<Q", offset)))
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if self.fsync != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _recover(self) -> None:
+        """Replay segments from the committed offset, truncating a torn tail"""
+        self.segments = sorted(
+            int(name[:-len(self.SEGMENT_SUFFIX)]) for name in os.listdir(self.directory)
+            if name.endswith(self.SEGMENT_SUFFIX) and name[:-len(self.SEGMENT_SUFFIX)].isdigit()
+        )
+        header = self.RECORD_HEADER
+
+        for i, base in enumerate(self.segments):
+            path = self._segment_path(base)
+            with open(path, "rb") as f:
+                data = f.read()
+
+            pos = 0
+            expected = base
+            while pos + header.size <= len(data):
+                offset, length, crc = header.unpack_from(data, pos)
+                end = pos + header.size + length
+                if (offset != expected or end > len(data)
+                        or zlib.crc32(data[pos + header.size:end]) != crc):
+                    break
+                if offset >= self.committed:
+                    self.queue.append(pickle.loads(data[pos + header.size:end]))
+                expected += 1
+                pos = end
+
+            if pos < len(data):
+                if i != len(self.segments) - 1:
+                    raise ValueError(f"{path} is corrupt at byte {pos}")
+                with open(path, "r+b") as f:  # torn write from a crash
+                    f.truncate(pos)
+            self.write_offset = max(self.write_offset, expected)
+
+        self.read_offset = self.write_offset - len(self.queue)
+        if self.segments:
+            self.segment = open(self._segment_path(self.segments[-1]), "ab", buffering=0)
+            self.segment_size = self.segment.tell()
+        else:
+            self._roll()
+
+    def _roll(self) -> None:
+        """Start a new segment at write_offset"""
+        if self.segment is not None:
+            if self.fsync != "never":
+                os.fsync(self.segment.fileno())
+            self.segment.close()
+        self.segments.append(self.write_offset)
+        self.segment = open(self._segment_path(self.write_offset), "ab", buffering=0)
+        self.segment_size = 0
+
+    def _append(self, messages: List[Any]) -> None:
+        """Write records for messages in one system call"""
+        if self.closed:
+            raise ValueError("queue is closed")
+        if self.segment_size >= self.segment_bytes:
+            self._roll()
+
+        chunks = []
+        offset = self.write_offset
+        for message in messages:
+            payload = pickle.dumps(message)
+            chunks.append(self.RECORD_HEADER.pack(offset, len(payload), zlib.crc32(payload)))
+            chunks.append(payload)
+            offset += 1
+        data = b"".join(chunks)
+
+        self.segment.write(data)
+        self.segment_size += len(data)
+        self.write_offset = offset
+        if self.fsync == "always":
+            os.fsync(self.segment.fileno())
+        else:
+            self.dirty = True
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flusher.wait(self.fsync_interval):
+            self.sync()
+
+    def sync(self) -> None:
+        """fsync the current segment if anything was written since the last sync"""
+        with self.lock:
+            if not self.dirty or self.closed:
+                return
+            # A duplicate descriptor stays valid if the segment is rolled or
+            # closed meanwhile, so the flush itself can run without the lock
+            # and never stalls put()/get() callers
+            fd = os.dup(self.segment.fileno())
+            self.dirty = False
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _schedule(self, message: Any, due: float) -> bool:
+        raise ValueError("delayed delivery is not durable; use a MessageQueue "
+                         "or put the message when it is due")
+
+    # ---- storage hooks (lock held) ----
+
+    def _put(self, message: Any) -> None:
+        self._append([message])
+        self.queue.append(message)
+
+    def _put_batch(self, messages: List[Any]) -> None:
+        self._append(messages)
+        self.queue.extend(messages)
+
+    def _get(self) -> Any:
+        message = self.queue.popleft()
+        self._delivered(1)
+        return message
+
+    def _get_batch(self, count: int) -> List[Any]:
+        popleft = self.queue.popleft
+        batch = [popleft() for _ in range(count)]
+        self._delivered(count)
+        return batch
+
+    def _delivered(self, count: int) -> None:
+        self.read_offset += count
+        if self.auto_commit:
+            self._commit(self.read_offset)
+
+    # ---- offsets ----
+
+    def _commit(self, offset: int) -> None:
+        if offset <= self.committed:
+            return
+        self._write_checkpoint(offset)
+        self.committed = offset
+
+        # Drop segments whose every record is below the committed offset
+        while len(self.segments) > 1 and self.segments[1] <= offset:
+            os.remove(self._segment_path(self.segments.pop(0)))
+
+    def commit(self, offset: Optional[int] = None) -> int:
+        """
+        Checkpoint that every message before offset has been processed
+        (default: everything delivered so far). Returns the committed offset.
+        """
+        with self.lock:
+            if offset is None:
+                offset = self.read_offset
+            if offset > self.read_offset:
+                raise ValueError(f"cannot commit {offset}: only {self.read_offset} delivered")
+            self._commit(offset)
+            return self.committed
+
+    def close(self) -> None:
+        """Stop the flusher, fsync and close the current segment"""
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+
+        with self.lock:
+            if self.closed:
+                return
+            if self.fsync != "never":
+                os.fsync(self.segment.fileno())
+            self.segment.close()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        with DurableMessageQueue(directory, fsync="always") as mq:
+            for i in range(5):
+                mq.put(f"Message {i}")
+            print(f"Got: {mq.get()}, {mq.get()}")
+            mq.commit()
+            print(f"Got (not committed): {mq.get()}")
+
+        # "Restart": the uncommitted message is delivered again
+        with DurableMessageQueue(directory) as mq:
+            print(f"Replayed {mq.size()} messages: {mq.get_batch(10, max_wait=0)}")
@@ -0,0 +1,432 @@
+"""
+Health Checking - System Design Pattern
+Active probes, passive outlier ejection and circuit breakers for a server pool
+
+    pool = ServerPool(servers, probe=http_probe(lambda s: f"http://{s.id}/health"))
+    pool.start()                                     # probe every interval
+    balancer = RoundRobinBalancer(servers)
+    with pool.acquire(balancer) as server:           # records success/failure
+        forward(request, server)
+
+Three independent reasons take a server out of rotation:
+- Active health checks: probe(server) runs every interval; unhealthy_threshold
+  consecutive failed probes mark it down, healthy_threshold successes up again
+- Outlier ejection (passive): consecutive_errors failed requests in a row eject
+  it for base_ejection_time * number of times ejected so far, capped at
+  max_ejection_time; at most max_ejection_percent of the pool is ejected at once, so a shared outage
+  cannot empty it
+- Circuit breaker: opens when the failure ratio over the last requests is too
+  high, rejects everything for reset_timeout, then lets half_open_calls trial
+  requests through and closes only if they all succeed
+
+The pool folds them into Server.available. Every balancer checks that flag
+per candidate (O(1)) instead of rebuilding its ring, heap or schedule;
+listeners see the change, so the least-connections heap only re-sifts the one
+server. Time-based transitions (ejection expiry, open -> half-open) happen in
+tick(), which check() and the background thread call.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import socket
+import time
+import urllib.request
+
+from system_design.load_balancer import Server
+
+Probe = Callable[[Server], bool]
+
+
+def tcp_probe(address: Callable[[Server], Tuple[str, int]], timeout: float = 1.0) -> Probe:
+    """Probe that passes if a TCP connection to address(server) succeeds"""
+    def probe(server: Server) -> bool:
+        try:
+            with socket.create_connection(address(server), timeout=timeout):
+                return True
+        except OSError:
+            return False
+    return probe
+
+
+def http_probe(url: Callable[[Server], str], timeout: float = 1.0,
+               expected_status: int = 200) -> Probe:
+    """Probe that passes if GET url(server) answers expected_status"""
+    def probe(server: Server) -> bool:
+        try:
+            with urllib.request.urlopen(url(server), timeout=timeout) as response:
+                return response.status == expected_status
+        except OSError:  # refused, timed out, or an HTTP error status
+            return False
+    return probe
+
+
+class FakeBackend:
+    """
+    Local HTTP backend for tests and demos
+    GET /health answers 200 while healthy is set, 503 otherwise; any other
+    path answers 500 while failing is set. stop() makes it refuse connections.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.healthy = True
+        self.failing = False
+        self.requests = 0
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                backend.requests += 1
+                if self.path == "/health":
+                    status = 200 if backend.healthy else 503
+                else:
+                    status = 500 if backend.failing else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.address: Tuple[str, int] = self.httpd.server_address[:2]
+        self.thread = Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.address[0]}:{self.address[1]}"
+
+    def stop(self) -> None:
+        """Shut down and close the listening socket"""
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class CircuitBreaker:
+    """
+    Per-server circuit breaker: closed -> open -> half-open -> closed
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_ratio: float = 0.5, window: int = 20, min_calls: int = 10,
+                 reset_timeout: float = 30.0, half_open_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        failure_ratio: Open when this share of the last window requests failed
+        window: Number of recent outcomes considered while closed
+        min_calls: Outcomes needed before the ratio is trusted
+        reset_timeout: Seconds to stay open before allowing trial requests
+        half_open_calls: Trial requests; all must succeed to close again
+        """
+        if min_calls > window:
+            raise ValueError("min_calls cannot exceed window")
+
+        self.failure_ratio = failure_ratio
+        self.window = window
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.outcomes = deque()  # True = success, newest last
+        self.failures = 0  # failures in outcomes
+        self.opened_at = 0.0
+        self.trials = 0  # trial requests dispatched while half-open
+        self.trial_successes = 0
+
+    def tick(self) -> None:
+        """Move from open to half-open once reset_timeout has passed"""
+        if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.trials = self.trial_successes = 0
+
+    def allows_traffic(self) -> bool:
+        """Whether a new request may be sent now"""
+        self.tick()
+        if self.state == self.CLOSED:
+            return True
+        return self.state == self.HALF_OPEN and self.trials < self.half_open_calls
+
+    def on_dispatch(self) -> None:
+        """Count a request sent through the breaker"""
+        if self.state == self.HALF_OPEN:
+            self.trials += 1
+
+    def on_abandon(self) -> None:
+        """A dispatched request ended without an outcome: free its trial slot"""
+        if self.state == self.HALF_OPEN and self.trials > self.trial_successes:
+            self.trials -= 1
+
+    def record_success(self) -> None:
+        if self.state == self.CLOSED:
+            self._record(True)
+        elif self.state == self.HALF_OPEN:
+            self.trial_successes += 1
+            if self.trial_successes >= self.half_open_calls:
+                self.state = self.CLOSED
+        # While open: a straggler from before the breaker opened, ignored
+
+    def record_failure(self) -> None:
+        if self.state == self.CLOSED:
+            self._record(False)
+            if (len(self.outcomes) >= self.min_calls
+                    and self.failures >= self.failure_ratio * len(self.outcomes)):
+                self._open()
+        elif self.state == self.HALF_OPEN:
+            self._open()
+
+    def _record(self, success: bool) -> None:
+        if len(self.outcomes) == self.window:
+            self.failures -= not self.outcomes.popleft()
+        self.outcomes.append(success)
+        self.failures += not success
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+        self.outcomes.clear()
+        self.failures = 0
+
+
+class ServerHealth:
+    """Health bookkeeping for one server in a ServerPool"""
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.healthy = True  # active checks
+        self.probe_successes = 0  # consecutive
+        self.probe_failures = 0  # consecutive
+        self.consecutive_errors = 0  # passive, request outcomes
+        self.ejected_until: Optional[float] = None
+        self.ejections = 0
+        self.breaker = breaker
+
+
+class ServerPool:
+    """
+    Servers with active health checks, outlier ejection and circuit breakers
+    """
+
+    def __init__(self, servers: List[Server], probe: Optional[Probe] = None,
+                 interval: float = 5.0, healthy_threshold: int = 2,
+                 unhealthy_threshold: int = 3, consecutive_errors: int = 5,
+                 base_ejection_time: float = 30.0, max_ejection_time: float = 300.0,
+                 max_ejection_percent: float = 50.0,
+                 breaker_factory: Optional[Callable[[], CircuitBreaker]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        probe: Active health check (None: passive checks only)
+        interval: Seconds between probe rounds of the background thread
+        healthy_threshold / unhealthy_threshold: Consecutive probe results
+            needed to mark a server up / down
+        consecutive_errors: Failed requests in a row that eject a server
+        base_ejection_time: First ejection length; the nth lasts n times as long
+        max_ejection_time: Upper bound on any one ejection
+        max_ejection_percent: Never eject more than this share of the servers
+        breaker_factory: Builds each server's CircuitBreaker (default settings
+            on this pool's clock if None)
+        """
+        self.servers = servers
+        self.probe = probe
+        self.interval = interval
+        self.healthy_threshold = healthy_threshold
+        self.unhealthy_threshold = unhealthy_threshold
+        self.consecutive_errors = consecutive_errors
+        self.base_ejection_time = base_ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.max_ejection_percent = max_ejection_percent
+        self.clock = clock
+        if breaker_factory is None:
+            breaker_factory = lambda: CircuitBreaker(clock=clock)
+
+        self.lock = Lock()
+        self.health: Dict[str, ServerHealth] = {s.id: ServerHealth(breaker_factory()) for s in servers}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    # ---- availability (lock held) ----
+
+    def _refresh(self, server: Server) -> None:
+        health = self.health[server.id]
+        server.set_available(health.healthy and health.ejected_until is None
+                             and health.breaker.allows_traffic())
+
+    def _ejected_count(self) -> int:
+        return sum(h.ejected_until is not None for h in self.health.values())
+
+    def tick(self) -> None:
+        """Apply time-based transitions: ejection expiry, breaker open -> half-open"""
+        with self.lock:
+            now = self.clock()
+            for server in self.servers:
+                health = self.health[server.id]
+                if health.ejected_until is not None and now >= health.ejected_until:
+                    health.ejected_until = None
+                    health.consecutive_errors = 0
+                self._refresh(server)
+
+    # ---- active checks ----
+
+    def check(self) -> None:
+        """Run one round of probes (outside the lock), then tick()"""
+        if self.probe is not None:
+            results = []
+            for server in self.servers:
+                try:
+                    ok = bool(self.probe(server))
+                except Exception:
+                    ok = False
+                results.append((server, ok))
+
+            with self.lock:
+                for server, ok in results:
+                    self._probe_result(self.health[server.id], ok)
+        self.tick()
+
+    def _probe_result(self, health: ServerHealth, ok: bool) -> None:
+        if ok:
+            health.probe_successes += 1
+            health.probe_failures = 0
+            if not health.healthy and health.probe_successes >= self.healthy_threshold:
+                health.healthy = True
+        else:
+            health.probe_failures += 1
+            health.probe_successes = 0
+            if health.healthy and health.probe_failures >= self.unhealthy_threshold:
+                health.healthy = False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Probe every interval on a daemon thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # ---- passive checks ----
+
+    def record_success(self, server: Server) -> None:
+        with self.lock:
+            health = self.health[server.id]
+            health.consecutive_errors = 0
+            health.breaker.record_success()
+            self._refresh(server)
+
+    def record_failure(self, server: Server) -> None:
+        with self.lock:
+            health = self.health[server.id]
+            health.consecutive_errors += 1
+            health.breaker.record_failure()
+            if (health.ejected_until is None
+                    and health.consecutive_errors >= self.consecutive_errors
+                    and (self._ejected_count() + 1) * 100
+                    <= self.max_ejection_percent * len(self.servers)):
+                health.ejections += 1
+                health.ejected_until = self.clock() + min(self.base_ejection_time * health.ejections,
+                                                          self.max_ejection_time)
+            self._refresh(server)
+
+    @contextmanager
+    def acquire(self, balancer) -> Iterator[Server]:
+        """
+        Pick a server from balancer and hold a connection to it; the request
+        counts as failed if the block raises an Exception. KeyboardInterrupt,
+        GeneratorExit or a cancelled task say nothing about the server: they
+        only give back a half-open trial slot
+        """
+        with self.lock:
+            server = balancer.get_server()
+            self.health[server.id].breaker.on_dispatch()
+            self._refresh(server)  # half-open: may have used the last trial
+            server.handle_request()
+
+        start = self.clock()
+        try:
+            yield server
+        except Exception:
+            self.record_failure(server)
+            raise
+        except BaseException:
+            with self.lock:
+                self.health[server.id].breaker.on_abandon()
+                self._refresh(server)
+            raise
+        else:
+            end = self.clock()
+            server.record_latency(end - start, end)
+            self.record_success(server)
+        finally:
+            with self.lock:
+                server.complete_request()
+
+    def available_servers(self) -> List[Server]:
+        return [s for s in self.servers if s.available]
+
+    def status(self, server: Server) -> str:
+        """Human-readable reason a server is in or out of rotation"""
+        with self.lock:
+            health = self.health[server.id]
+            if not health.healthy:
+                return "unhealthy"
+            if health.ejected_until is not None:
+                return "ejected"
+            if health.breaker.state != CircuitBreaker.CLOSED:
+                return f"breaker {health.breaker.state}"
+            return "up"
+
+
+# Example usage
+if __name__ == "__main__":
+    from system_design.load_balancer import RoundRobinBalancer
+
+    backends = [FakeBackend() for _ in range(3)]
+    servers = [Server(f"{b.address[0]}:{b.address[1]}") for b in backends]
+    pool = ServerPool(servers, probe=http_probe(lambda s: f"http://{s.id}/health"),
+                      unhealthy_threshold=1, healthy_threshold=1, consecutive_errors=2)
+    balancer = RoundRobinBalancer(servers)
+
+    def send(server: Server) -> None:
+        urllib.request.urlopen(f"http://{server.id}/", timeout=1).close()
+
+    print("=== Active health check ===")
+    backends[0].healthy = False
+    pool.check()
+    for server in servers:
+        print(f"{server.id}: {pool.status(server)}")
+
+    print("\n=== Outlier ejection ===")
+    backends[1].failing = True
+    for i in range(6):
+        try:
+            with pool.acquire(balancer) as server:
+                send(server)
+            print(f"Request {i + 1} -> {server.id}: ok")
+        except OSError:
+            print(f"Request {i + 1} -> {server.id}: failed")
+    for server in servers:
+        print(f"{server.id}: {pool.status(server)}")
+
+    for backend in backends:
+        backend.stop()
@@ -1,30 +1,124 @@
 """
 Load Balancer - System Design Pattern
-Round Robin, Least Connections, Weighted Round Robin
+Round Robin, Least Connections, Weighted Round Robin, Consistent Hashing,
+Power of Two Choices with peak-EWMA latency
 """
 
-from typing import List, Dict
+from bisect import bisect_right
+from contextlib import contextmanager
+from threading import Lock, RLock
+from typing import Callable, Hashable, Iterator, List, Dict, Optional, Tuple
 from collections import defaultdict
+import hashlib
+import heapq
+import math
 import random
+import time
+import weakref
+
+
+def stable_hash(key: Hashable) -> int:
+    """64-bit hash that is the same in every process (unlike hash())"""
+    data = key if isinstance(key, bytes) else str(key).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
 
 
 class Server:
     """Represents a backend server"""
     
-    def __init__(self, id: str, weight: int = 1):
+    def __init__(self, id: str, weight: int = 1, latency_decay: float = 10.0):
+        """
+        latency_decay: Seconds over which old latency samples fade from the
+            peak EWMA (time constant of the exponential decay)
+        """
         self.id = id
         self.weight = weight
         self.active_connections = 0
         self.total_requests = 0
+        self.latency_decay = latency_decay
+        self.latency_ewma = 0.0  # seconds, as of latency_updated_at
+        self.latency_updated_at: Optional[float] = None
+        # False while health checks, outlier ejection or a circuit breaker
+        # keep the server out of rotation; every balancer skips it
+        self.available = True
+        # Bound methods called with the server after every connection count,
+        # weight or availability change. Held weakly, so a balancer that is
+        # dropped stops listening instead of being kept alive by its servers
+        self.listeners: List[weakref.WeakMethod] = []
+    
+    def add_listener(self, listener: Callable[["Server"], None]):
+        """Subscribe a bound method to changes (held by weak reference)"""
+        self.listeners = [ref for ref in self.listeners if ref() is not None]
+        self.listeners.append(weakref.WeakMethod(listener))
+    
+    def remove_listener(self, listener: Callable[["Server"], None]):
+        """Unsubscribe listener (and prune listeners that were collected)"""
+        self.listeners = [ref for ref in self.listeners if ref() not in (None, listener)]
+    
+    def _changed(self):
+        dead = False
+        for ref in self.listeners:
+            listener = ref()
+            if listener is None:
+                dead = True
+            else:
+                listener(self)
+        if dead:
+            self.listeners = [ref for ref in self.listeners if ref() is not None]
+    
+    def record_latency(self, latency: float, now: Optional[float] = None):
+        """
+        Feed an observed response time (seconds) into the peak EWMA
+        A sample above the average replaces it at once (peak); lower ones
+        are averaged in with a weight that grows with the time since the
+        previous sample. now defaults to time.monotonic().
+        """
+        if now is None:
+            now = time.monotonic()
+        if latency > self.latency_ewma:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = latency + (self.latency_ewma - latency) * self._decay(now)
+        self.latency_updated_at = now
+    
+    def _decay(self, now: float) -> float:
+        """Weight left to the current average after the time since the last sample"""
+        if self.latency_updated_at is None:
+            return 0.0
+        elapsed = max(0.0, now - self.latency_updated_at)
+        return math.exp(-elapsed / self.latency_decay)
+    
+    def latency_estimate(self, now: Optional[float] = None) -> float:
+        """
+        Peak EWMA latency, decayed toward 0 for the time without samples
+        so an idle slow server is eventually tried again (0.0 before any
+        sample)
+        """
+        if now is None:
+            now = time.monotonic()
+        return self.latency_ewma * self._decay(now)
+    
+    def set_weight(self, weight: int):
+        """Change the weight and let balancers using it update"""
+        self.weight = weight
+        self._changed()
+    
+    def set_available(self, available: bool):
+        """Take the server in or out of rotation"""
+        if available != self.available:
+            self.available = available
+            self._changed()
     
     def handle_request(self):
         """Handle a request"""
         self.active_connections += 1
         self.total_requests += 1
+        self._changed()
     
     def complete_request(self):
         """Complete a request"""
         self.active_connections -= 1
+        self._changed()
 
 
 class RoundRobinBalancer:
@@ -36,12 +130,12 @@ class RoundRobinBalancer:
     
     def get_server(self) -> Server:
         """Get next server in round-robin fashion"""
-        if not self.servers:
-            raise ValueError("No servers available")
-        
-        server = self.servers[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.servers)
-        return server
+        for _ in range(len(self.servers)):
+            server = self.servers[self.current_index]
+            self.current_index = (self.current_index + 1) % len(self.servers)
+            if server.available:
+                return server
+        raise ValueError("No servers available")
 
 
 class LeastConnectionsBalancer:
@@ -52,51 +146,399 @@ class LeastConnectionsBalancer:
     
     def get_server(self) -> Server:
         """Get server with least active connections"""
-        if not self.servers:
+        server = min(self.servers, key=lambda s: (not s.available, s.active_connections),
+                     default=None)
+        if server is None or not server.available:
             raise ValueError("No servers available")
-        
-        return min(self.servers, key=lambda s: s.active_connections)
+        return server
+
+
+class LeastConnectionsHeapBalancer:
+    """
+    Least Connections Load Balancer on an indexed min-heap
+
+    Servers are ordered by active_connections / weight (ties: the server
+    added first). The balancer listens to each server's connection count,
+    so handle_request()/complete_request() move that one server up or down
+    the heap in O(log n) and get_server() is O(1), instead of a min() over
+    every server per request. The heap position of each server is indexed
+    so it can be re-sifted in place. An unavailable server sinks to the
+    bottom the same way.
 
+    acquire() picks a server and counts the connection under the balancer's
+    lock, so concurrent dispatchers never pick on a stale count:
 
-class WeightedRoundRobinBalancer:
-    """Weighted Round Robin Load Balancer"""
+        with balancer.acquire() as server:
+            forward(request, server)
+    """
     
     def __init__(self, servers: List[Server]):
-        self.servers = servers
-        self.current_weight = 0
-        self.current_index = -1
+        self.lock = RLock()  # listeners re-enter it from acquire()
+        # Entries are [load, rank, server]; rank (insertion order) is unique,
+        # so comparisons never reach the server and equal loads go to the
+        # server added first
+        self.heap: List[list] = []
+        self.position: Dict[str, int] = {}  # server id -> index in heap
+        self._next_rank = 0
+        for server in servers:
+            self.add_server(server)
+    
+    @property
+    def servers(self) -> List[Server]:
+        with self.lock:
+            return [entry[2] for entry in sorted(self.heap, key=lambda entry: entry[1])]
+    
+    @staticmethod
+    def _load(server: Server) -> float:
+        if not server.available or server.weight <= 0:
+            return float("inf")
+        return server.active_connections / server.weight
+    
+    def _place(self, i: int, entry: list) -> None:
+        self.heap[i] = entry
+        self.position[entry[2].id] = i
+    
+    def _sift_up(self, i: int) -> int:
+        heap = self.heap
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) // 2
+            if entry >= heap[parent]:
+                break
+            self._place(i, heap[parent])
+            i = parent
+        self._place(i, entry)
+        return i
+    
+    def _sift_down(self, i: int) -> None:
+        heap = self.heap
+        entry = heap[i]
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            self._place(i, heap[child])
+            i = child
+        self._place(i, entry)
+    
+    def update(self, server: Server) -> None:
+        """Restore heap order after server's load changed (increase/decrease key)"""
+        with self.lock:
+            i = self.position.get(server.id)
+            if i is None:
+                return
+            entry = self.heap[i]
+            load = self._load(server)
+            if load < entry[0]:
+                entry[0] = load
+                self._sift_up(i)
+            elif load > entry[0]:
+                entry[0] = load
+                self._sift_down(i)
+    
+    def add_server(self, server: Server) -> None:
+        with self.lock:
+            if server.id in self.position:
+                raise ValueError(f"Server {server.id!r} already added")
+            self.heap.append([self._load(server), self._next_rank, server])
+            self._next_rank += 1
+            self._sift_up(len(self.heap) - 1)
+            server.add_listener(self.update)
+    
+    def remove_server(self, server_id: str) -> Server:
+        """Stop routing to a server (its in-flight connections are unaffected)"""
+        with self.lock:
+            i = self.position.pop(server_id, None)
+            if i is None:
+                raise ValueError(f"Unknown server {server_id!r}")
+            server = self.heap[i][2]
+            last = self.heap.pop()
+            if i < len(self.heap):
+                # Move the last entry into the hole, then re-sift it
+                self._place(i, last)
+                if self._sift_up(i) == i:
+                    self._sift_down(i)
+            server.remove_listener(self.update)
+            return server
+    
+    def get_server(self) -> Server:
+        """Get server with least active connections per unit of weight"""
+        with self.lock:
+            if not self.heap or not self.heap[0][2].available:
+                raise ValueError("No servers available")
+            return self.heap[0][2]
+    
+    @contextmanager
+    def acquire(self) -> Iterator[Server]:
+        """Pick a server and hold a connection to it until the block exits"""
+        with self.lock:
+            server = self.get_server()
+            server.handle_request()
+        try:
+            yield server
+        finally:
+            with self.lock:
+                server.complete_request()
+
+
+class SmoothWeightedRoundRobinBalancer:
+    """
+    Smooth Weighted Round Robin Load Balancer (nginx algorithm)
+
+    Each pick adds every server's weight to its current weight, takes the
+    server with the highest current weight and subtracts the weight total
+    from it. Weights 5/1/1 give a a b a c a a instead of a burst of five
+    a's, and each pick is one O(n) pass with no nested loop.
+
+    precompute=True lays one cycle (sum of weights picks) out in a flat
+    array instead, so a pick is an index increment. A server of weight w
+    holds the slots at times (k + phase) / w, k < w, of a unit cycle, so
+    its picks are evenly spaced; phase steps by the golden ratio from one
+    server to the next so light servers do not all line up at the same
+    point (5/1/1 gives a b a a a c a). Server.set_weight
+    swaps only that server's slots in with a linear merge (no re-sort) and
+    the cycle resumes from the same point in time. Weights are integers;
+    a server with weight 0 gets no traffic.
+    """
+    
+    def __init__(self, servers: List[Server], precompute: bool = False):
+        self.servers = list(servers)
+        self.precompute = precompute
+        self.lock = Lock()
+        self.rank = {server.id: i for i, server in enumerate(self.servers)}
+        if len(self.rank) != len(self.servers):
+            raise ValueError("Server ids must be unique")
+        self.weights = [server.weight for server in self.servers]
+        self.current = [0] * len(self.servers)
+        # Precompute mode: sorted (time in cycle, rank, server) slots
+        self.schedule: List[Tuple[float, int, Server]] = []
+        self.index = 0
+        if precompute:
+            self.schedule = sorted(slot for server in self.servers for slot in self._slots(server))
+        for server in self.servers:
+            server.add_listener(self._on_change)
+    
+    def _slots(self, server: Server) -> List[Tuple[float, int, Server]]:
+        rank, weight = self.rank[server.id], server.weight
+        phase = (0.5 + rank * 0.6180339887498949) % 1
+        return [((k + phase) / weight, rank, server) for k in range(max(weight, 0))]
+    
+    def _on_change(self, server: Server) -> None:
+        with self.lock:
+            rank = self.rank[server.id]
+            if server.weight == self.weights[rank]:
+                return  # connection count change
+            self.weights[rank] = server.weight
+            if self.precompute:
+                self._reschedule(server)
+    
+    def _reschedule(self, server: Server) -> None:
+        """Replace server's slots, keeping the position in the cycle (lock held)"""
+        schedule = self.schedule
+        resume = schedule[self.index - 1][0] if self.index else 0.0
+        kept = [slot for slot in schedule if slot[2] is not server]
+        self.schedule = list(heapq.merge(kept, self._slots(server)))
+        self.index = bisect_right(self.schedule, (resume, float("inf")))
+        if self.index == len(self.schedule):
+            self.index = 0
     
     def get_server(self) -> Server:
         """Get next server based on weights"""
-        if not self.servers:
-            raise ValueError("No servers available")
-        
-        while True:
-            self.current_index = (self.current_index + 1) % len(self.servers)
-            
-            if self.current_index == 0:
-                self.current_weight -= min(s.weight for s in self.servers)
-                if self.current_weight <= 0:
-                    self.current_weight = sum(s.weight for s in self.servers)
+        with self.lock:
+            if self.precompute:
+                schedule = self.schedule
+                for _ in range(len(schedule)):
+                    server = schedule[self.index][2]
+                    self.index += 1
+                    if self.index == len(schedule):
+                        self.index = 0
+                    if server.available:
+                        return server
+                raise ValueError("No servers available")
             
-            if self.servers[self.current_index].weight >= self.current_weight:
-                return self.servers[self.current_index]
+            servers, weights, current = self.servers, self.weights, self.current
+            best = -1
+            total = 0
+            for i, weight in enumerate(weights):
+                if weight > 0 and servers[i].available:
+                    current[i] += weight
+                    total += weight
+                    if best < 0 or current[i] > current[best]:
+                        best = i
+            if best < 0:
+                raise ValueError("No servers available")
+            current[best] -= total
+            return self.servers[best]
+
+
+class WeightedRoundRobinBalancer(SmoothWeightedRoundRobinBalancer):
+    """Weighted Round Robin Load Balancer (smooth interleaving)"""
+
 
+class ConsistentHashBalancer:
+    """
+    Consistent Hashing Load Balancer
 
-class IPHashBalancer:
-    """IP Hash Load Balancer (Sticky Sessions)"""
+    Every server owns vnodes * weight points on a 64-bit ring; a key goes to
+    the first point at or after its hash (bisect over the sorted points).
+    Adding or removing a server only moves the keys on the arcs its points
+    cover, about 1/n of them, instead of nearly all keys as with
+    hash % len(servers). Hashes come from stable_hash, so every process
+    routes a key the same way.
+    """
     
-    def __init__(self, servers: List[Server]):
+    def __init__(self, servers: List[Server], vnodes: int = 100):
+        """
+        vnodes: Ring points per unit of Server.weight (more points, more even load)
+        """
+        if vnodes < 1:
+            raise ValueError("vnodes must be at least 1")
+        
+        self.vnodes = vnodes
+        self.servers: List[Server] = []
+        self.ring: Tuple[List[int], List[Server]] = ([], [])  # (sorted hashes, owners)
+        for server in servers:
+            self._check_new(server)
+            self.servers.append(server)
+        self._rebuild()
+    
+    def _check_new(self, server: Server) -> None:
+        if any(s.id == server.id for s in self.servers):
+            raise ValueError(f"Server {server.id!r} already added")
+    
+    def _points(self, server: Server) -> List[Tuple[int, str, Server]]:
+        return [(stable_hash(f"{server.id}#{i}"), server.id, server)
+                for i in range(self.vnodes * server.weight)]
+    
+    def _rebuild(self) -> None:
+        # Ties (practically impossible with 64 bits) are broken by server id
+        # so every process builds the same ring
+        points = sorted((point for server in self.servers for point in self._points(server)),
+                        key=lambda point: point[:2])
+        # Swap in one assignment: lookups in other threads see the old or
+        # the new ring, never a half-built one
+        self.ring = ([point[0] for point in points], [point[2] for point in points])
+    
+    def add_server(self, server: Server) -> None:
+        """Add a server; only keys landing on its new points move to it"""
+        self._check_new(server)
+        self.servers.append(server)
+        self._rebuild()
+    
+    def remove_server(self, server_id: str) -> None:
+        """Remove a server; its keys spread over the remaining servers"""
+        servers = [s for s in self.servers if s.id != server_id]
+        if len(servers) == len(self.servers):
+            raise ValueError(f"Unknown server {server_id!r}")
         self.servers = servers
+        self._rebuild()
+    
+    def get_server(self, key: Hashable) -> Server:
+        """Get the server owning key"""
+        hashes, owners = self.ring
+        if not hashes:
+            raise ValueError("No servers available")
+        
+        # Walk clockwise past unavailable servers' points: their keys go to
+        # the next server on the ring, everyone else's stay put
+        index = bisect_right(hashes, stable_hash(key))
+        for step in range(len(owners)):
+            server = owners[(index + step) % len(owners)]
+            if server.available:
+                return server
+        raise ValueError("No servers available")
+
+
+class IPHashBalancer(ConsistentHashBalancer):
+    """IP Hash Load Balancer (Sticky Sessions) on a consistent-hash ring"""
     
     def get_server(self, client_ip: str) -> Server:
         """Get server based on client IP hash"""
-        if not self.servers:
+        return super().get_server(client_ip)
+
+
+class PowerOfTwoChoicesBalancer:
+    """
+    Power of Two Choices Load Balancer with peak-EWMA latency
+
+    Samples two distinct servers at random and takes the cheaper one, where
+    cost = latency_estimate * (active_connections + 1): a server that is
+    slow or already busy costs more (the Finagle/Linkerd peak-EWMA rule).
+    A server with requests in flight but no latency sample yet costs
+    PENALTY, so a new server is not flooded before its first response.
+    Comparing two random servers instead of all of them keeps a pick O(1)
+    and keeps stale costs from herding every request onto one server.
+
+    acquire() counts the connection and records its latency on exit:
+
+        with balancer.acquire() as server:
+            forward(request, server)
+    """
+    
+    PENALTY = 1e6  # cost of a busy server that has not answered yet
+    
+    def __init__(self, servers: List[Server], clock: Callable[[], float] = time.monotonic,
+                 rng: Optional[random.Random] = None):
+        """
+        clock: Time source for latency decay and acquire() timing
+        rng: Random source for sampling (seed it for reproducible picks)
+        """
+        self.servers = servers
+        self.clock = clock
+        self.random = rng or random.Random()
+        self.lock = Lock()
+    
+    def cost(self, server: Server, now: Optional[float] = None) -> float:
+        if now is None:
+            now = self.clock()
+        latency = server.latency_estimate(now)
+        if latency == 0.0 and server.active_connections:
+            return self.PENALTY + server.active_connections
+        return latency * (server.active_connections + 1)
+    
+    def get_server(self) -> Server:
+        """Get the cheaper of two randomly sampled servers"""
+        server = self._pick(self.servers)
+        if server is None:
+            # Both samples were out of rotation: sample among the rest
+            server = self._pick([s for s in self.servers if s.available])
+        if server is None:
             raise ValueError("No servers available")
+        return server
+    
+    def _pick(self, servers: List[Server]) -> Optional[Server]:
+        if len(servers) < 2:
+            return servers[0] if servers and servers[0].available else None
         
-        hash_value = hash(client_ip)
-        index = hash_value % len(self.servers)
-        return self.servers[index]
+        i = self.random.randrange(len(servers))
+        j = self.random.randrange(len(servers) - 1)
+        if j >= i:
+            j += 1
+        first, second = servers[i], servers[j]
+        if not (first.available and second.available):
+            return first if first.available else second if second.available else None
+        now = self.clock()
+        return second if self.cost(second, now) < self.cost(first, now) else first
+    
+    @contextmanager
+    def acquire(self) -> Iterator[Server]:
+        """Pick a server, hold a connection to it and time the request"""
+        with self.lock:
+            server = self.get_server()
+            server.handle_request()
+        start = self.clock()
+        try:
+            yield server
+        finally:
+            end = self.clock()
+            with self.lock:
+                server.complete_request()
+                server.record_latency(end - start, end)
 
 
 # Example usage
@@ -127,10 +569,37 @@ if __name__ == "__main__":
         server.handle_request()
         print(f"Request {i+1} -> {server.id} (connections: {server.active_connections})")
     
+    # Least Connections (indexed heap)
+    print("\n=== Least Connections (heap) ===")
+    heap_balancer = LeastConnectionsHeapBalancer([Server("a", weight=2), Server("b"), Server("c")])
+    with heap_balancer.acquire() as first, heap_balancer.acquire() as second:
+        with heap_balancer.acquire() as third:
+            print(f"In flight: {first.id}, {second.id}, {third.id}; "
+                  f"next would be {heap_balancer.get_server().id}")
+    print(f"After completing: next is {heap_balancer.get_server().id}")
+    
     # Weighted Round Robin
     print("\n=== Weighted Round Robin ===")
     wrr_balancer = WeightedRoundRobinBalancer(servers)
     for i in range(12):
         server = wrr_balancer.get_server()
         print(f"Request {i+1} -> {server.id} (weight: {server.weight})")
+    
+    # Power of Two Choices (peak EWMA)
+    print("\n=== Power of Two Choices ===")
+    fast, slow = Server("fast"), Server("slow")
+    p2c_balancer = PowerOfTwoChoicesBalancer([fast, slow], rng=random.Random(1))
+    fast.record_latency(0.010)
+    slow.record_latency(0.200)
+    chosen = [p2c_balancer.get_server().id for _ in range(10)]
+    print(f"fast 10 ms, slow 200 ms: {chosen.count('fast')}/10 requests to fast")
+    
+    # Consistent Hashing
+    print("\n=== Consistent Hashing ===")
+    ch_balancer = ConsistentHashBalancer(servers)
+    clients = [f"10.0.0.{i}" for i in range(1000)]
+    before = {ip: ch_balancer.get_server(ip).id for ip in clients}
+    ch_balancer.add_server(Server("server4", weight=2))
+    moved = sum(before[ip] != ch_balancer.get_server(ip).id for ip in clients)
+    print(f"Adding server4 moved {moved / len(clients):.1%} of clients")
 
@@ -4,14 +4,54 @@ Producer-Consumer pattern implementation
 """
 
 from collections import deque
-from threading import Lock, Condition
-from typing import Optional, Any
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+import heapq
 import time
 
 
+def _wait_for(condition: Condition, predicate: Callable[[], Any],
+              timeout: Optional[float]) -> bool:
+    """
+    Wait on condition until predicate() holds (caller holds its lock)
+    timeout: None waits forever, 0 never waits
+    Returns False if the timeout expired first
+    """
+    if predicate():
+        return True
+    if timeout is None:
+        while not predicate():
+            condition.wait()
+        return True
+    
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        condition.wait(remaining)
+    return True
+
+
 class MessageQueue:
     """
     Thread-safe message queue implementation
+
+    - Waits use Condition.wait with the time left until a monotonic
+      deadline, so a waiter wakes as soon as it is notified or its timeout
+      expires (no polling)
+    - timeout=None waits forever, timeout=0 never waits
+    - task_done()/join() track messages that were taken but not yet processed
+    - put_batch()/get_batch() move many messages per lock acquisition;
+      batch consumers wait on their own Condition so a put that does not
+      complete their batch never steals a wakeup from a plain get()
+    - put(delay=)/put_at() hold messages in a deadline heap; one lazily
+      started timer thread moves them into the queue when due (it exits
+      again once nothing is scheduled). Due messages bypass max_size, since
+      the timer must never block, and count as unfinished tasks from the
+      moment they are scheduled
+    - Storage goes through _qsize/_put/_get (and the _put_batch/_get_batch
+      bulk versions) so subclasses can change it
     """
     
     def __init__(self, max_size: Optional[int] = None):
@@ -23,60 +63,233 @@ class MessageQueue:
         self.lock = Lock()
         self.not_empty = Condition(self.lock)
         self.not_full = Condition(self.lock)
+        self.all_tasks_done = Condition(self.lock)
+        self.batch_ready = Condition(self.lock)
+        self.batch_waiters = 0
+        self.unfinished_tasks = 0
+        self.scheduled: List[Tuple[float, int, Any]] = []  # (monotonic due time, seq, message)
+        self.schedule_changed = Condition(self.lock)
+        self._schedule_seq = 0
+        self._timer: Optional[Thread] = None
+    
+    # Storage hooks (called with the lock held)
+    def _qsize(self) -> int:
+        return len(self.queue)
+    
+    def _put(self, message: Any) -> None:
+        self.queue.append(message)
     
-    def put(self, message: Any, timeout: Optional[float] = None) -> bool:
+    def _get(self) -> Any:
+        return self.queue.popleft()
+    
+    def _put_batch(self, messages: List[Any]) -> None:
+        self.queue.extend(messages)
+    
+    def _get_batch(self, count: int) -> List[Any]:
+        popleft = self.queue.popleft
+        return [popleft() for _ in range(count)]
+    
+    def _full(self) -> bool:
+        return self.max_size is not None and self._qsize() >= self.max_size
+    
+    def put(self, message: Any, timeout: Optional[float] = None,
+            delay: Optional[float] = None) -> bool:
         """
         Add message to queue
+        delay: Seconds until the message becomes visible (never blocks)
         Returns True if successful, False if timeout
         """
+        if delay is not None and delay > 0:
+            return self._schedule(message, time.monotonic() + delay)
+        
         with self.lock:
-            if self.max_size is not None:
-                # Wait until space is available
-                end_time = time.time() + timeout if timeout else None
-                while len(self.queue) >= self.max_size:
-                    if timeout and time.time() >= end_time:
-                        return False
-                    self.not_full.wait(timeout=0.1)
+            if not _wait_for(self.not_full, lambda: not self._full(), timeout):
+                return False
             
-            self.queue.append(message)
-            self.not_empty.notify()
+            self._put(message)
+            self._added(1)
             return True
     
+    def put_at(self, message: Any, when: float, timeout: Optional[float] = None) -> bool:
+        """
+        Add message to become visible at wall-clock time when (time.time())
+        A time in the past behaves like put()
+        """
+        return self.put(message, timeout, delay=when - time.time())
+    
+    def _added(self, count: int) -> None:
+        """Account for count new messages and wake consumers (lock held)"""
+        self.unfinished_tasks += count
+        self._wake_consumers(count)
+    
+    def _wake_consumers(self, count: int) -> None:
+        self.not_empty.notify(count)
+        if self.batch_waiters:
+            self.batch_ready.notify_all()
+    
+    def _schedule(self, message: Any, due: float) -> bool:
+        with self.lock:
+            entry = (due, self._schedule_seq, message)
+            self._schedule_seq += 1
+            heapq.heappush(self.scheduled, entry)
+            self.unfinished_tasks += 1
+            
+            if self._timer is None:
+                self._timer = Thread(target=self._run_timer, daemon=True)
+                self._timer.start()
+            elif self.scheduled[0] is entry:
+                self.schedule_changed.notify()  # new earliest deadline
+            return True
+    
+    def _run_timer(self) -> None:
+        """
+        Move due messages into the queue; exit when nothing is scheduled
+        If storage raises, the due messages go back on the heap and the
+        error propagates to threading.excepthook; the next put(delay=)
+        starts a fresh timer
+        """
+        with self.lock:
+            try:
+                scheduled = self.scheduled
+                while scheduled:
+                    now = time.monotonic()
+                    if scheduled[0][0] > now:
+                        self.schedule_changed.wait(scheduled[0][0] - now)
+                        continue
+                    
+                    due = []
+                    while scheduled and scheduled[0][0] <= now:
+                        due.append(heapq.heappop(scheduled))
+                    try:
+                        self._put_batch([entry[2] for entry in due])
+                    except BaseException:
+                        for entry in due:
+                            heapq.heappush(scheduled, entry)
+                        raise
+                    self._wake_consumers(len(due))
+            finally:
+                self._timer = None
+    
+    def delayed_size(self) -> int:
+        """Number of scheduled messages not yet due"""
+        with self.lock:
+            return len(self.scheduled)
+    
     def get(self, timeout: Optional[float] = None) -> Optional[Any]:
         """
         Get message from queue
         Returns None if timeout
         """
         with self.lock:
-            end_time = time.time() + timeout if timeout else None
-            while not self.queue:
-                if timeout and time.time() >= end_time:
-                    return None
-                self.not_empty.wait(timeout=0.1)
+            if not _wait_for(self.not_empty, self._qsize, timeout):
+                return None
             
-            message = self.queue.popleft()
+            message = self._get()
             self.not_full.notify()
             return message
     
+    def put_batch(self, messages: Iterable[Any], timeout: Optional[float] = None) -> int:
+        """
+        Add messages in order, as many per lock round trip as there is room
+        Returns how many were added (fewer than given only on timeout)
+        """
+        messages = list(messages)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        added = 0
+        
+        with self.lock:
+            while added < len(messages):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not _wait_for(self.not_full, lambda: not self._full(), remaining):
+                    break
+                
+                room = len(messages) - added
+                if self.max_size is not None:
+                    room = min(room, self.max_size - self._qsize())
+                self._put_batch(messages[added:added + room])
+                added += room
+                self._added(room)
+        return added
+    
+    def get_batch(self, max_items: int, max_wait: Optional[float] = None) -> List[Any]:
+        """
+        Get up to max_items messages
+        Returns as soon as max_items are available (capped at max_size, since
+        a full queue cannot grow further) or max_wait expires, with whatever
+        is queued by then. max_wait=None waits for a full batch.
+        """
+        if max_items <= 0:
+            return []
+        target = max_items if self.max_size is None else min(max_items, self.max_size)
+        
+        with self.lock:
+            self.batch_waiters += 1
+            try:
+                _wait_for(self.batch_ready, lambda: self._qsize() >= target, max_wait)
+            finally:
+                self.batch_waiters -= 1
+            
+            count = min(max_items, self._qsize())
+            if not count:
+                return []
+            batch = self._get_batch(count)
+            self.not_full.notify(count)
+            return batch
+    
+    def put_nowait(self, message: Any) -> bool:
+        """Add message only if there is room right now"""
+        return self.put(message, timeout=0)
+    
+    def get_nowait(self) -> Optional[Any]:
+        """Get a message only if one is available right now"""
+        return self.get(timeout=0)
+    
+    def task_done(self) -> None:
+        """
+        Mark one previously taken message as processed
+        Raises ValueError if called more times than messages were put
+        """
+        with self.lock:
+            if self.unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self.unfinished_tasks -= 1
+            if self.unfinished_tasks == 0:
+                self.all_tasks_done.notify_all()
+    
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every message put has been marked done
+        Returns False if timeout
+        """
+        with self.lock:
+            return _wait_for(self.all_tasks_done,
+                             lambda: self.unfinished_tasks == 0, timeout)
+    
     def size(self) -> int:
         """Get current queue size"""
         with self.lock:
-            return len(self.queue)
+            return self._qsize()
     
     def empty(self) -> bool:
         """Check if queue is empty"""
         with self.lock:
-            return len(self.queue) == 0
+            return self._qsize() == 0
 
 
 class PriorityQueue:
     """
     Priority message queue (higher priority first)
+
+    Binary heap of (-priority, seq, message): O(log n) put and get.
+    seq is an insertion counter, so equal priorities come out FIFO and
+    messages themselves are never compared.
     """
     
     def __init__(self):
-        self.queue = []
+        self.queue: List[Tuple[int, int, Any]] = []
+        self.seq = 0
         self.lock = Lock()
+        self.not_empty = Condition(self.lock)
     
     def put(self, message: Any, priority: int = 0):
         """
@@ -84,15 +297,52 @@ class PriorityQueue:
         Higher priority = processed first
         """
         with self.lock:
-            self.queue.append((priority, message))
-            self.queue.sort(reverse=True, key=lambda x: x[0])
+            heapq.heappush(self.queue, (-priority, self.seq, message))
+            self.seq += 1
+            self.not_empty.notify()
     
-    def get(self) -> Optional[Any]:
-        """Get highest priority message"""
+    def put_many(self, items: Iterable[Tuple[Any, int]]):
+        """Add (message, priority) pairs under a single lock acquisition"""
         with self.lock:
-            if not self.queue:
+            seq = self.seq
+            entries = [(-priority, seq + i, message) for i, (message, priority) in enumerate(items)]
+            if not entries:
+                return
+            self.seq = seq + len(entries)
+            
+            if len(entries) > len(self.queue):
+                # Bulk load: O(n) heapify beats n pushes
+                self.queue.extend(entries)
+                heapq.heapify(self.queue)
+            else:
+                for entry in entries:
+                    heapq.heappush(self.queue, entry)
+            self.not_empty.notify(len(entries))
+    
+    def _has_items(self) -> bool:
+        return bool(self.queue)
+    
+    def get(self, timeout: Optional[float] = 0) -> Optional[Any]:
+        """
+        Get highest priority message
+        timeout: 0 returns None at once if empty (default),
+            None waits forever, otherwise seconds to wait
+        """
+        with self.lock:
+            if not _wait_for(self.not_empty, self._has_items, timeout):
                 return None
-            return self.queue.pop(0)[1]
+            return heapq.heappop(self.queue)[2]
+    
+    def get_many(self, max_items: int, timeout: Optional[float] = 0) -> List[Any]:
+        """
+        Get up to max_items messages in priority order
+        Waits (as in get) only for the first one; empty list on timeout
+        """
+        with self.lock:
+            if max_items <= 0 or not _wait_for(self.not_empty, self._has_items, timeout):
+                return []
+            queue, pop = self.queue, heapq.heappop
+            return [pop(queue)[2] for _ in range(min(max_items, len(queue)))]
     
     def size(self) -> int:
         with self.lock:
@@ -105,17 +355,19 @@ if __name__ == "__main__":
     print("=== Basic Message Queue ===")
     mq = MessageQueue(max_size=5)
     
-    # Producer
+    # Producer (queue holds 5, the rest are refused instead of blocking)
     for i in range(10):
-        success = mq.put(f"Message {i}")
+        success = mq.put_nowait(f"Message {i}")
         print(f"Put message {i}: {'Success' if success else 'Failed (queue full)'}")
     
     # Consumer
     print("\nConsuming messages:")
     for _ in range(10):
-        message = mq.get(timeout=1.0)
+        message = mq.get(timeout=0.1)
         if message:
             print(f"  Got: {message}")
+            mq.task_done()
+    print(f"All tasks done: {mq.join(timeout=0)}")
     
     # Priority queue
     print("\n=== Priority Queue ===")
@@ -0,0 +1,480 @@
+"""
+Persistent Cache - System Design Pattern
+Two-tier cache: in-memory policy in front of an on-disk segment store
+
+    TieredCache(front=LRUCache(10_000), store=SegmentStore("/var/cache/app"))
+
+Reads go front -> store; a store hit is promoted into the front cache.
+Writes go through to both tiers, so after a restart the front cache is
+empty but every key is still served from disk without touching the backend.
+
+SegmentStore layout (one directory):
+    data.log   append-only records: crc | key_len | val_len | expires_at | flags | key | value
+    index.map  memory-mapped open-addressing hash table: key hash -> record offset
+
+Crash safety:
+    - every record carries a CRC32; a torn record at the tail is truncated
+    - the index header has a 'clean' flag that is only set by close(); after
+      a crash the index is rebuilt by scanning the log
+    - compaction writes a new log and index under temporary names and swaps
+      them in with os.replace; both files carry a generation number, so a
+      log/index pair from different generations is detected and rebuilt
+"""
+
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Hashable, Optional, Tuple
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import time
+import zlib
+
+
+class BackingStore(ABC):
+    """
+    Storage tier behind an in-memory cache
+    expires_at is a wall-clock (time.time) deadline so it survives restarts
+    """
+
+    @abstractmethod
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        """(value, expires_at) or None if missing or expired"""
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Stored value, or default if missing or expired"""
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    @abstractmethod
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Store value for key"""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        """Remove key, return True if it was present"""
+
+    def close(self) -> None:
+        """Release resources"""
+
+
+class SegmentStore(BackingStore):
+    """
+    Append-only log file with a memory-mapped hash index
+    """
+
+    LOG_HEADER = struct.Struct("<8sQ")  # magic, generation
+    RECORD_HEADER = struct.Struct("<IIIdB")  # crc, key_len, val_len, expires_at, flags
+    INDEX_HEADER = struct.Struct("<8sQQQQQ")  # magic, generation, slots, count, log_size, clean
+    SLOT = struct.Struct("<QQ")  # key hash, record offset + 1 (0 = empty)
+
+    LOG_MAGIC = b"DSALOG01"
+    INDEX_MAGIC = b"DSAIDX01"
+    TOMBSTONE = 1
+    MAX_LOAD = 0.7
+
+    def __init__(self, directory: str, initial_slots: int = 1 << 12, sync: bool = False,
+                 compact_ratio: float = 0.5, min_compact_bytes: int = 1 << 20):
+        """
+        directory: Where data.log and index.map live (created if missing)
+        initial_slots: Starting index size (power of two; doubles as needed)
+        sync: fsync the log after every write (durable against power loss)
+        compact_ratio: Auto-compact once dead bytes exceed this share of the log
+        min_compact_bytes: Never auto-compact logs smaller than this
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.log_path = os.path.join(directory, "data.log")
+        self.index_path = os.path.join(directory, "index.map")
+        self.sync = sync
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self.lock = Lock()
+        self.dead_bytes = 0
+
+        self._open_log()
+        slots = 1 << max(4, (initial_slots - 1).bit_length())
+        self._open_index(slots)
+
+    # ---- files ----
+
+    def _open_log(self) -> None:
+        if not os.path.exists(self.log_path) or os.path.getsize(self.log_path) < self.LOG_HEADER.size:
+            self._write_new_log(self.log_path, generation=1)
+
+        self.log = open(self.log_path, "r+b")
+        magic, self.generation = self.LOG_HEADER.unpack(self.log.read(self.LOG_HEADER.size))
+        if magic != self.LOG_MAGIC:
+            raise ValueError(f"{self.log_path} is not a segment log")
+        self.log.seek(0, os.SEEK_END)
+        self.log_size = self.log.tell()
+
+    def _write_new_log(self, path: str, generation: int) -> None:
+        with open(path, "wb") as f:
+            f.write(self.LOG_HEADER.pack(self.LOG_MAGIC, generation))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _open_index(self, slots: int) -> None:
+        header = None
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) >= self.INDEX_HEADER.size:
+            with open(self.index_path, "rb") as f:
+                header = self.INDEX_HEADER.unpack(f.read(self.INDEX_HEADER.size))
+
+        if header is None:
+            self._create_index(slots)
+            self._replay(self.LOG_HEADER.size)
+        else:
+            magic, generation, slots, _, log_size, clean = header
+            self._map_index(self.index_path)
+            trusted = (magic == self.INDEX_MAGIC and generation == self.generation
+                       and clean and log_size <= self.log_size)
+            if trusted:
+                self._replay(log_size)  # normally nothing: log_size == file size
+            else:
+                self.index.close()
+                self.index_file.close()
+                self._create_index(slots if magic == self.INDEX_MAGIC else 1 << 12)
+                self._replay(self.LOG_HEADER.size)
+
+        # dead_bytes is not persisted: rebuild it so pre-restart garbage still
+        # counts toward auto-compaction
+        self.dead_bytes = self.log_size - self.LOG_HEADER.size - self._live_bytes()
+
+        # Mark dirty until close() so a crash forces a rebuild on next open
+        self._set_header(clean=0)
+        self.index.flush()
+
+    def _create_index(self, slots: int, path: Optional[str] = None) -> None:
+        path = path or self.index_path
+        with open(path, "wb") as f:
+            f.truncate(self.INDEX_HEADER.size + slots * self.SLOT.size)
+            f.write(self.INDEX_HEADER.pack(self.INDEX_MAGIC, self.generation, slots, 0,
+                                           self.LOG_HEADER.size, 0))
+        self._map_index(path)
+
+    def _map_index(self, path: str) -> None:
+        self.index_file = open(path, "r+b")
+        self.index = mmap.mmap(self.index_file.fileno(), 0)
+        _, _, self.slots, self.count, _, _ = self.INDEX_HEADER.unpack_from(self.index, 0)
+        self.mask = self.slots - 1
+
+    def _set_header(self, clean: int) -> None:
+        self.INDEX_HEADER.pack_into(self.index, 0, self.INDEX_MAGIC, self.generation,
+                                    self.slots, self.count, self.log_size, clean)
+
+    # ---- records ----
+
+    @staticmethod
+    def _key_bytes(key: Hashable) -> bytes:
+        # Fixed protocol so the same key hashes identically across Python versions
+        return pickle.dumps(key, protocol=4)
+
+    @staticmethod
+    def _hash(key_bytes: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little")
+
+    def _read_record(self, offset: int):
+        """Return (key_bytes, value_bytes, expires_at, flags, size) or None if invalid"""
+        header = os.pread(self.log.fileno(), self.RECORD_HEADER.size, offset)
+        if len(header) < self.RECORD_HEADER.size:
+            return None
+        crc, key_len, val_len, expires_at, flags = self.RECORD_HEADER.unpack(header)
+        body = os.pread(self.log.fileno(), key_len + val_len, offset + self.RECORD_HEADER.size)
+        if len(body) < key_len + val_len or zlib.crc32(header[4:] + body) != crc:
+            return None
+        size = self.RECORD_HEADER.size + key_len + val_len
+        return body[:key_len], body[key_len:], expires_at, flags, size
+
+    def _read_key(self, offset: int) -> bytes:
+        """Key bytes of the record at offset (no CRC check, used for probing)"""
+        header = os.pread(self.log.fileno(), self.RECORD_HEADER.size, offset)
+        key_len = self.RECORD_HEADER.unpack(header)[1]
+        return os.pread(self.log.fileno(), key_len, offset + self.RECORD_HEADER.size)
+
+    def _append(self, key_bytes: bytes, value_bytes: bytes, expires_at: float, flags: int) -> int:
+        """Append a record, return its offset"""
+        rest = self.RECORD_HEADER.pack(0, len(key_bytes), len(value_bytes), expires_at, flags)[4:]
+        crc = zlib.crc32(rest + key_bytes + value_bytes)
+        offset = self.log_size
+        self.log.seek(offset)
+        self.log.write(struct.pack("<I", crc) + rest + key_bytes + value_bytes)
+        self.log.flush()
+        if self.sync:
+            os.fsync(self.log.fileno())
+        self.log_size = offset + self.RECORD_HEADER.size + len(key_bytes) + len(value_bytes)
+        return offset
+
+    def _replay(self, offset: int) -> None:
+        """Index every valid record from offset on; truncate a torn tail"""
+        while offset < self.log_size:
+            record = self._read_record(offset)
+            if record is None:
+                # Torn or corrupt write: everything after it is unreliable
+                self.log.truncate(offset)
+                self.log_size = offset
+                break
+            key_bytes, _, _, _, size = record
+            self._index_put(key_bytes, offset)
+            offset += size
+        self._set_header(clean=0)
+
+    # ---- index ----
+
+    def _find_slot(self, key_bytes: bytes, key_hash: int):
+        """Return (slot, record offset) for key, or (empty slot, None)"""
+        slot = key_hash & self.mask
+        while True:
+            stored_hash, stored = self.SLOT.unpack_from(self.index, self.INDEX_HEADER.size + slot * self.SLOT.size)
+            if stored == 0:
+                return slot, None
+            if stored_hash == key_hash and self._read_key(stored - 1) == key_bytes:
+                return slot, stored - 1
+            slot = (slot + 1) & self.mask
+
+    def _index_put(self, key_bytes: bytes, offset: int) -> Optional[int]:
+        """Point key at offset, return the offset it replaced (if any)"""
+        key_hash = self._hash(key_bytes)
+        slot, previous = self._find_slot(key_bytes, key_hash)
+        self.SLOT.pack_into(self.index, self.INDEX_HEADER.size + slot * self.SLOT.size,
+                            key_hash, offset + 1)
+        if previous is None:
+            self.count += 1
+            if self.count > self.slots * self.MAX_LOAD:
+                self._grow_index()
+        else:
+            self.dead_bytes += self._read_record(previous)[4]
+        return previous
+
+    def _live_bytes(self) -> int:
+        """Total size of the records the index points at (one per key)"""
+        total = 0
+        for slot in range(self.slots):
+            _, stored = self.SLOT.unpack_from(self.index, self.INDEX_HEADER.size + slot * self.SLOT.size)
+            if stored:
+                header = os.pread(self.log.fileno(), self.RECORD_HEADER.size, stored - 1)
+                _, key_len, val_len, _, _ = self.RECORD_HEADER.unpack(header)
+                total += self.RECORD_HEADER.size + key_len + val_len
+        return total
+
+    def _grow_index(self) -> None:
+        """Double the slot table, rehashing from the stored hashes"""
+        old_index, old_file, old_slots = self.index, self.index_file, self.slots
+        old_count = self.count
+        tmp_path = self.index_path + ".tmp"
+        self._create_index(old_slots * 2, tmp_path)
+        for slot in range(old_slots):
+            key_hash, stored = self.SLOT.unpack_from(old_index, self.INDEX_HEADER.size + slot * self.SLOT.size)
+            if stored:
+                new_slot = key_hash & self.mask
+                while self.SLOT.unpack_from(self.index, self.INDEX_HEADER.size + new_slot * self.SLOT.size)[1]:
+                    new_slot = (new_slot + 1) & self.mask
+                self.SLOT.pack_into(self.index, self.INDEX_HEADER.size + new_slot * self.SLOT.size,
+                                    key_hash, stored)
+        self.count = old_count
+        self._set_header(clean=0)
+        old_index.close()
+        old_file.close()
+        os.replace(tmp_path, self.index_path)
+
+    # ---- public API ----
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        """(value, expires_at) or None if missing, deleted or expired"""
+        key_bytes = self._key_bytes(key)
+        with self.lock:
+            _, offset = self._find_slot(key_bytes, self._hash(key_bytes))
+            record = None if offset is None else self._read_record(offset)
+
+        if record is None:
+            return None
+        _, value_bytes, expires_at, flags, _ = record
+        if flags & self.TOMBSTONE or (expires_at and expires_at <= time.time()):
+            return None
+        return pickle.loads(value_bytes), expires_at or None
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Append value for key and point the index at it"""
+        key_bytes = self._key_bytes(key)
+        value_bytes = pickle.dumps(value)
+        with self.lock:
+            offset = self._append(key_bytes, value_bytes, expires_at or 0.0, 0)
+            self._index_put(key_bytes, offset)
+            self._set_header(clean=0)
+            self._maybe_compact()
+
+    def delete(self, key: Hashable) -> bool:
+        """Append a tombstone for key"""
+        key_bytes = self._key_bytes(key)
+        with self.lock:
+            _, offset = self._find_slot(key_bytes, self._hash(key_bytes))
+            if offset is None or self._read_record(offset)[3] & self.TOMBSTONE:
+                return False
+            tombstone = self._append(key_bytes, b"", 0.0, self.TOMBSTONE)
+            self._index_put(key_bytes, tombstone)
+            self._set_header(clean=0)
+            return True
+
+    def __len__(self) -> int:
+        """Indexed keys, including tombstones and expired records until compaction"""
+        return self.count
+
+    def _maybe_compact(self) -> None:
+        if (self.log_size >= self.min_compact_bytes
+                and self.dead_bytes > self.log_size * self.compact_ratio):
+            self._compact()
+
+    def compact(self) -> None:
+        """Rewrite the log keeping only live, unexpired records"""
+        with self.lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        now = time.time()
+        new_generation = self.generation + 1
+        tmp_log = self.log_path + ".compact"
+        tmp_index = self.index_path + ".compact"
+
+        self._write_new_log(tmp_log, new_generation)
+        live = []
+        for slot in range(self.slots):
+            _, stored = self.SLOT.unpack_from(self.index, self.INDEX_HEADER.size + slot * self.SLOT.size)
+            if stored:
+                record = self._read_record(stored - 1)
+                key_bytes, value_bytes, expires_at, flags, _ = record
+                if not flags & self.TOMBSTONE and not (expires_at and expires_at <= now):
+                    live.append((key_bytes, value_bytes, expires_at))
+
+        # Swap in the new log, then rebuild a right-sized index for it
+        self.index.close()
+        self.index_file.close()
+        self.log.close()
+        with open(tmp_log, "ab") as f:
+            for key_bytes, value_bytes, expires_at in live:
+                rest = self.RECORD_HEADER.pack(0, len(key_bytes), len(value_bytes), expires_at, 0)[4:]
+                f.write(struct.pack("<I", zlib.crc32(rest + key_bytes + value_bytes))
+                        + rest + key_bytes + value_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_log, self.log_path)
+        self._open_log()
+
+        slots = 1 << max(4, (int(len(live) / self.MAX_LOAD) + 1).bit_length())
+        self._create_index(slots, tmp_index)
+        self.index_file.close()
+        self.index.close()
+        os.replace(tmp_index, self.index_path)
+        self._map_index(self.index_path)
+        self.dead_bytes = 0
+        self._replay(self.LOG_HEADER.size)
+        self.index.flush()
+
+    def close(self) -> None:
+        """Flush everything and mark the index clean for a fast reopen"""
+        with self.lock:
+            if self.log.closed:
+                return
+            self.log.flush()
+            os.fsync(self.log.fileno())
+            self._set_header(clean=1)
+            self.index.flush()
+            self.index.close()
+            self.index_file.close()
+            self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+class TieredCache:
+    """
+    In-memory cache (LRUCache, TimeBasedCache, ...) over a BackingStore
+
+    Front values are wrapped in (value, expires_at) tuples, so the fronts'
+    miss markers (-1 for LRUCache, None for TimeBasedCache) never collide
+    with real values, and fronts without TTL support still honour per-entry
+    expiry: an expired front entry is evicted and treated as a miss.
+    """
+
+    def __init__(self, front: Any, store: BackingStore):
+        self.front = front
+        self.store = store
+        # TTL-capable fronts (TimeBasedCache) take a ttl on put
+        self.front_ttl = getattr(front, "default_ttl", None)
+        self.front_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    def _front_put(self, key: Hashable, value: Any, expires_at: Optional[float]) -> None:
+        if self.front_ttl is not None:
+            ttl = expires_at - time.time() if expires_at else self.front_ttl
+            self.front.put(key, (value, expires_at), ttl)
+        else:
+            self.front.put(key, (value, expires_at))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Front first, then the store (promoting hits into the front)"""
+        entry = self.front.get(key)
+        if isinstance(entry, tuple):
+            value, expires_at = entry
+            if not expires_at or expires_at > time.time():
+                self.front_hits += 1
+                return value
+            self.front.delete(key)
+
+        stored = self.store.get_entry(key)
+        if stored is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = stored
+        self.store_hits += 1
+        # Promote with the remaining lifetime, not a fresh default TTL
+        self._front_put(key, value, expires_at)
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Write through to both tiers"""
+        ttl = ttl if ttl is not None else self.front_ttl
+        expires_at = time.time() + ttl if ttl else None
+        self.store.put(key, value, expires_at)
+        self._front_put(key, value, expires_at)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove from both tiers"""
+        self.front.delete(key)
+        return self.store.delete(key)
+
+    def close(self) -> None:
+        self.store.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from dsa.design_patterns.lru_cache import LRUCache
+
+    directory = tempfile.mkdtemp(prefix="segment-store-")
+
+    print("=== First process ===")
+    cache = TieredCache(LRUCache(2), SegmentStore(directory))
+    for i in range(5):
+        cache.put(f"user:{i}", {"id": i})
+    print(f"Get user:0 (evicted from memory, served from disk): {cache.get('user:0')}")
+    cache.close()
+
+    print("\n=== After restart ===")
+    cache = TieredCache(LRUCache(2), SegmentStore(directory))
+    print(f"Get user:3: {cache.get('user:3')}")  # Warm from disk immediately
+    print(f"Front hits: {cache.front_hits}, store hits: {cache.store_hits}")
+    cache.close()
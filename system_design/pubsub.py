@@ -0,0 +1,343 @@
+"""
+Pub/Sub - System Design Pattern
+Topics split into partitions, read by consumer groups (Kafka-style)
+
+    broker = PubSub()
+    broker.create_topic("orders", partitions=8)
+    broker.publish("orders", {"id": 1}, key="customer-42")
+    consumer = broker.subscribe("orders", group_id="billing", consumer_id="worker-1")
+    messages = consumer.poll(max_items=100, timeout=1.0)
+
+- A key always maps to the same partition (CRC32, stable across processes
+  and restarts, unlike hash()), so per-key order is preserved
+- Each partition is an append-only log; a message's offset is its position
+  in the log. Groups do not get copies: every group keeps its own offsets
+  into the same logs, and poll() returns the very Message objects that were
+  published
+- Within a group every partition is owned by exactly one consumer. Joining
+  or leaving bumps the group generation and partitions are reassigned in
+  contiguous ranges; consumers pick up the new assignment on their next poll
+  and resume from the group's committed offsets (at-least-once delivery)
+- poll(timeout) follows MessageQueue.get: None waits forever, 0 never waits
+- retention caps messages kept per partition; consumers that fell behind
+  the trimmed head skip ahead to the oldest message still kept
+"""
+
+from itertools import count
+from threading import Condition, Lock
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+import zlib
+
+from system_design.message_queue import _wait_for
+
+
+class Message(NamedTuple):
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[Hashable]
+    value: Any
+
+
+def partition_for(key: Hashable, partitions: int) -> int:
+    """Stable key -> partition mapping (same in every process)"""
+    data = key if isinstance(key, bytes) else str(key).encode()
+    return zlib.crc32(data) % partitions
+
+
+class Partition:
+    """Append-only message log; base_offset is the offset of log[0]"""
+
+    def __init__(self):
+        self.log: List[Message] = []
+        self.base_offset = 0
+
+    @property
+    def end_offset(self) -> int:
+        """Offset the next message will get"""
+        return self.base_offset + len(self.log)
+
+    def read(self, offset: int, max_items: int) -> List[Message]:
+        start = max(offset, self.base_offset) - self.base_offset
+        return self.log[start:start + max_items]
+
+    def trim(self, keep: int) -> None:
+        """Drop all but the newest keep messages"""
+        drop = len(self.log) - keep
+        if drop > 0:
+            del self.log[:drop]
+            self.base_offset += drop
+
+
+class Topic:
+    """
+    Named set of partitions; one lock/Condition guards the topic and its groups
+    """
+
+    def __init__(self, name: str, partitions: int = 4, retention: Optional[int] = None):
+        """
+        partitions: Number of partitions (fixed for the topic's lifetime)
+        retention: Messages kept per partition (None keeps everything)
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+
+        self.name = name
+        self.partitions = [Partition() for _ in range(partitions)]
+        self.retention = retention
+        # Trim in chunks so each message is moved O(1) times on average
+        self.trim_at = None if retention is None else retention + max(1, retention // 4)
+        self.groups: Dict[str, "ConsumerGroup"] = {}
+        self.lock = Lock()
+        self.not_empty = Condition(self.lock)
+        self._round_robin = count()
+
+    def _append(self, value: Any, key: Optional[Hashable]) -> Message:
+        """Append one message (caller holds the lock)"""
+        if key is None:
+            index = next(self._round_robin) % len(self.partitions)
+        else:
+            index = partition_for(key, len(self.partitions))
+        partition = self.partitions[index]
+
+        message = Message(self.name, index, partition.end_offset, key, value)
+        partition.log.append(message)
+        if self.trim_at is not None and len(partition.log) >= self.trim_at:
+            partition.trim(self.retention)
+        return message
+
+    def publish(self, value: Any, key: Optional[Hashable] = None) -> Tuple[int, int]:
+        """Append a message, return its (partition, offset)"""
+        with self.lock:
+            message = self._append(value, key)
+            self.not_empty.notify_all()
+            return message.partition, message.offset
+
+    def publish_batch(self, items: Iterable[Tuple[Any, Optional[Hashable]]]) -> int:
+        """Append (value, key) pairs under one lock acquisition, return how many"""
+        with self.lock:
+            published = 0
+            for value, key in items:
+                self._append(value, key)
+                published += 1
+            if published:
+                self.not_empty.notify_all()
+            return published
+
+    def group(self, group_id: str) -> "ConsumerGroup":
+        with self.lock:
+            group = self.groups.get(group_id)
+            if group is None:
+                group = self.groups[group_id] = ConsumerGroup(self, group_id)
+            return group
+
+
+class ConsumerGroup:
+    """
+    Consumers sharing a topic's partitions, with committed offsets per partition
+    """
+
+    def __init__(self, topic: Topic, group_id: str):
+        self.topic = topic
+        self.group_id = group_id
+        self.members: List[str] = []
+        self.assignment: Dict[str, List[int]] = {}
+        self.committed: Dict[int, int] = {}  # partition -> next offset to read
+        self.generation = 0
+
+    def _rebalance(self) -> None:
+        """Range assignment: sorted members get contiguous partition ranges"""
+        self.generation += 1
+        members = sorted(self.members)
+        self.assignment = {member: [] for member in members}
+        if not members:
+            return
+        per_member, extra = divmod(len(self.topic.partitions), len(members))
+        start = 0
+        for i, member in enumerate(members):
+            end = start + per_member + (1 if i < extra else 0)
+            self.assignment[member] = list(range(start, end))
+            start = end
+
+    def join(self, consumer_id: str, auto_commit: bool = True) -> "Consumer":
+        """Add a member and rebalance"""
+        with self.topic.lock:
+            if consumer_id in self.members:
+                raise ValueError(f"{consumer_id!r} is already in group {self.group_id!r}")
+            self.members.append(consumer_id)
+            self._rebalance()
+            self.topic.not_empty.notify_all()  # waiting members must pick up changes
+        return Consumer(self, consumer_id, auto_commit)
+
+    def leave(self, consumer_id: str) -> None:
+        """Remove a member and rebalance (its uncommitted messages are redelivered)"""
+        with self.topic.lock:
+            if consumer_id in self.members:
+                self.members.remove(consumer_id)
+                self._rebalance()
+                self.topic.not_empty.notify_all()
+
+    def lag(self) -> int:
+        """Messages published but not yet committed by this group"""
+        with self.topic.lock:
+            return sum(p.end_offset - max(self.committed.get(i, 0), p.base_offset)
+                       for i, p in enumerate(self.topic.partitions))
+
+
+class Consumer:
+    """
+    One member of a consumer group
+    """
+
+    def __init__(self, group: ConsumerGroup, consumer_id: str, auto_commit: bool = True):
+        """
+        auto_commit: Commit the previous poll's messages at the start of each
+            poll (and before giving up partitions in a rebalance)
+        """
+        self.group = group
+        self.topic = group.topic
+        self.consumer_id = consumer_id
+        self.auto_commit = auto_commit
+        self.generation = -1
+        self.positions: Dict[int, int] = {}  # assigned partition -> next offset
+        self.next_partition = 0  # poll() starts here, rotating so no partition starves
+        self.closed = False
+
+    @property
+    def assignment(self) -> List[int]:
+        with self.topic.lock:
+            self._sync()
+            return sorted(self.positions)
+
+    def _sync(self) -> None:
+        """Adopt the group's current assignment (caller holds the lock)"""
+        group = self.group
+        if self.generation == group.generation:
+            return
+        if self.auto_commit:
+            self._commit()
+        self.generation = group.generation
+        self.positions = {p: group.committed.get(p, 0)
+                          for p in group.assignment.get(self.consumer_id, [])}
+
+    def _commit(self, partitions: Optional[Iterable[int]] = None) -> None:
+        # Offsets only move forward: a consumer that has not noticed a
+        # rebalance yet must not rewind a partition its new owner advanced
+        committed = self.group.committed
+        positions = self.positions
+        if partitions is not None:
+            positions = {p: positions[p] for p in partitions if p in positions}
+        for p, offset in positions.items():
+            if offset > committed.get(p, 0):
+                committed[p] = offset
+
+    def _has_data(self) -> bool:
+        if self.generation != self.group.generation:
+            return True
+        partitions = self.topic.partitions
+        return any(partitions[p].end_offset > offset for p, offset in self.positions.items())
+
+    def poll(self, max_items: int = 100, timeout: Optional[float] = None) -> List[Message]:
+        """
+        Get up to max_items messages from the assigned partitions
+        Each poll starts one partition further along, so a deep backlog in
+        one partition cannot fill every batch and starve the others
+        Returns an empty list if timeout expires first
+        """
+        if self.closed:
+            raise ValueError("consumer is closed")
+
+        with self.topic.lock:
+            if self.auto_commit:
+                self._commit()
+            self._sync()
+            if not _wait_for(self.topic.not_empty, self._has_data, timeout):
+                return []
+            self._sync()
+
+            batch: List[Message] = []
+            partitions = self.topic.partitions
+            assigned = list(self.positions)
+            start = self.next_partition % len(assigned) if assigned else 0
+            self.next_partition = start + 1
+            for p in assigned[start:] + assigned[:start]:
+                if len(batch) >= max_items:
+                    break
+                messages = partitions[p].read(self.positions[p], max_items - len(batch))
+                if messages:
+                    batch.extend(messages)
+                    self.positions[p] = messages[-1].offset + 1
+            return batch
+
+    def commit(self) -> None:
+        """
+        Record everything returned by poll() so far as processed
+        After a rebalance only partitions this member still owns are
+        committed; the rest are redelivered by their new owner
+        """
+        with self.topic.lock:
+            self._commit(self.group.assignment.get(self.consumer_id, []))
+
+    def close(self) -> None:
+        """Commit (if auto_commit) and leave the group"""
+        if self.closed:
+            return
+        if self.auto_commit:
+            self.commit()
+        self.group.leave(self.consumer_id)
+        self.closed = True
+
+
+class PubSub:
+    """
+    Broker: registry of topics
+    """
+
+    def __init__(self):
+        self.topics: Dict[str, Topic] = {}
+        self.lock = Lock()
+
+    def create_topic(self, name: str, partitions: int = 4,
+                     retention: Optional[int] = None) -> Topic:
+        with self.lock:
+            if name in self.topics:
+                raise ValueError(f"topic {name!r} already exists")
+            topic = self.topics[name] = Topic(name, partitions, retention)
+            return topic
+
+    def topic(self, name: str) -> Topic:
+        topic = self.topics.get(name)
+        if topic is None:
+            raise ValueError(f"unknown topic {name!r}")
+        return topic
+
+    def publish(self, topic: str, value: Any, key: Optional[Hashable] = None) -> Tuple[int, int]:
+        return self.topic(topic).publish(value, key)
+
+    def subscribe(self, topic: str, group_id: str, consumer_id: str,
+                  auto_commit: bool = True) -> Consumer:
+        return self.topic(topic).group(group_id).join(consumer_id, auto_commit)
+
+
+# Example usage
+if __name__ == "__main__":
+    broker = PubSub()
+    broker.create_topic("orders", partitions=4)
+
+    for i in range(8):
+        partition, offset = broker.publish("orders", {"order": i}, key=f"customer-{i % 3}")
+        print(f"order {i} -> partition {partition}, offset {offset}")
+
+    # Two groups each see every message; within a group partitions are split
+    billing = [broker.subscribe("orders", "billing", f"billing-{i}") for i in range(2)]
+    audit = broker.subscribe("orders", "audit", "audit-0")
+
+    for consumer in billing:
+        received = consumer.poll(timeout=0)
+        print(f"{consumer.consumer_id} owns {consumer.assignment}: "
+              f"{[m.value['order'] for m in received]}")
+    print(f"audit-0 owns {audit.assignment}: {len(audit.poll(timeout=0))} messages")
+
+    # billing-1 leaves: billing-0 takes over all partitions
+    billing[1].close()
+    print(f"billing-0 now owns {billing[0].assignment}")
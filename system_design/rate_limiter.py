@@ -1,10 +1,11 @@
 """
 Rate Limiter - System Design Pattern
-Token Bucket and Sliding Window implementations
+Token Bucket, Sliding Window (log and counter) and GCRA implementations
 """
 
 from collections import deque
-from typing import Dict
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, List, Optional
 import time
 from threading import Lock
 
@@ -44,37 +45,160 @@ class TokenBucket:
         
         self.tokens = min(self.capacity, self.tokens + tokens_to_add)
         self.last_refill = now
+    
+    def is_idle(self, now: float, idle_timeout: float = 0.0) -> bool:
+        """
+        True if the bucket has refilled completely and has not been used
+        for idle_timeout seconds: it is then indistinguishable from a new
+        bucket and can be dropped without changing any decision
+        """
+        elapsed = now - self.last_refill
+        return (elapsed >= idle_timeout
+                and self.tokens + elapsed * self.refill_rate >= self.capacity)
 
 
 class SlidingWindowLog:
     """
     Sliding Window Log Rate Limiter
     Tracks requests in time windows
+    Exact, but stores one timestamp per accepted request: O(max_requests) memory
     """
     
-    def __init__(self, max_requests: int, window_seconds: int):
+    def __init__(self, max_requests: int, window_seconds: int,
+                 clock: Callable[[], float] = time.time):
         """
         max_requests: Maximum requests allowed
         window_seconds: Time window in seconds
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self.clock = clock
         self.requests = deque()
         self.lock = Lock()
     
-    def allow_request(self) -> bool:
+    def allow_request(self, tokens: int = 1) -> bool:
         """Check if request is allowed"""
         with self.lock:
-            now = time.time()
+            now = self.clock()
             
             # Remove requests outside window
             while self.requests and self.requests[0] < now - self.window_seconds:
                 self.requests.popleft()
             
-            if len(self.requests) < self.max_requests:
-                self.requests.append(now)
+            if len(self.requests) + tokens <= self.max_requests:
+                self.requests.extend([now] * tokens)
+                return True
+            return False
+    
+    def is_idle(self, now: float, idle_timeout: float = 0.0) -> bool:
+        """True once every logged request has left the window"""
+        return not self.requests or self.requests[-1] < now - self.window_seconds - idle_timeout
+
+
+class SlidingWindowCounter:
+    """
+    Sliding Window Counter Rate Limiter
+    O(sub_windows) memory per key instead of one timestamp per request
+
+    The window is split into sub_windows fixed slices with one counter each.
+    The count for the sliding window is the sum of the recent slices plus
+    the still-overlapping fraction of the oldest slice, assuming requests
+    were spread evenly inside it. With sub_windows=1 this is the classic
+    "previous window * overlap + current window" estimate.
+    """
+    
+    def __init__(self, max_requests: int, window_seconds: float, sub_windows: int = 1,
+                 clock: Callable[[], float] = time.time):
+        if sub_windows < 1:
+            raise ValueError("sub_windows must be at least 1")
+        
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.sub_windows = sub_windows
+        self.slice_seconds = window_seconds / sub_windows
+        self.clock = clock
+        # Ring of sub_windows + 1 slice counters; head is the current slice
+        self.counts = [0] * (sub_windows + 1)
+        self.head = 0
+        self.total = 0
+        self.slice_start = clock()
+        self.lock = Lock()
+    
+    def _advance(self, now: float) -> None:
+        """Rotate the ring so head is the slice containing now"""
+        passed = int((now - self.slice_start) // self.slice_seconds)
+        if passed <= 0:
+            return
+        
+        slots = len(self.counts)
+        if passed >= slots:
+            self.counts = [0] * slots
+            self.total = 0
+        else:
+            for _ in range(passed):
+                self.head = (self.head + 1) % slots
+                self.total -= self.counts[self.head]
+                self.counts[self.head] = 0
+        self.slice_start += passed * self.slice_seconds
+    
+    def allow_request(self, tokens: int = 1) -> bool:
+        """Check if request is allowed"""
+        with self.lock:
+            now = self.clock()
+            self._advance(now)
+            
+            oldest = self.counts[(self.head + 1) % len(self.counts)]
+            overlap = 1.0 - (now - self.slice_start) / self.slice_seconds
+            estimated = self.total - oldest + oldest * overlap
+            
+            if estimated + tokens <= self.max_requests:
+                self.counts[self.head] += tokens
+                self.total += tokens
+                return True
+            return False
+    
+    def is_idle(self, now: float, idle_timeout: float = 0.0) -> bool:
+        """True once every counted slice has slid out of the window"""
+        return (self.total == 0
+                or now >= self.slice_start + self.slice_seconds + self.window_seconds + idle_timeout)
+
+
+class GCRA:
+    """
+    Generic Cell Rate Algorithm (a.k.a. leaky bucket as a meter)
+    One float of state per key: the theoretical arrival time (TAT)
+
+    Requests are spaced emission_interval = window_seconds / max_requests
+    apart; up to burst requests may arrive back to back. A request is
+    allowed if it would not push TAT more than burst intervals into the
+    future.
+    """
+    
+    def __init__(self, max_requests: int, window_seconds: float, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        max_requests / window_seconds: Sustained rate
+        burst: Requests allowed back to back (default max_requests)
+        """
+        self.emission_interval = window_seconds / max_requests
+        self.tolerance = self.emission_interval * (burst or max_requests)
+        self.clock = clock
+        self.tat = 0.0
+        self.lock = Lock()
+    
+    def allow_request(self, tokens: int = 1) -> bool:
+        """Check if request is allowed"""
+        with self.lock:
+            now = self.clock()
+            new_tat = max(self.tat, now) + self.emission_interval * tokens
+            if new_tat - now <= self.tolerance:
+                self.tat = new_tat
                 return True
             return False
+    
+    def is_idle(self, now: float, idle_timeout: float = 0.0) -> bool:
+        """True once TAT is in the past: the key is back to full burst"""
+        return self.tat + idle_timeout <= now
 
 
 class RateLimiter:
@@ -97,6 +221,127 @@ class RateLimiter:
             return self.buckets[user_id].allow_request(tokens)
 
 
+class MultiTenantLimiter:
+    """
+    Per-key limiter (any class above) without a global lock
+
+    - Buckets are spread over num_shards dicts, each with its own lock
+    - Fast path: an existing bucket is found with a plain dict lookup
+      (atomic under the GIL) and only its own lock is taken
+    - The shard lock is only taken to create a bucket or sweep the shard
+    - Idle limiters (back in their initial state and unused for
+      idle_timeout seconds) are evicted; sweeps run when a shard doubles in
+      size, keeping the cost amortized O(1) per new user. Such a limiter
+      behaves exactly like a fresh one. The sweep checks it under the
+      limiter's own lock and flags it evicted before dropping it, so a
+      request that found it on the fast path but spent from it after the
+      sweep sees the flag and is decided again on the live limiter: eviction
+      never grants an extra burst
+    """
+    
+    def __init__(self, limiter_factory: Callable[[], Any], num_shards: int = 64,
+                 idle_timeout: float = 60.0, min_sweep_size: int = 1024,
+                 clock: Callable[[], float] = time.time):
+        """
+        limiter_factory: Builds the limiter for a new key; it must provide
+            allow_request(tokens) and is_idle(now, idle_timeout), and a lock
+            attribute guarding them if used from several threads
+        idle_timeout: Seconds a full bucket must be unused before eviction
+        min_sweep_size: Shards smaller than this are never swept
+        clock: The limiters' clock, passed to is_idle() when sweeping
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        
+        self.limiter_factory = limiter_factory
+        self.num_shards = num_shards
+        self.idle_timeout = idle_timeout
+        self.min_sweep_size = min_sweep_size
+        self.clock = clock
+        self.shards: List[Dict[str, Any]] = [{} for _ in range(num_shards)]
+        self.locks: List[Lock] = [Lock() for _ in range(num_shards)]
+        self.sweep_at: List[int] = [min_sweep_size] * num_shards
+    
+    def _bucket(self, user_id: str) -> Any:
+        """Find or create the user's bucket"""
+        index = hash(user_id) % self.num_shards
+        shard = self.shards[index]
+        bucket = shard.get(user_id)
+        if bucket is not None:
+            return bucket
+        
+        with self.locks[index]:
+            bucket = shard.get(user_id)
+            if bucket is None:
+                bucket = self.limiter_factory()
+                bucket.evicted = False
+                shard[user_id] = bucket
+                if len(shard) >= self.sweep_at[index]:
+                    self._sweep_shard(index, self.clock())
+            return bucket
+    
+    def _sweep_shard(self, index: int, now: float) -> int:
+        """Evict idle buckets from one shard (caller holds its lock)"""
+        shard = self.shards[index]
+        evicted = 0
+        for user_id, bucket in list(shard.items()):
+            with getattr(bucket, "lock", None) or nullcontext():
+                if bucket.is_idle(now, self.idle_timeout):
+                    bucket.evicted = True
+                    del shard[user_id]
+                    evicted += 1
+        self.sweep_at[index] = max(self.min_sweep_size, 2 * len(shard))
+        return evicted
+    
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """Check if user's request is allowed"""
+        bucket = self._bucket(user_id)
+        allowed = bucket.allow_request(tokens)
+        while bucket.evicted:
+            # Raced with a sweep: the decision came from a dropped limiter
+            bucket = self._bucket(user_id)
+            allowed = bucket.allow_request(tokens)
+        return allowed
+    
+    def allow_many(self, user_ids: Iterable[str], tokens: int = 1) -> List[bool]:
+        """Decide a batch of requests, one result per user_id in order"""
+        shards, num_shards, slow_path = self.shards, self.num_shards, self._bucket
+        results = []
+        for user_id in user_ids:
+            bucket = shards[hash(user_id) % num_shards].get(user_id) or slow_path(user_id)
+            allowed = bucket.allow_request(tokens)
+            while bucket.evicted:
+                bucket = slow_path(user_id)
+                allowed = bucket.allow_request(tokens)
+            results.append(allowed)
+        return results
+    
+    def evict_idle(self) -> int:
+        """Sweep every shard now, return number of buckets evicted"""
+        now = self.clock()
+        evicted = 0
+        for index in range(self.num_shards):
+            with self.locks[index]:
+                evicted += self._sweep_shard(index, now)
+        return evicted
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+
+class ShardedRateLimiter(MultiTenantLimiter):
+    """
+    Multi-user token bucket limiter: MultiTenantLimiter over TokenBucket
+    """
+    
+    def __init__(self, capacity: int, refill_rate: float, num_shards: int = 64,
+                 idle_timeout: float = 60.0, min_sweep_size: int = 1024):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        super().__init__(lambda: TokenBucket(capacity, refill_rate), num_shards,
+                         idle_timeout, min_sweep_size)
+
+
 # Example usage
 if __name__ == "__main__":
     # Token Bucket example
@@ -0,0 +1,20 @@
+"""
+Shared test helpers
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic time-based tests"""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
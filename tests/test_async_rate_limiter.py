@@ -0,0 +1,224 @@
+"""
+Unit tests for asyncio rate limiters
+"""
+
+import asyncio
+import pytest
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.async_rate_limiter import AsyncRateLimiter, AsyncTokenBucket, RateLimitMiddleware
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def call_asgi(app, path="/", client=("10.0.0.1", 1234)):
+    """Send one HTTP request through an ASGI app, return (status, headers)"""
+    scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+             "query_string": b"", "headers": [], "client": client, "server": ("test", 80),
+             "scheme": "http", "http_version": "1.1", "root_path": ""}
+    messages = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        messages.append(message)
+    
+    await app(scope, receive, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+async def hello_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+class TestAsyncTokenBucket:
+    """Test cases for the async token bucket"""
+    
+    def test_try_acquire_burst(self):
+        """Test the bucket allows a burst up to capacity"""
+        bucket = AsyncTokenBucket(capacity=3, refill_rate=0.001)
+        
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    
+    def test_too_many_tokens(self):
+        """Test requesting more than capacity is an error, not a hang"""
+        bucket = AsyncTokenBucket(capacity=3, refill_rate=1.0)
+        
+        with pytest.raises(ValueError):
+            run(bucket.acquire(4))
+        with pytest.raises(ValueError):
+            bucket.try_acquire(4)
+    
+    def test_acquire_sleeps_until_refilled(self):
+        """Test acquire waits for the deficit, not longer"""
+        async def scenario():
+            bucket = AsyncTokenBucket(capacity=1, refill_rate=20.0)
+            await bucket.acquire()
+            start = time.monotonic()
+            await bucket.acquire()
+            return time.monotonic() - start
+        
+        elapsed = run(scenario())
+        
+        assert 0.04 <= elapsed < 0.2
+    
+    def test_waiters_served_fifo(self):
+        """Test queued callers are woken in arrival order"""
+        async def scenario():
+            bucket = AsyncTokenBucket(capacity=3, refill_rate=100.0)
+            bucket.try_acquire(3)
+            order = []
+            
+            async def request(i, tokens):
+                await bucket.acquire(tokens)
+                order.append(i)
+            
+            # A big request queued first must not be overtaken by small ones
+            await asyncio.gather(request(0, 3), request(1, 1), request(2, 1), request(3, 1))
+            return order
+        
+        assert run(scenario()) == [0, 1, 2, 3]
+    
+    def test_try_acquire_does_not_jump_queue(self):
+        """Test try_acquire fails while earlier callers are still waiting"""
+        async def scenario():
+            bucket = AsyncTokenBucket(capacity=1, refill_rate=10.0)
+            bucket.try_acquire()
+            waiter = asyncio.create_task(bucket.acquire())
+            await asyncio.sleep(0)
+            result = bucket.try_acquire()
+            await waiter
+            return result
+        
+        assert run(scenario()) is False
+    
+    def test_max_wait(self):
+        """Test acquire gives up without taking tokens if the wait is too long"""
+        async def scenario():
+            bucket = AsyncTokenBucket(capacity=1, refill_rate=1.0)
+            await bucket.acquire()
+            refused = await bucket.acquire(max_wait=0.1)
+            return refused, bucket.tokens
+        
+        refused, tokens = run(scenario())
+        
+        assert refused is False
+        assert 0 <= tokens < 0.1
+    
+    def test_cancelled_waiter_refunds(self):
+        """Test a cancelled waiter gives its reservation back"""
+        async def scenario():
+            bucket = AsyncTokenBucket(capacity=1, refill_rate=1.0)
+            bucket.try_acquire()
+            waiter = asyncio.create_task(bucket.acquire())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            return bucket.wait_time()
+        
+        assert run(scenario()) < 1.0
+    
+    def test_not_idle_with_waiters(self):
+        """Test a bucket in debt is never considered idle"""
+        bucket = AsyncTokenBucket(capacity=1, refill_rate=1.0)
+        bucket.tokens = -2.0
+        
+        assert not bucket.is_idle(bucket.last_refill + 2.0)
+        assert bucket.is_idle(bucket.last_refill + 3.0)
+    
+    def test_monotonic_clock_by_default(self):
+        """Test wall-clock jumps cannot refill or stall the bucket"""
+        assert AsyncTokenBucket(capacity=1, refill_rate=1.0).clock is time.monotonic
+
+
+class TestAsyncRateLimiter:
+    """Test cases for the async multi-user limiter"""
+    
+    def test_users_independent(self):
+        """Test each user gets their own bucket"""
+        limiter = AsyncRateLimiter(capacity=2, refill_rate=0.001)
+        
+        assert [limiter.try_acquire("a") for _ in range(3)] == [True, True, False]
+        assert limiter.try_acquire("b")
+        assert len(limiter) == 2
+    
+    def test_acquire_and_retry_after(self):
+        """Test acquire with max_wait and the reported retry delay"""
+        async def scenario():
+            limiter = AsyncRateLimiter(capacity=1, refill_rate=2.0)
+            first = await limiter.acquire("a", max_wait=0)
+            second = await limiter.acquire("a", max_wait=0)
+            return first, second, limiter.retry_after("a")
+        
+        first, second, retry_after = run(scenario())
+        
+        assert (first, second) == (True, False)
+        assert 0.4 < retry_after <= 0.5
+    
+    def test_eviction_uses_bucket_clock(self):
+        """Test sweeps compare idleness on the same clock the buckets use"""
+        now = [1000.0]
+        limiter = AsyncRateLimiter(capacity=2, refill_rate=1.0, idle_timeout=10.0,
+                                   clock=lambda: now[0])
+        limiter.try_acquire("idle")
+        limiter.try_acquire("busy")
+        
+        now[0] += 11
+        limiter.try_acquire("busy", 2)
+        assert limiter.evict_idle() == 1
+        assert len(limiter) == 1
+        assert not limiter.try_acquire("busy")
+
+
+class TestRateLimitMiddleware:
+    """Test cases for the ASGI middleware"""
+    
+    def test_429_when_over_limit(self):
+        """Test requests beyond the limit get 429 with Retry-After"""
+        async def scenario():
+            limiter = AsyncRateLimiter(capacity=2, refill_rate=1.0)
+            app = RateLimitMiddleware(hello_app, limiter)
+            statuses = [await call_asgi(app) for _ in range(3)]
+            other = await call_asgi(app, client=("10.0.0.2", 1))
+            return statuses, other
+        
+        statuses, other = run(scenario())
+        
+        assert [status for status, _ in statuses] == [200, 200, 429]
+        assert statuses[2][1][b"retry-after"] == b"1"
+        assert other[0] == 200
+    
+    def test_waits_within_max_wait(self):
+        """Test short waits are absorbed instead of rejected"""
+        async def scenario():
+            limiter = AsyncRateLimiter(capacity=1, refill_rate=50.0)
+            app = RateLimitMiddleware(hello_app, limiter, max_wait=0.5)
+            return [await call_asgi(app) for _ in range(3)]
+        
+        assert [status for status, _ in run(scenario())] == [200, 200, 200]
+    
+    def test_fastapi_integration(self):
+        """Test the middleware plugs into a FastAPI app"""
+        fastapi = pytest.importorskip("fastapi")
+        app = fastapi.FastAPI()
+        
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+        
+        app.add_middleware(RateLimitMiddleware, limiter=AsyncRateLimiter(capacity=1, refill_rate=0.1))
+        
+        async def scenario():
+            return [(await call_asgi(app, "/ping"))[0] for _ in range(2)]
+        
+        assert run(scenario()) == [200, 429]
@@ -0,0 +1,91 @@
+"""
+Unit tests for the cache trace simulator
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.cache_sim import CACHES, GENERATORS, resolve, simulate
+from benchmarks.cache_sim.__main__ import main
+from benchmarks.cache_sim.traces import from_file
+
+
+class TestTraces:
+    """Test cases for trace generators"""
+    
+    @pytest.mark.parametrize("name", sorted(GENERATORS))
+    def test_length_and_determinism(self, name):
+        """Test each generator yields exactly length keys, reproducibly"""
+        first = list(GENERATORS[name](5_000, 100, seed=3))
+        second = list(GENERATORS[name](5_000, 100, seed=3))
+        
+        assert len(first) == 5_000
+        assert first == second
+    
+    def test_loop_cycles(self):
+        """Test loop trace repeats the key range"""
+        assert list(GENERATORS["loop"](7, 3)) == [0, 1, 2, 0, 1, 2, 0]
+    
+    def test_from_file(self, tmp_path):
+        """Test file traces skip blank lines and honour length"""
+        path = tmp_path / "keys.txt"
+        path.write_text("a\n\nb\nc\n")
+        
+        assert list(from_file(str(path))) == ["a", "b", "c"]
+        assert list(from_file(str(path), length=2)) == ["a", "b"]
+
+
+class TestSimulate:
+    """Test cases for the simulation runner"""
+    
+    @pytest.mark.parametrize("name", sorted(CACHES))
+    def test_every_registered_cache_runs(self, name):
+        """Test every registry entry follows the common protocol"""
+        trace = lambda: GENERATORS["zipf"](2_000, 500)
+        result = simulate(CACHES[name], 100, trace, measure_memory=False)
+        
+        assert result["ops"] == 2_000
+        assert 0 < result["hit_ratio"] < 1
+        assert result["p50_ns"] <= result["p99_ns"]
+    
+    def test_loop_larger_than_lru_never_hits(self):
+        """Test LRU gets no hits when the loop exceeds its capacity"""
+        trace = lambda: GENERATORS["loop"](1_000, 20)
+        result = simulate(CACHES["lru"], 10, trace, measure_memory=False)
+        assert result["hits"] == 0
+    
+    def test_peak_memory_reported(self):
+        """Test the tracemalloc pass reports a peak"""
+        trace = lambda: GENERATORS["uniform"](2_000, 1_000)
+        result = simulate(CACHES["fifo"], 500, trace)
+        assert result["peak_memory_bytes"] > 0
+    
+    def test_resolve_import_path(self):
+        """Test caches can be given as module:Class"""
+        factory = resolve("system_design.cache_strategies:FIFOCache")
+        assert factory is CACHES["fifo"]
+        
+        with pytest.raises(ValueError):
+            resolve("no-such-cache")
+
+
+class TestCommandLine:
+    """Test cases for the JSON command line"""
+    
+    def test_writes_json_report(self, tmp_path):
+        """Test main() writes one result per cache/trace/capacity"""
+        output = tmp_path / "report.json"
+        main(["--cache", "lru", "lfu", "--trace", "zipf", "loop", "--capacity", "10", "50",
+              "--length", "500", "--universe", "100", "--no-memory", "-o", str(output)])
+        
+        report = json.loads(output.read_text())
+        assert len(report["results"]) == 8
+        assert {"hit_ratio", "ops_per_sec", "p50_ns", "p99_ns"} <= set(report["results"][0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,231 @@
+"""
+Unit tests for system_design cache strategies
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.cache_strategies import (
+    CountMinSketch, LFUCache, TimeBasedCache, WTinyLFUCache
+)
+from tests.conftest import FakeClock
+
+
+class TestLFUCache:
+    """Test cases for LFU Cache"""
+    
+    def test_evicts_least_frequent(self):
+        """Test that the lowest-frequency key is evicted"""
+        lfu = LFUCache(3)
+        lfu.put("a", 1)
+        lfu.put("b", 2)
+        lfu.put("c", 3)
+        lfu.get("a")
+        lfu.get("a")
+        lfu.get("b")
+        lfu.put("d", 4)  # Should evict 'c'
+        
+        assert lfu.get("c") is None
+        assert lfu.get("a") == 1
+        assert lfu.get("b") == 2
+        assert lfu.get("d") == 4
+    
+    def test_tie_breaks_by_recency(self):
+        """Test that among equal frequencies the oldest key is evicted"""
+        lfu = LFUCache(2)
+        lfu.put("a", 1)
+        lfu.put("b", 2)
+        lfu.put("c", 3)  # 'a' and 'b' both freq 1, 'a' is older
+        
+        assert lfu.get("a") is None
+        assert lfu.get("b") == 2
+    
+    def test_min_freq_resets_on_insert(self):
+        """Test that a new key becomes the next eviction candidate"""
+        lfu = LFUCache(2)
+        lfu.put("a", 1)
+        lfu.get("a")
+        lfu.put("b", 2)
+        lfu.get("b")
+        lfu.put("c", 3)  # Evicts 'a' (freq 2, older than 'b')
+        lfu.put("d", 4)  # Evicts 'c' (freq 1)
+        
+        assert lfu.get("c") is None
+        assert lfu.get("b") == 2
+        assert lfu.get("d") == 4
+    
+    def test_update_counts_as_use(self):
+        """Test that updating a key bumps its frequency"""
+        lfu = LFUCache(2)
+        lfu.put("a", 1)
+        lfu.put("b", 2)
+        lfu.put("a", 10)
+        lfu.put("c", 3)  # Should evict 'b'
+        
+        assert lfu.get("a") == 10
+        assert lfu.get("b") is None
+        assert lfu.freq["a"] == 3
+    
+    def test_capacity_zero(self):
+        """Test zero-capacity cache stores nothing"""
+        lfu = LFUCache(0)
+        lfu.put("a", 1)
+        assert lfu.get("a") is None
+
+
+class TestTimeBasedCache:
+    """Test cases for Time-based Cache"""
+    
+    def test_get_after_expiry(self):
+        """Test that expired entries are not returned"""
+        clock = FakeClock(0.0)
+        cache = TimeBasedCache(default_ttl=10, clock=clock)
+        cache.put("a", 1)
+        
+        clock.now = 9.0
+        assert cache.get("a") == 1
+        clock.now = 10.5
+        assert cache.get("a") is None
+    
+    def test_cleanup_removes_only_expired(self):
+        """Test cleanup pops expired deadlines and keeps live ones"""
+        clock = FakeClock(0.0)
+        cache = TimeBasedCache(default_ttl=10, clock=clock)
+        for i in range(5):
+            cache.put(f"short{i}", i, ttl=1)
+        cache.put("long", "x", ttl=100)
+        
+        clock.now = 2.0
+        assert cache.cleanup() == 5
+        assert len(cache) == 1
+        assert cache.get("long") == "x"
+    
+    def test_overwrite_extends_deadline(self):
+        """Test that re-putting a key leaves a stale heap entry behind"""
+        clock = FakeClock(0.0)
+        cache = TimeBasedCache(default_ttl=10, clock=clock)
+        cache.put("a", 1, ttl=1)
+        cache.put("a", 2, ttl=5)
+        
+        clock.now = 2.0
+        assert cache.cleanup() == 0
+        assert cache.get("a") == 2
+        
+        clock.now = 6.0
+        assert cache.cleanup() == 1
+    
+    def test_cleanup_max_items(self):
+        """Test that a sweep can be bounded"""
+        clock = FakeClock(0.0)
+        cache = TimeBasedCache(default_ttl=1, clock=clock)
+        for i in range(10):
+            cache.put(i, i)
+        
+        clock.now = 5.0
+        assert cache.cleanup(max_items=4) == 4
+        assert cache.cleanup() == 6
+    
+    def test_heap_is_compacted(self):
+        """Test that repeated overwrites do not grow the heap forever"""
+        cache = TimeBasedCache(default_ttl=10, clock=FakeClock(0.0))
+        for _ in range(1000):
+            cache.put("a", 1)
+        
+        assert len(cache.expiry_heap) <= 2 * len(cache) + 64
+    
+    def test_background_reaper(self):
+        """Test that the reaper thread sweeps expired entries"""
+        clock = FakeClock(0.0)
+        cache = TimeBasedCache(default_ttl=1, reaper_interval=0.01, clock=clock)
+        try:
+            cache.put("a", 1)
+            clock.now = 5.0
+            deadline = time.monotonic() + 2.0
+            while len(cache) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(cache) == 0
+        finally:
+            cache.stop_reaper()
+
+
+class TestCountMinSketch:
+    """Test cases for Count-Min Sketch"""
+    
+    def test_never_underestimates(self):
+        """Test estimates are at least the true count (below saturation)"""
+        sketch = CountMinSketch(width=64, sample_size=10_000)
+        for key in range(100):
+            for _ in range(key % 10):
+                sketch.increment(key)
+        
+        for key in range(100):
+            assert sketch.estimate(key) >= key % 10
+    
+    def test_counters_saturate(self):
+        """Test counters stop at 15"""
+        sketch = CountMinSketch(width=64, sample_size=10_000)
+        for _ in range(100):
+            sketch.increment("hot")
+        assert sketch.estimate("hot") == 15
+    
+    def test_aging_halves_counts(self):
+        """Test that reaching sample_size halves every counter"""
+        sketch = CountMinSketch(width=64, sample_size=20)
+        for _ in range(8):
+            sketch.increment("a")
+        assert sketch.estimate("a") == 8
+        
+        for i in range(12):
+            sketch.increment(("filler", i))
+        assert sketch.estimate("a") <= 5
+
+
+class TestWTinyLFUCache:
+    """Test cases for W-TinyLFU Cache"""
+    
+    def test_basic_get_put(self):
+        """Test values are stored and updated"""
+        cache = WTinyLFUCache(10)
+        cache.put("a", 1)
+        cache.put("a", 2)
+        
+        assert cache.get("a") == 2
+        assert cache.get("missing") is None
+        assert len(cache) == 1
+    
+    def test_never_exceeds_capacity(self):
+        """Test size stays within capacity"""
+        cache = WTinyLFUCache(50)
+        for i in range(1000):
+            cache.put(i, i)
+            cache.get(i % 7)
+        
+        assert len(cache) <= 50
+    
+    def test_scan_does_not_flush_hot_set(self):
+        """Test one-off scan keys are refused admission"""
+        cache = WTinyLFUCache(100)
+        for _ in range(5):
+            for i in range(50):
+                if cache.get(f"hot{i}") is None:
+                    cache.put(f"hot{i}", i)
+        for i in range(5000):
+            cache.put(f"scan{i}", i)
+        
+        hot_hits = sum(cache.get(f"hot{i}") is not None for i in range(50))
+        assert hot_hits >= 45
+    
+    def test_capacity_one(self):
+        """Test that a single-entry cache still works"""
+        cache = WTinyLFUCache(1)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert len(cache) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
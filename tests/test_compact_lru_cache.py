@@ -0,0 +1,74 @@
+"""
+Unit tests for Compact (array-backed) LRU Cache
+"""
+
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dsa.design_patterns.compact_lru_cache import CompactLRUCache
+from dsa.design_patterns.lru_cache import LRUCache
+
+
+class TestCompactLRUCache:
+    """Test cases for Compact LRU Cache"""
+    
+    def test_eviction(self):
+        """Test that least recently used item is evicted"""
+        lru = CompactLRUCache(2)
+        
+        lru.put(1, 1)
+        lru.put(2, 2)
+        lru.get(1)
+        lru.put(3, 3)  # Should evict key 2
+        
+        assert lru.get(1) == 1
+        assert lru.get(2) == -1
+        assert lru.get(3) == 3
+    
+    def test_delete_reuses_slot(self):
+        """Test deleted slots go back on the free list"""
+        lru = CompactLRUCache(2)
+        
+        lru.put(1, 1)
+        lru.put(2, 2)
+        assert lru.delete(1) is True
+        assert lru.delete(1) is False
+        
+        lru.put(3, 3)  # Takes the freed slot, nothing evicted
+        assert lru.get(2) == 2
+        assert lru.get(3) == 3
+        assert lru.stats()["evictions"] == 0
+        assert len(lru) == 2
+    
+    def test_capacity_zero(self):
+        """Test zero-capacity cache stores nothing"""
+        lru = CompactLRUCache(0)
+        lru.put(1, 1)
+        assert lru.get(1) == -1
+    
+    def test_matches_lru_cache(self):
+        """Random operations give the same results as LRUCache"""
+        rng = random.Random(42)
+        compact, reference = CompactLRUCache(50), LRUCache(50)
+        
+        for _ in range(20_000):
+            key = rng.randrange(120)
+            op = rng.random()
+            if op < 0.5:
+                assert compact.get(key) == reference.get(key)
+            elif op < 0.9:
+                compact.put(key, key * 2)
+                reference.put(key, key * 2)
+            else:
+                assert compact.delete(key) == reference.delete(key)
+        
+        assert len(compact) == len(reference)
+        assert compact.stats() == reference.stats()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
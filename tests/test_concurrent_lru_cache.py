@@ -0,0 +1,96 @@
+"""
+Unit tests for Concurrent (sharded) LRU Cache
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dsa.design_patterns.concurrent_lru_cache import ConcurrentLRUCache
+
+
+class TestConcurrentLRUCache:
+    """Test cases for Concurrent LRU Cache"""
+    
+    def test_single_shard_matches_lru(self):
+        """With one shard eviction order is plain LRU"""
+        cache = ConcurrentLRUCache(2, num_shards=1)
+        
+        cache.put(1, 1)
+        cache.put(2, 2)
+        cache.get(1)
+        cache.put(3, 3)  # Should evict key 2
+        
+        assert cache.get(1) == 1
+        assert cache.get(2) == -1
+        assert cache.get(3) == 3
+    
+    def test_delete_and_len(self):
+        """Test delete and len across shards"""
+        cache = ConcurrentLRUCache(100, num_shards=4)
+        
+        for i in range(10):
+            cache.put(i, i * 10)
+        assert len(cache) == 10
+        
+        assert cache.delete(5) is True
+        assert cache.delete(5) is False
+        assert cache.get(5) == -1
+        assert len(cache) == 9
+    
+    def test_stats_are_summed(self):
+        """Test stats aggregate every shard"""
+        cache = ConcurrentLRUCache(100, num_shards=4)
+        
+        for i in range(10):
+            cache.put(i, i)
+        for i in range(15):
+            cache.get(i)
+        
+        stats = cache.stats()
+        assert stats["hits"] == 10
+        assert stats["misses"] == 5
+        assert stats["size"] == 10
+        assert stats["shards"] == 4
+    
+    @pytest.mark.parametrize("capacity, num_shards", [(10, 16), (100, 16), (17, 4), (1, 8), (64, 8)])
+    def test_never_exceeds_capacity(self, capacity, num_shards):
+        """Test shard capacities add up to exactly the requested capacity"""
+        cache = ConcurrentLRUCache(capacity, num_shards=num_shards)
+        for i in range(capacity * 20):
+            cache.put(i, i)
+            assert len(cache) <= capacity
+        
+        assert len(cache) == cache.stats()["capacity"] == capacity
+        assert cache.num_shards == min(num_shards, capacity)
+    
+    def test_invalid_shard_count(self):
+        """Test that zero shards or zero capacity is rejected"""
+        with pytest.raises(ValueError):
+            ConcurrentLRUCache(10, num_shards=0)
+        with pytest.raises(ValueError):
+            ConcurrentLRUCache(0)
+    
+    def test_concurrent_writers(self):
+        """Test many threads writing disjoint keys"""
+        cache = ConcurrentLRUCache(10_000, num_shards=8)
+        
+        def worker(worker_id):
+            for i in range(1000):
+                cache.put((worker_id, i), i)
+        
+        threads = [threading.Thread(target=worker, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(cache) == 8000
+        assert cache.get((7, 999)) == 999
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,378 @@
+"""
+Unit tests for distributed rate limiter backends and token leasing
+"""
+
+import hashlib
+import pytest
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.distributed_rate_limiter import InMemoryBackend, LeasedRateLimiter, RedisBackend
+from tests.conftest import FakeClock
+
+
+class CountingBackend(InMemoryBackend):
+    """InMemoryBackend that records every acquire call"""
+    
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.calls = []
+    
+    def acquire(self, key, tokens, capacity, refill_rate, partial=False):
+        self.calls.append((key, tokens, partial))
+        return super().acquire(key, tokens, capacity, refill_rate, partial)
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """
+    Minimal RESP2 server: PING, SCRIPT LOAD, EVALSHA and EVAL.
+    Scripts cannot actually run Lua here, so each known script source is
+    mapped to a Python function implementing the same contract.
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, handlers):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.handlers = {hashlib.sha1(src.encode()).hexdigest(): fn for src, fn in handlers.items()}
+        self.loaded = set()
+        self.commands = []
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        assert header.startswith(b"*")
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+    
+    def run_script(self, sha, args):
+        numkeys = int(args[0])
+        keys, argv = args[1:1 + numkeys], args[1 + numkeys:]
+        return b":%d\r\n" % self.server.handlers[sha](keys, argv)
+    
+    def handle(self):
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            self.server.commands.append(name)
+            
+            if name == "PING":
+                reply = b"+PONG\r\n"
+            elif name == "SCRIPT" and args[1].upper() == "LOAD":
+                sha = hashlib.sha1(args[2].encode()).hexdigest()
+                self.server.loaded.add(sha)
+                reply = b"$40\r\n" + sha.encode() + b"\r\n"
+            elif name == "EVALSHA":
+                if args[1] not in self.server.loaded:
+                    reply = b"-NOSCRIPT No matching script. Please use EVAL.\r\n"
+                else:
+                    reply = self.run_script(args[1], args[2:])
+            elif name == "EVAL":
+                reply = self.run_script(hashlib.sha1(args[1].encode()).hexdigest(), args[2:])
+            else:
+                reply = b"+OK\r\n"
+            self.wfile.write(reply)
+
+
+class LuaKeyspace:
+    """
+    Runs a script's real Lua source (Lua 5.1, as embedded in Redis) against
+    an in-memory keyspace emulating TIME, HMGET, HSET and PEXPIRE
+    """
+    
+    def __init__(self, clock):
+        lua51 = pytest.importorskip("lupa.lua51")
+        self.clock = clock
+        self.hashes = {}
+        self.ttls = {}  # key -> milliseconds, as last set by PEXPIRE
+        self.lua = lua51.LuaRuntime()
+        self.lua.globals().redis = self.lua.table(call=self.call)
+    
+    def call(self, command, *args):
+        command = command.upper()
+        if command == "TIME":
+            now = self.clock()
+            return self.lua.table(str(int(now)), str(int(now % 1 * 1_000_000)))
+        if command == "HMGET":
+            fields = self.hashes.get(args[0], {})
+            return self.lua.table(*(fields.get(name, False) for name in args[1:]))
+        if command == "HSET":
+            fields = self.hashes.setdefault(args[0], {})
+            for name, value in zip(args[1::2], args[2::2]):
+                fields[name] = value
+            return len(args) // 2
+        if command == "PEXPIRE":
+            if args[1] != int(args[1]):
+                raise ValueError("ERR value is not an integer or out of range")
+            self.ttls[args[0]] = int(args[1])
+            return 1
+        raise ValueError(f"unexpected command {command}")
+    
+    def runner(self, source):
+        function = self.lua.eval(f"function(KEYS, ARGV) {source} end")
+        return lambda keys, argv: int(function(self.lua.table(*keys), self.lua.table(*argv)))
+
+
+def serve_redis(handlers):
+    """Yield (client, server) for a FakeRedisServer running handlers"""
+    redis = pytest.importorskip("redis")
+    server = FakeRedisServer(handlers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    
+    host, port = server.server_address
+    client = redis.Redis(host=host, port=port, protocol=2)
+    yield client, server
+    
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis_backend():
+    clock = FakeClock()
+    state = InMemoryBackend(clock)
+    
+    def token_bucket(keys, argv):
+        capacity, refill_rate, tokens, partial = argv
+        return state.acquire(keys[0], int(tokens), float(capacity), float(refill_rate), partial == "1")
+    
+    for client, server in serve_redis({RedisBackend.LUA_SCRIPT: token_bucket}):
+        yield RedisBackend(client=client, prefix="rl:"), server, state, clock
+
+
+@pytest.fixture
+def lua_backend():
+    clock = FakeClock()
+    keyspace = LuaKeyspace(clock)
+    script = keyspace.runner(RedisBackend.LUA_SCRIPT)
+    
+    for client, server in serve_redis({RedisBackend.LUA_SCRIPT: script}):
+        yield RedisBackend(client=client, prefix="rl:"), keyspace, clock
+
+
+class TestInMemoryBackend:
+    """Test cases for the in-process backend"""
+    
+    def test_all_or_nothing(self):
+        """Test a request larger than the balance takes nothing"""
+        backend = InMemoryBackend(FakeClock())
+        
+        assert backend.acquire("u", 3, capacity=5, refill_rate=1.0) == 3
+        assert backend.acquire("u", 3, capacity=5, refill_rate=1.0) == 0
+        assert backend.acquire("u", 2, capacity=5, refill_rate=1.0) == 2
+    
+    def test_partial(self):
+        """Test partial grants take whole tokens only"""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock)
+        backend.acquire("u", 5, capacity=5, refill_rate=1.0)
+        
+        clock.now += 2.5
+        assert backend.acquire("u", 4, capacity=5, refill_rate=1.0, partial=True) == 2
+        clock.now += 0.5
+        assert backend.acquire("u", 1, capacity=5, refill_rate=1.0) == 1
+    
+    def test_refill_capped_at_capacity(self):
+        """Test idle time never grants more than capacity"""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock)
+        backend.acquire("u", 1, capacity=5, refill_rate=1.0)
+        
+        clock.now += 1000
+        assert backend.acquire("u", 10, capacity=5, refill_rate=1.0, partial=True) == 5
+    
+    def test_concurrent_never_overspends(self):
+        """Test threads racing on one key cannot spend a token twice"""
+        backend = InMemoryBackend(FakeClock())
+        granted = []
+        
+        def worker():
+            granted.append(sum(backend.acquire("u", 1, capacity=100, refill_rate=0.0)
+                               for _ in range(100)))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert sum(granted) == 100
+    
+    def test_full_buckets_swept_as_table_grows(self):
+        """Test one-off keys do not grow the bucket table without bound"""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock, min_sweep_size=16)
+        for i in range(1000):
+            backend.acquire(f"user{i}", 1, capacity=5, refill_rate=1.0)
+            clock.now += 0.5
+        
+        assert len(backend.buckets) <= 32
+        assert backend.buckets["user999"][0] == 4  # still refilling, kept
+    
+    def test_zero_rate_buckets_kept(self):
+        """Test buckets that never refill are not reset by the sweep"""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock, min_sweep_size=4)
+        backend.acquire("u", 5, capacity=5, refill_rate=0.0)
+        for i in range(10):
+            backend.acquire(f"other{i}", 1, capacity=5, refill_rate=1.0)
+        clock.now += 1000
+        
+        assert backend.release_full() == 10
+        assert backend.acquire("u", 1, capacity=5, refill_rate=0.0) == 0
+
+
+class TestLeasedRateLimiter:
+    """Test cases for token leasing"""
+    
+    def test_lease_saves_round_trips(self):
+        """Test one backend call serves a whole lease"""
+        clock = FakeClock()
+        backend = CountingBackend(clock)
+        limiter = LeasedRateLimiter(backend, capacity=100, refill_rate=1.0, lease_size=10, clock=clock)
+        
+        assert all(limiter.allow_request("u") for _ in range(30))
+        assert len(backend.calls) == 3
+        assert limiter.backend_calls == 3
+    
+    def test_expired_leases_swept_as_table_grows(self):
+        """Test one-off users do not grow the lease table without bound"""
+        clock = FakeClock()
+        limiter = LeasedRateLimiter(InMemoryBackend(clock), capacity=10, refill_rate=1.0,
+                                    lease_ttl=1.0, clock=clock, min_sweep_size=16)
+        for i in range(1000):
+            limiter.allow_request(f"user{i}")
+            clock.now += 0.1
+        
+        assert len(limiter.leases) <= 32
+        assert limiter.allow_request("user999")  # live lease kept
+    
+    def test_workers_share_global_limit(self):
+        """Test several workers together never exceed the shared capacity"""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock)
+        workers = [LeasedRateLimiter(backend, capacity=20, refill_rate=0.0, lease_size=3, clock=clock)
+                   for _ in range(4)]
+        
+        allowed = sum(workers[i % 4].allow_request("u") for i in range(100))
+        
+        assert allowed == 20
+    
+    def test_partial_lease_when_bucket_low(self):
+        """Test the last tokens are still handed out as a smaller lease"""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock)
+        limiter = LeasedRateLimiter(backend, capacity=5, refill_rate=0.0, lease_size=4, clock=clock)
+        
+        assert [limiter.allow_request("u") for _ in range(6)] == [True] * 5 + [False]
+    
+    def test_lease_expires(self):
+        """Test unused leased tokens are dropped after lease_ttl"""
+        clock = FakeClock()
+        backend = CountingBackend(clock)
+        limiter = LeasedRateLimiter(backend, capacity=100, refill_rate=0.0, lease_size=10,
+                                    lease_ttl=1.0, clock=clock)
+        limiter.allow_request("u")
+        
+        clock.now += 1.0
+        assert limiter.allow_request("u")
+        assert len(backend.calls) == 2
+        assert backend.buckets["u"][0] == 80
+        assert limiter.release_expired() == 0
+        
+        clock.now += 1.0
+        assert limiter.release_expired() == 1
+    
+    def test_denial_skips_backend_until_refill(self):
+        """Test rejected requests do not round trip until a token could exist"""
+        clock = FakeClock()
+        backend = CountingBackend(clock)
+        limiter = LeasedRateLimiter(backend, capacity=2, refill_rate=2.0, lease_size=2,
+                                    lease_ttl=5.0, clock=clock)
+        limiter.allow_request("u")
+        limiter.allow_request("u")
+        
+        assert not limiter.allow_request("u")
+        assert not limiter.allow_request("u")
+        assert len(backend.calls) == 2
+        
+        clock.now += 0.5
+        assert limiter.allow_request("u")
+        assert len(backend.calls) == 3
+    
+    def test_request_larger_than_lease(self):
+        """Test a multi-token request fetches at least what it needs"""
+        clock = FakeClock()
+        backend = CountingBackend(clock)
+        limiter = LeasedRateLimiter(backend, capacity=100, refill_rate=0.0, lease_size=5, clock=clock)
+        
+        assert limiter.allow_request("u", tokens=8)
+        assert backend.calls == [("u", 8, True)]
+
+
+class TestRedisBackend:
+    """Test cases for the Redis backend against a fake RESP server"""
+    
+    def test_script_loaded_and_run(self, redis_backend):
+        """Test EVALSHA falls back to SCRIPT LOAD once, then runs the script"""
+        backend, server, state, clock = redis_backend
+        
+        assert backend.acquire("u", 3, capacity=5, refill_rate=1.0) == 3
+        assert backend.acquire("u", 3, capacity=5, refill_rate=1.0) == 0
+        assert backend.acquire("u", 3, capacity=5, refill_rate=1.0, partial=True) == 2
+        
+        assert server.commands.count("SCRIPT") == 1
+        assert server.commands.count("EVALSHA") == 4
+        assert "rl:u" in state.buckets
+    
+    def test_leased_limiter_over_redis(self, redis_backend):
+        """Test leasing works end to end over the wire"""
+        backend, server, state, clock = redis_backend
+        limiter = LeasedRateLimiter(backend, capacity=10, refill_rate=1.0, lease_size=5, clock=clock)
+        
+        assert sum(limiter.allow_request("u") for _ in range(15)) == 10
+        
+        clock.now += 5
+        assert limiter.allow_request("u")
+
+
+class TestRedisLuaScript:
+    """Test cases running RedisBackend.LUA_SCRIPT itself under Lua 5.1"""
+    
+    def test_matches_in_memory_backend(self, lua_backend):
+        """Test the script grants exactly what InMemoryBackend would"""
+        backend, keyspace, clock = lua_backend
+        reference = InMemoryBackend(clock)
+        steps = [(0.0, 3, False), (0.0, 3, False), (0.0, 3, True), (2.5, 4, True),
+                 (0.5, 1, False), (1000.0, 10, True), (0.0, 1, False)]
+        
+        for advance, tokens, partial in steps:
+            clock.now += advance
+            expected = reference.acquire("u", tokens, 5, 1.0, partial)
+            assert backend.acquire("u", tokens, capacity=5, refill_rate=1.0, partial=partial) == expected
+        assert keyspace.ttls["rl:u"] == 6000  # refill time plus a second
+    
+    def test_zero_refill_rate(self, lua_backend):
+        """Test refill_rate=0 neither fails nor lets the key expire into a fresh bucket"""
+        backend, keyspace, clock = lua_backend
+        
+        assert backend.acquire("u", 2, capacity=3, refill_rate=0.0) == 2
+        clock.now += 3600
+        assert backend.acquire("u", 2, capacity=3, refill_rate=0.0, partial=True) == 1
+        assert "rl:u" not in keyspace.ttls
+
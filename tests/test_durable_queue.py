@@ -0,0 +1,197 @@
+"""
+Unit tests for the durable message queue
+"""
+
+import os
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.durable_queue import DurableMessageQueue
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+class TestDurableMessageQueue:
+    """Test cases for DurableMessageQueue"""
+    
+    def test_put_get(self, tmp_path):
+        """Test it behaves like MessageQueue"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            mq.put({"id": 1})
+            mq.put_batch(["a", "b"])
+            
+            assert mq.size() == 3
+            assert mq.get() == {"id": 1}
+            assert mq.get_batch(10, max_wait=0) == ["a", "b"]
+            assert mq.get_nowait() is None
+    
+    def test_replay_uncommitted(self, tmp_path):
+        """Test messages after the committed offset are replayed on restart"""
+        with DurableMessageQueue(str(tmp_path), fsync="always") as mq:
+            mq.put_batch(range(5))
+            mq.get()
+            mq.get()
+            assert mq.commit() == 2
+            mq.get()  # delivered but not committed
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert mq.read_offset == 2
+            assert mq.get_batch(10, max_wait=0) == [2, 3, 4]
+            mq.put(5)
+            assert mq.write_offset == 6
+    
+    def test_auto_commit(self, tmp_path):
+        """Test auto_commit checkpoints every get"""
+        with DurableMessageQueue(str(tmp_path), auto_commit=True) as mq:
+            mq.put_batch(range(3))
+            mq.get()
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert mq.get_batch(10, max_wait=0) == [1, 2]
+    
+    def test_commit_beyond_delivered(self, tmp_path):
+        """Test committing messages not yet handed out is an error"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            mq.put_batch(range(3))
+            mq.get()
+            
+            with pytest.raises(ValueError):
+                mq.commit(2)
+            assert mq.commit(1) == 1
+    
+    def test_join_counts_replayed(self, tmp_path):
+        """Test replayed messages count as unfinished tasks"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            mq.put_batch(range(2))
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert mq.join(timeout=0) is False
+            mq.get_batch(2)
+            mq.task_done()
+            mq.task_done()
+            assert mq.join(timeout=0) is True
+    
+    def test_torn_tail_truncated(self, tmp_path):
+        """Test a partially written last record is dropped, not fatal"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            mq.put_batch(["a", "b", "c"])
+        
+        path = tmp_path / segment_files(tmp_path)[-1]
+        path.write_bytes(path.read_bytes()[:-3])
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert mq.get_batch(10, max_wait=0) == ["a", "b"]
+            mq.put("d")
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert mq.get_batch(10, max_wait=0) == ["a", "b", "d"]
+    
+    def test_corrupt_record_stops_replay(self, tmp_path):
+        """Test a CRC mismatch ends the valid log at that record"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            mq.put_batch([b"first", b"second"])
+        
+        path = tmp_path / segment_files(tmp_path)[-1]
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert mq.get_batch(10, max_wait=0) == [b"first"]
+    
+    def test_segments_roll_and_are_deleted(self, tmp_path):
+        """Test segments roll by size and fully committed ones are removed"""
+        with DurableMessageQueue(str(tmp_path), segment_bytes=200) as mq:
+            for i in range(20):
+                mq.put("x" * 50)
+            assert len(segment_files(tmp_path)) > 3
+            
+            mq.get_batch(20)
+            mq.commit()
+            assert len(segment_files(tmp_path)) == 1
+        
+        with DurableMessageQueue(str(tmp_path), segment_bytes=200) as mq:
+            assert mq.size() == 0
+            assert mq.write_offset == 20
+    
+    def test_fsync_policies(self, tmp_path):
+        """Test every policy persists messages, and unknown ones are rejected"""
+        for policy in ("always", "interval", "never"):
+            directory = str(tmp_path / policy)
+            with DurableMessageQueue(directory, fsync=policy, fsync_interval_ms=1) as mq:
+                mq.put(policy)
+            with DurableMessageQueue(directory, fsync=policy) as mq:
+                assert mq.get() == policy
+        
+        with pytest.raises(ValueError):
+            DurableMessageQueue(str(tmp_path / "bad"), fsync="sometimes")
+    
+    def test_interval_flusher_clears_dirty(self, tmp_path):
+        """Test the background thread fsyncs pending writes"""
+        with DurableMessageQueue(str(tmp_path), fsync="interval", fsync_interval_ms=10) as mq:
+            mq.put("a")
+            assert mq.dirty
+            
+            time.sleep(0.1)
+            assert not mq.dirty
+    
+    def test_sync_releases_lock_during_fsync(self, tmp_path, monkeypatch):
+        """Test an interval flush does not hold the queue lock while on disk"""
+        with DurableMessageQueue(str(tmp_path), fsync="never") as mq:
+            held = []
+            real_fsync = os.fsync
+            
+            def fsync(fd):
+                held.append(mq.lock.locked())
+                real_fsync(fd)
+            
+            mq.put("a")
+            monkeypatch.setattr(os, "fsync", fsync)
+            mq.sync()
+            mq.sync()  # clean: no second flush
+            assert held == [False]
+            assert not mq.dirty
+    
+    def test_delayed_delivery_rejected(self, tmp_path):
+        """Test delayed puts raise instead of being lost on a crash"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            with pytest.raises(ValueError):
+                mq.put("later", delay=1.0)
+            with pytest.raises(ValueError):
+                mq.put_at("later", time.time() + 60)
+            
+            mq.put_at("overdue", time.time() - 1)  # due already: a plain put
+            assert mq.get_nowait() == "overdue"
+            assert mq.delayed_size() == 0
+    
+    def test_put_after_close(self, tmp_path):
+        """Test a closed queue refuses writes"""
+        mq = DurableMessageQueue(str(tmp_path))
+        mq.close()
+        
+        with pytest.raises(ValueError):
+            mq.put("late")
+    
+    def test_concurrent_producers(self, tmp_path):
+        """Test offsets stay sequential with many writer threads"""
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            def producer(base):
+                for i in range(200):
+                    mq.put(base + i)
+            
+            threads = [threading.Thread(target=producer, args=(n * 1000,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        
+        with DurableMessageQueue(str(tmp_path)) as mq:
+            assert sorted(mq.get_batch(1000, max_wait=0)) == sorted(
+                n * 1000 + i for n in range(4) for i in range(200))
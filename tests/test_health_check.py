@@ -0,0 +1,279 @@
+"""
+Unit tests for health checks, outlier ejection and circuit breakers
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.health_check import (
+    CircuitBreaker, FakeBackend, ServerPool, http_probe, tcp_probe
+)
+from system_design.load_balancer import RoundRobinBalancer, Server
+
+
+def make_pool(clock, count=4, probe=None, **kwargs):
+    servers = [Server(f"s{i}") for i in range(count)]
+    return servers, ServerPool(servers, probe=probe, clock=clock, **kwargs)
+
+
+class TestCircuitBreaker:
+    """Test cases for the circuit breaker state machine"""
+    
+    def test_opens_on_failure_ratio(self, clock):
+        """Test the breaker waits for min_calls, then opens on the ratio"""
+        breaker = CircuitBreaker(failure_ratio=0.5, window=10, min_calls=4, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED  # too few calls to judge
+        
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allows_traffic()
+    
+    def test_ratio_over_sliding_window(self, clock):
+        """Test old outcomes fall out of the window"""
+        breaker = CircuitBreaker(failure_ratio=0.5, window=4, min_calls=4, clock=clock)
+        for outcome in [False, True, True, True, True, False]:
+            (breaker.record_success if outcome else breaker.record_failure)()
+        assert breaker.failures == 1
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_half_open_trials_close(self, clock):
+        """Test after reset_timeout only the trial requests pass, then it closes"""
+        breaker = CircuitBreaker(window=2, min_calls=1, reset_timeout=10.0,
+                                 half_open_calls=2, clock=clock)
+        breaker.record_failure()
+        clock.now += 9.9
+        assert not breaker.allows_traffic()
+        
+        clock.now += 0.1
+        assert breaker.allows_traffic()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.on_dispatch()
+        breaker.on_dispatch()
+        assert not breaker.allows_traffic()  # both trials in flight
+        
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allows_traffic()
+    
+    def test_half_open_failure_reopens(self, clock):
+        """Test a failed trial opens the breaker for another reset_timeout"""
+        breaker = CircuitBreaker(window=2, min_calls=1, reset_timeout=10.0, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        breaker.tick()
+        breaker.on_dispatch()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now += 5
+        assert not breaker.allows_traffic()
+    
+    def test_invalid_config(self):
+        """Test min_calls larger than the window is rejected"""
+        with pytest.raises(ValueError):
+            CircuitBreaker(window=5, min_calls=6)
+
+
+class TestServerPool:
+    """Test cases for active checks, ejection and pool dispatch"""
+    
+    def test_probe_thresholds(self, clock):
+        """Test consecutive probe results are needed to flip a server"""
+        up = {"s0": True, "s1": True}
+        servers, pool = make_pool(clock, count=2, probe=lambda s: up[s.id],
+                                  unhealthy_threshold=2, healthy_threshold=3)
+        up["s0"] = False
+        pool.check()
+        assert servers[0].available
+        pool.check()
+        assert not servers[0].available
+        assert pool.status(servers[0]) == "unhealthy"
+        
+        up["s0"] = True
+        pool.check()
+        pool.check()
+        assert not servers[0].available
+        pool.check()
+        assert servers[0].available
+    
+    def test_probe_exception_counts_as_failure(self, clock):
+        """Test a probe that raises marks the server down"""
+        def probe(server):
+            raise RuntimeError("boom")
+        
+        servers, pool = make_pool(clock, count=1, probe=probe, unhealthy_threshold=1)
+        pool.check()
+        assert not servers[0].available
+    
+    def test_outlier_ejection_and_expiry(self, clock):
+        """Test consecutive errors eject, and each ejection lasts longer"""
+        servers, pool = make_pool(clock, consecutive_errors=3, base_ejection_time=10.0,
+                                  breaker_factory=lambda: CircuitBreaker(min_calls=20))
+        server = servers[0]
+        pool.record_failure(server)
+        pool.record_failure(server)
+        pool.record_success(server)  # resets the streak
+        pool.record_failure(server)
+        pool.record_failure(server)
+        assert server.available
+        
+        pool.record_failure(server)
+        assert not server.available
+        assert pool.status(server) == "ejected"
+        clock.now += 10
+        pool.tick()
+        assert server.available
+        
+        for _ in range(3):
+            pool.record_failure(server)
+        clock.now += 10
+        pool.tick()
+        assert not server.available  # second ejection: 20 s
+        clock.now += 10
+        pool.tick()
+        assert server.available
+    
+    def test_ejection_time_capped(self, clock):
+        """Test repeated ejections grow only up to max_ejection_time"""
+        servers, pool = make_pool(clock, consecutive_errors=1, base_ejection_time=10.0,
+                                  max_ejection_time=25.0,
+                                  breaker_factory=lambda: CircuitBreaker(min_calls=20))
+        server = servers[0]
+        for _ in range(5):
+            pool.record_failure(server)
+            assert not server.available
+            clock.now += 25
+            pool.tick()
+            assert server.available
+    
+    def test_max_ejection_percent(self, clock):
+        """Test a pool-wide outage cannot eject more than the allowed share"""
+        servers, pool = make_pool(clock, count=4, consecutive_errors=1,
+                                  max_ejection_percent=50,
+                                  breaker_factory=lambda: CircuitBreaker(min_calls=20))
+        for server in servers:
+            pool.record_failure(server)
+        assert [s.available for s in servers] == [False, False, True, True]
+    
+    def test_acquire_records_outcome(self, clock):
+        """Test acquire() counts connections and feeds failures to ejection"""
+        servers, pool = make_pool(clock, count=2, consecutive_errors=2,
+                                  breaker_factory=lambda: CircuitBreaker(min_calls=20))
+        balancer = RoundRobinBalancer(servers)
+        
+        failed = []
+        for _ in range(4):
+            try:
+                with pool.acquire(balancer) as server:
+                    assert server.active_connections == 1
+                    if server.id == "s0":
+                        raise ConnectionError("refused")
+            except ConnectionError:
+                failed.append(server.id)
+        assert failed == ["s0", "s0"]
+        assert not servers[0].available
+        assert servers[1].available
+        assert all(s.active_connections == 0 for s in servers)
+        
+        picks = []
+        for _ in range(3):
+            with pool.acquire(balancer) as server:
+                picks.append(server.id)
+        assert picks == ["s1"] * 3
+    
+    def test_interrupt_is_not_a_failure(self, clock):
+        """Test KeyboardInterrupt or cancellation neither ejects nor uses up a trial"""
+        def breaker():
+            return CircuitBreaker(window=2, min_calls=2, reset_timeout=5.0, clock=clock)
+        
+        servers, pool = make_pool(clock, count=1, consecutive_errors=1, breaker_factory=breaker)
+        balancer = RoundRobinBalancer(servers)
+        for _ in range(3):
+            with pytest.raises(KeyboardInterrupt):
+                with pool.acquire(balancer):
+                    raise KeyboardInterrupt
+        assert pool.status(servers[0]) == "up"
+        
+        pool.record_failure(servers[0])
+        pool.record_success(servers[0])  # streak reset: breaker only
+        pool.record_failure(servers[0])
+        clock.now += 30
+        pool.tick()
+        with pytest.raises(KeyboardInterrupt):
+            with pool.acquire(balancer):
+                raise KeyboardInterrupt
+        assert servers[0].available  # the half-open trial slot was given back
+        assert servers[0].active_connections == 0
+    
+    def test_breaker_half_open_trial(self, clock):
+        """Test a half-open server gets exactly the trial requests, then recovers"""
+        def breaker():
+            return CircuitBreaker(window=2, min_calls=2, reset_timeout=5.0, clock=clock)
+        
+        servers, pool = make_pool(clock, count=2, consecutive_errors=100, breaker_factory=breaker)
+        balancer = RoundRobinBalancer(servers)
+        pool.record_failure(servers[0])
+        pool.record_failure(servers[0])
+        assert pool.status(servers[0]) == "breaker open"
+        assert not servers[0].available
+        
+        clock.now += 5
+        pool.tick()
+        assert servers[0].available
+        with pool.acquire(balancer) as trial:
+            assert trial is servers[0]
+            assert not servers[0].available  # single trial in flight
+            with pool.acquire(balancer) as other:
+                assert other is servers[1]
+        assert pool.status(servers[0]) == "up"
+        assert servers[0].available
+
+
+class TestProbes:
+    """Test cases for the probe functions against a local fake backend"""
+    
+    def test_http_probe(self):
+        """Test the HTTP probe follows the backend's health status"""
+        server = Server("backend")
+        with FakeBackend() as backend:
+            probe = http_probe(lambda s: backend.url + "/health")
+            assert probe(server) is True
+            backend.healthy = False
+            assert probe(server) is False
+        assert probe(server) is False  # connection refused
+    
+    def test_tcp_probe(self):
+        """Test the TCP probe passes while the backend accepts connections"""
+        backend = FakeBackend()
+        address = backend.address
+        probe = tcp_probe(lambda s: address, timeout=0.5)
+        assert probe(Server("backend")) is True
+        backend.stop()
+        assert probe(Server("backend")) is False
+    
+    def test_background_checks(self):
+        """Test start() probes periodically and takes a dead backend out"""
+        with FakeBackend() as first, FakeBackend() as second:
+            backends = {"a": first, "b": second}
+            servers = [Server("a"), Server("b")]
+            pool = ServerPool(servers, interval=0.02, unhealthy_threshold=1,
+                              probe=http_probe(lambda s: backends[s.id].url + "/health"))
+            pool.start()
+            try:
+                second.healthy = False
+                deadline = time.monotonic() + 2.0
+                while servers[1].available and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert not servers[1].available
+                assert servers[0].available
+                assert RoundRobinBalancer(servers).get_server() is servers[0]
+            finally:
+                pool.stop()
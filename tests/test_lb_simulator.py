@@ -0,0 +1,201 @@
+"""
+Unit tests for the discrete-event load balancer simulator
+"""
+
+import math
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.lb_simulator import (
+    Backend, bursty_arrivals, constant, diurnal_arrivals, exponential, lognormal,
+    pareto, poisson_arrivals, simulate
+)
+from system_design.load_balancer import (
+    ConsistentHashBalancer, LeastConnectionsBalancer, RoundRobinBalancer
+)
+
+
+def counts_per_window(arrivals, window):
+    return np.bincount((arrivals // window).astype(int))[:-1]
+
+
+class TestArrivals:
+    """Test cases for the arrival processes"""
+    
+    def test_poisson_rate(self):
+        """Test Poisson arrivals are sorted and average the requested rate"""
+        arrivals = poisson_arrivals(rate=200, count=100_000, seed=1)
+        assert np.all(np.diff(arrivals) >= 0)
+        assert len(arrivals) / arrivals[-1] == pytest.approx(200, rel=0.02)
+    
+    def test_bursty_rate_and_dispersion(self):
+        """Test bursty arrivals keep the mean rate but vary far more than Poisson"""
+        bursty = bursty_arrivals(rate=200, count=200_000, burst_factor=5, seed=2)
+        poisson = poisson_arrivals(rate=200, count=200_000, seed=2)
+        assert np.all(np.diff(bursty) >= 0)
+        assert len(bursty) / bursty[-1] == pytest.approx(200, rel=0.1)
+        
+        # Index of dispersion of per-second counts: 1 for Poisson
+        bursty_counts = counts_per_window(bursty, 1.0)
+        poisson_counts = counts_per_window(poisson, 1.0)
+        assert poisson_counts.var() / poisson_counts.mean() == pytest.approx(1, abs=0.2)
+        assert bursty_counts.var() / bursty_counts.mean() > 10
+    
+    def test_diurnal_follows_rate_curve(self):
+        """Test arrivals peak a quarter period in and bottom out at three quarters"""
+        arrivals = diurnal_arrivals(rate=100, count=200_000, period=1000.0,
+                                    amplitude=0.5, seed=3)
+        phase = arrivals % 1000.0
+        peak = np.sum((phase > 200) & (phase < 300))
+        trough = np.sum((phase > 700) & (phase < 800))
+        assert peak / trough == pytest.approx(3, rel=0.15)
+    
+    def test_diurnal_amplitude_validated(self):
+        """Test an amplitude that would make the rate hit zero is rejected"""
+        with pytest.raises(ValueError):
+            diurnal_arrivals(rate=1, count=10, amplitude=1.0)
+
+
+class TestServiceTimes:
+    """Test cases for the service-time distributions"""
+    
+    @pytest.mark.parametrize("dist", [exponential(0.02), constant(0.02),
+                                      lognormal(0.02, sigma=1.0), pareto(0.02, alpha=3.0)])
+    def test_mean(self, dist):
+        """Test every distribution has the configured mean"""
+        samples = dist(np.random.default_rng(4), 400_000)
+        assert samples.mean() == pytest.approx(0.02, rel=0.03)
+        assert samples.min() > 0
+    
+    def test_pareto_needs_finite_mean(self):
+        """Test alpha <= 1 is rejected"""
+        with pytest.raises(ValueError):
+            pareto(1.0, alpha=1.0)
+
+
+class TestSimulate:
+    """Test cases for the simulation loop"""
+    
+    def test_mm1_matches_theory(self):
+        """Test an M/M/1 queue's mean wait and utilisation"""
+        arrivals = poisson_arrivals(rate=0.5, count=200_000, seed=5)
+        result = simulate(RoundRobinBalancer, [Backend("only", exponential(1.0))], arrivals)
+        
+        # rho = 0.5: Wq = rho / (mu - lambda) = 1.0
+        assert result.queue_delay["mean"] == pytest.approx(1.0, rel=0.1)
+        assert result.response_time["mean"] == pytest.approx(2.0, rel=0.1)
+        assert result.utilisation["only"] == pytest.approx(0.5, rel=0.03)
+    
+    def test_md1_matches_theory(self):
+        """Test an M/D/1 queue's mean wait (half of M/M/1)"""
+        arrivals = poisson_arrivals(rate=0.5, count=200_000, seed=6)
+        result = simulate(RoundRobinBalancer, [Backend("only", constant(1.0))], arrivals)
+        assert result.queue_delay["mean"] == pytest.approx(0.5, rel=0.1)
+    
+    def test_concurrency_workers(self):
+        """Test a backend with c workers serves c requests at once"""
+        arrivals = np.zeros(4)  # four simultaneous requests
+        result = simulate(RoundRobinBalancer, [Backend("b", constant(1.0), concurrency=2)],
+                          arrivals)
+        assert result.horizon == pytest.approx(2.0)
+        assert result.queue_delay["mean"] == pytest.approx(0.5)
+        assert result.utilisation["b"] == pytest.approx(1.0)
+    
+    def test_balancer_sees_in_flight_requests(self):
+        """Test completions are replayed so least-connections avoids busy backends"""
+        backends = [Backend("a", constant(1.0)), Backend("b", constant(1.0))]
+        arrivals = np.array([0.0, 0.1, 1.5, 1.6])
+        
+        result = simulate(LeastConnectionsBalancer, backends, arrivals)
+        assert result.queue_delay["mean"] == 0.0
+        assert result.utilisation == {"a": pytest.approx(2 / 2.6), "b": pytest.approx(2 / 2.6)}
+    
+    def test_servers_fresh_and_drained(self):
+        """Test each run gets new Servers and every request completes"""
+        created = []
+        
+        def factory(servers):
+            created.append(servers)
+            return RoundRobinBalancer(servers)
+        
+        backends = [Backend(f"s{i}", exponential(0.01)) for i in range(3)]
+        arrivals = poisson_arrivals(rate=100, count=3000, seed=7)
+        simulate(factory, backends, arrivals)
+        simulate(factory, backends, arrivals)
+        
+        assert created[0][0] is not created[1][0]
+        for servers in created:
+            assert all(s.active_connections == 0 for s in servers)
+            assert [s.total_requests for s in servers] == [1000] * 3
+    
+    def test_simulated_clock_passed(self):
+        """Test balancers accepting clock= see simulated time"""
+        seen = []
+        
+        class ClockedBalancer(RoundRobinBalancer):
+            def __init__(self, servers, clock):
+                super().__init__(servers)
+                self.clock = clock
+            
+            def get_server(self):
+                seen.append(self.clock())
+                return super().get_server()
+        
+        arrivals = np.array([0.5, 1.25, 7.0])
+        simulate(ClockedBalancer, [Backend("a", constant(0.1))], arrivals)
+        assert seen == [0.5, 1.25, 7.0]
+    
+    def test_keys_routed_to_balancer(self):
+        """Test keyed balancers get one key per request"""
+        backends = [Backend(f"s{i}", constant(0.001)) for i in range(4)]
+        arrivals = np.arange(100) * 0.01
+        result = simulate(ConsistentHashBalancer, backends, arrivals, keys=["user-1"] * 100)
+        assert sorted(u > 0 for u in result.utilisation.values()) == [False, False, False, True]
+        
+        with pytest.raises(ValueError):
+            simulate(ConsistentHashBalancer, backends, arrivals, keys=["user-1"])
+    
+    def test_empty_arrivals_rejected(self):
+        """Test an empty run raises a clear error"""
+        with pytest.raises(ValueError, match="empty"):
+            simulate(RoundRobinBalancer, [Backend("a", constant(0.1))], np.array([]))
+    
+    def test_unplaceable_requests_counted_as_rejected(self):
+        """Test requests the balancer has no server for are rejected, not a crash"""
+        class FlakyBalancer(RoundRobinBalancer):
+            calls = 0
+            
+            def get_server(self):
+                self.calls += 1
+                if self.calls % 4 == 0:
+                    return None
+                if self.calls % 4 == 1:
+                    raise ValueError("No servers available")
+                return super().get_server()
+        
+        arrivals = np.arange(100) * 1.0
+        result = simulate(FlakyBalancer, [Backend("a", constant(0.5))], arrivals)
+        assert result.rejected == 50
+        assert result.requests == 100
+        assert result.queue_delay["p99"] == 0.0
+        
+        class DownBalancer(RoundRobinBalancer):
+            def get_server(self):
+                return None
+        
+        result = simulate(DownBalancer, [Backend("a", constant(0.5))], arrivals)
+        assert result.rejected == 100
+        assert math.isnan(result.queue_delay["mean"])
+        assert result.utilisation == {"a": 0.0}
+    
+    def test_reports_decision_rate(self):
+        """Test the balancer's own throughput is measured"""
+        arrivals = poisson_arrivals(rate=100, count=10_000, seed=8)
+        result = simulate(RoundRobinBalancer, [Backend("a", exponential(0.001))], arrivals)
+        assert result.requests == 10_000
+        assert result.decisions_per_sec > 10_000
+        assert result.wall_seconds > 0
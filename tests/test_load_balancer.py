@@ -0,0 +1,495 @@
+"""
+Unit tests for load balancers
+"""
+
+import math
+import pytest
+import random
+import subprocess
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.load_balancer import (
+    ConsistentHashBalancer, IPHashBalancer, LeastConnectionsBalancer, LeastConnectionsHeapBalancer,
+    PowerOfTwoChoicesBalancer, RoundRobinBalancer, Server, SmoothWeightedRoundRobinBalancer,
+    WeightedRoundRobinBalancer, stable_hash
+)
+
+
+KEYS = [f"10.0.{i // 256}.{i % 256}" for i in range(20_000)]
+
+
+def route(balancer, keys=KEYS):
+    return {key: balancer.get_server(key).id for key in keys}
+
+
+class TestConsistentHashBalancer:
+    """Test cases for the consistent-hash ring"""
+    
+    def test_stable_hash_same_in_other_process(self):
+        """Test routing does not depend on per-process hash randomisation"""
+        code = ("import sys; sys.path.insert(0, '.');"
+                "from system_design.load_balancer import stable_hash;"
+                "print(stable_hash('10.0.0.1'))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=Path(__file__).parent.parent, check=True)
+        assert int(out.stdout) == stable_hash("10.0.0.1")
+    
+    def test_same_key_same_server(self):
+        """Test a key always maps to the same server"""
+        balancer = ConsistentHashBalancer([Server(f"s{i}") for i in range(5)])
+        assert len({balancer.get_server("client-1").id for _ in range(10)}) == 1
+    
+    def test_ring_independent_of_server_order(self):
+        """Test balancers built from the same servers agree on every key"""
+        servers = [Server(f"s{i}") for i in range(5)]
+        assert route(ConsistentHashBalancer(servers)) == route(ConsistentHashBalancer(servers[::-1]))
+    
+    def test_add_server_moves_only_its_share(self):
+        """Test adding a server moves about 1/n keys, all of them to it"""
+        balancer = ConsistentHashBalancer([Server(f"s{i}") for i in range(9)])
+        before = route(balancer)
+        balancer.add_server(Server("s9"))
+        after = route(balancer)
+        
+        moved = [key for key in KEYS if before[key] != after[key]]
+        assert all(after[key] == "s9" for key in moved)
+        assert 0.05 < len(moved) / len(KEYS) < 0.15
+    
+    def test_remove_server_moves_only_its_keys(self):
+        """Test removing a server only reassigns the keys it owned"""
+        balancer = ConsistentHashBalancer([Server(f"s{i}") for i in range(10)])
+        before = route(balancer)
+        balancer.remove_server("s3")
+        after = route(balancer)
+        
+        assert all(before[key] == "s3" for key in KEYS if before[key] != after[key])
+        assert "s3" not in after.values()
+    
+    def test_weights(self):
+        """Test a server gets keys in proportion to its weight"""
+        balancer = ConsistentHashBalancer([Server("big", weight=3), Server("small", weight=1)])
+        counts = Counter(route(balancer).values())
+        assert 2.0 < counts["big"] / counts["small"] < 4.5
+    
+    def test_balanced_with_virtual_nodes(self):
+        """Test virtual nodes keep every server near its fair share"""
+        balancer = ConsistentHashBalancer([Server(f"s{i}") for i in range(10)], vnodes=200)
+        counts = Counter(route(balancer).values())
+        assert max(counts.values()) < 1.35 * len(KEYS) / 10
+        assert min(counts.values()) > 0.65 * len(KEYS) / 10
+    
+    def test_errors(self):
+        """Test invalid membership changes and an empty ring"""
+        with pytest.raises(ValueError):
+            ConsistentHashBalancer([]).get_server("key")
+        with pytest.raises(ValueError):
+            ConsistentHashBalancer([Server("a")], vnodes=0)
+        
+        balancer = ConsistentHashBalancer([Server("a")])
+        with pytest.raises(ValueError):
+            balancer.add_server(Server("a"))
+        with pytest.raises(ValueError):
+            balancer.remove_server("b")
+    
+    def test_ip_hash_balancer_is_consistent(self):
+        """Test IPHashBalancer keeps clients sticky across membership changes"""
+        balancer = IPHashBalancer([Server(f"s{i}") for i in range(4)])
+        before = route(balancer)
+        balancer.add_server(Server("s4"))
+        after = route(balancer)
+        
+        moved = sum(before[key] != after[key] for key in KEYS)
+        assert moved / len(KEYS) < 0.3
+
+
+def assert_heap_ordered(balancer):
+    heap = balancer.heap
+    for i in range(1, len(heap)):
+        assert heap[(i - 1) // 2] < heap[i]
+    for i, entry in enumerate(heap):
+        assert balancer.position[entry[2].id] == i
+        assert entry[0] == balancer._load(entry[2])
+
+
+class TestLeastConnectionsHeapBalancer:
+    """Test cases for the indexed-heap least-connections balancer"""
+    
+    def test_picks_least_loaded_per_weight(self):
+        """Test connections are weighed against server capacity"""
+        big, small = Server("big", weight=3), Server("small", weight=1)
+        balancer = LeastConnectionsHeapBalancer([small, big])
+        
+        picks = []
+        for _ in range(8):
+            server = balancer.get_server()
+            server.handle_request()
+            picks.append(server.id)
+        assert Counter(picks) == {"big": 6, "small": 2}
+    
+    def test_ties_go_to_first_added(self):
+        """Test equal loads resolve in insertion order"""
+        balancer = LeastConnectionsHeapBalancer([Server("a"), Server("b"), Server("c")])
+        assert balancer.get_server().id == "a"
+    
+    def test_tracks_direct_server_calls(self):
+        """Test handle_request/complete_request reorder the heap"""
+        a, b = Server("a"), Server("b")
+        balancer = LeastConnectionsHeapBalancer([a, b])
+        
+        a.handle_request()
+        assert balancer.get_server() is b
+        b.handle_request()
+        b.handle_request()
+        assert balancer.get_server() is a
+        b.complete_request()
+        b.complete_request()
+        assert balancer.get_server() is b
+    
+    def test_matches_linear_scan(self):
+        """Test random load changes keep the heap consistent with min()"""
+        rng = random.Random(1)
+        servers = [Server(f"s{i}", weight=rng.randint(1, 4)) for i in range(50)]
+        balancer = LeastConnectionsHeapBalancer(servers)
+        
+        for _ in range(2000):
+            server = rng.choice(servers)
+            if server.active_connections and rng.random() < 0.5:
+                server.complete_request()
+            else:
+                server.handle_request()
+            expected = min(servers, key=lambda s: (s.active_connections / s.weight,
+                                                   servers.index(s)))
+            assert balancer.get_server() is expected
+        assert_heap_ordered(balancer)
+    
+    def test_add_and_remove_server(self):
+        """Test membership changes keep the heap valid and stop listening"""
+        servers = [Server(f"s{i}") for i in range(10)]
+        for i, server in enumerate(servers):
+            server.active_connections = i
+        balancer = LeastConnectionsHeapBalancer(servers)
+        
+        removed = balancer.remove_server("s0")
+        assert balancer.get_server().id == "s1"
+        assert removed.listeners == []
+        removed.handle_request()
+        assert_heap_ordered(balancer)
+        
+        balancer.add_server(Server("new"))
+        assert balancer.get_server().id == "new"
+        assert [s.id for s in balancer.servers] == [f"s{i}" for i in range(1, 10)] + ["new"]
+        assert_heap_ordered(balancer)
+        
+        with pytest.raises(ValueError):
+            balancer.add_server(Server("new"))
+        with pytest.raises(ValueError):
+            balancer.remove_server("s0")
+    
+    def test_dropped_balancers_stop_listening(self):
+        """Test balancers rebuilt over the same servers are not kept alive by them"""
+        servers = [Server(f"s{i}") for i in range(3)]
+        for _ in range(5):
+            LeastConnectionsHeapBalancer(servers)
+            SmoothWeightedRoundRobinBalancer(servers)
+        balancer = LeastConnectionsHeapBalancer(servers)
+        
+        assert all(len(server.listeners) == 1 for server in servers)
+        servers[0].handle_request()
+        assert balancer.get_server() is servers[1]
+    
+    def test_acquire_releases_on_exit(self):
+        """Test acquire() counts the connection and releases it, even on error"""
+        server = Server("a")
+        balancer = LeastConnectionsHeapBalancer([server])
+        
+        with balancer.acquire() as picked:
+            assert picked is server
+            assert server.active_connections == 1
+        assert server.active_connections == 0
+        
+        with pytest.raises(RuntimeError):
+            with balancer.acquire():
+                raise RuntimeError("backend failed")
+        assert server.active_connections == 0
+        assert server.total_requests == 2
+    
+    def test_empty(self):
+        """Test an empty balancer raises"""
+        with pytest.raises(ValueError):
+            LeastConnectionsHeapBalancer([]).get_server()
+    
+    def test_concurrent_dispatch(self):
+        """Test concurrent acquire() spreads load and leaves counts consistent"""
+        servers = [Server(f"s{i}") for i in range(8)]
+        balancer = LeastConnectionsHeapBalancer(servers)
+        held = threading.Barrier(8)
+        peaks = []
+        
+        def worker():
+            for i in range(500):
+                with balancer.acquire():
+                    if i == 0:
+                        held.wait()  # all 8 connections open at once
+                        peaks.append(max(s.active_connections for s in servers))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert peaks == [1] * 8
+        assert all(s.active_connections == 0 for s in servers)
+        assert sum(s.total_requests for s in servers) == 4000
+        assert_heap_ordered(balancer)
+
+
+def picks(balancer, count):
+    return "".join(balancer.get_server().id for _ in range(count))
+
+
+class TestSmoothWeightedRoundRobinBalancer:
+    """Test cases for smooth weighted round robin"""
+    
+    def test_nginx_order(self):
+        """Test the smooth mode reproduces nginx's interleaving"""
+        balancer = SmoothWeightedRoundRobinBalancer([Server("a", 5), Server("b", 1), Server("c", 1)])
+        assert picks(balancer, 14) == "aabacaa" * 2
+    
+    def test_weighted_round_robin_is_smooth(self):
+        """Test WeightedRoundRobinBalancer no longer sends bursts"""
+        balancer = WeightedRoundRobinBalancer([Server("a", 3), Server("b", 2), Server("c", 1)])
+        assert picks(balancer, 6) == "abacba"
+    
+    @pytest.mark.parametrize("precompute", [False, True])
+    def test_every_cycle_matches_weights(self, precompute):
+        """Test each cycle of sum(weights) picks honours every weight exactly"""
+        rng = random.Random(3)
+        servers = [Server(chr(ord("a") + i), rng.randint(1, 6)) for i in range(8)]
+        balancer = SmoothWeightedRoundRobinBalancer(servers, precompute=precompute)
+        cycle = sum(s.weight for s in servers)
+        
+        for _ in range(3):
+            counts = Counter(picks(balancer, cycle))
+            assert counts == {s.id: s.weight for s in servers}
+    
+    def test_precomputed_spreads_heavy_server(self):
+        """Test the precomputed schedule interleaves instead of bursting"""
+        servers = [Server("h", 20)] + [Server(str(i), 1) for i in range(9)]
+        balancer = SmoothWeightedRoundRobinBalancer(servers, precompute=True)
+        sequence = picks(balancer, 290)
+        assert "hhhh" not in sequence
+    
+    @pytest.mark.parametrize("precompute", [False, True])
+    def test_set_weight(self, precompute):
+        """Test weight changes take effect, zero weight drains a server"""
+        a, b = Server("a", 1), Server("b", 1)
+        balancer = SmoothWeightedRoundRobinBalancer([a, b], precompute=precompute)
+        picks(balancer, 1)
+        
+        b.set_weight(3)
+        picks(balancer, 4)  # finish the cycle in progress
+        assert Counter(picks(balancer, 8)) == {"a": 2, "b": 6}
+        
+        a.set_weight(0)
+        picks(balancer, 3)
+        assert picks(balancer, 6) == "bbbbbb"
+    
+    def test_incremental_schedule_matches_rebuild(self):
+        """Test swapping one server's slots equals building from scratch"""
+        servers = [Server(str(i), i % 4 + 1) for i in range(20)]
+        balancer = SmoothWeightedRoundRobinBalancer(servers, precompute=True)
+        picks(balancer, 7)
+        last_time = balancer.schedule[balancer.index - 1][0]
+        
+        servers[5].set_weight(9)
+        servers[11].set_weight(0)
+        fresh = SmoothWeightedRoundRobinBalancer(servers, precompute=True)
+        assert balancer.schedule == fresh.schedule
+        # Resumes right after the point in the cycle reached before the change
+        assert balancer.schedule[balancer.index - 1][0] <= last_time < balancer.schedule[balancer.index][0]
+    
+    def test_connection_changes_keep_schedule(self):
+        """Test only weight changes touch the schedule"""
+        server = Server("a", 2)
+        balancer = SmoothWeightedRoundRobinBalancer([server, Server("b")], precompute=True)
+        schedule = balancer.schedule
+        server.handle_request()
+        server.complete_request()
+        assert balancer.schedule is schedule
+    
+    @pytest.mark.parametrize("precompute", [False, True])
+    def test_no_servers(self, precompute):
+        """Test an empty or all-zero balancer raises"""
+        with pytest.raises(ValueError):
+            SmoothWeightedRoundRobinBalancer([], precompute=precompute).get_server()
+        with pytest.raises(ValueError):
+            SmoothWeightedRoundRobinBalancer([Server("a", 0)], precompute=precompute).get_server()
+
+
+class TestServerLatency:
+    """Test cases for peak-EWMA latency recording"""
+    
+    def test_no_samples(self):
+        """Test a fresh server has no latency estimate"""
+        assert Server("a").latency_estimate(now=0.0) == 0.0
+    
+    def test_peak_replaces_average(self):
+        """Test a slower sample takes over immediately"""
+        server = Server("a", latency_decay=10.0)
+        server.record_latency(0.010, now=0.0)
+        server.record_latency(0.500, now=0.001)
+        assert server.latency_estimate(now=0.001) == pytest.approx(0.5)
+    
+    def test_faster_samples_averaged_by_elapsed_time(self):
+        """Test lower samples pull the average down in proportion to time passed"""
+        server = Server("a", latency_decay=1.0)
+        server.record_latency(0.100, now=0.0)
+        server.record_latency(0.010, now=0.001)
+        assert server.latency_ewma == pytest.approx(0.1, rel=0.01)  # barely moved
+        
+        server.record_latency(0.010, now=10.0)
+        assert server.latency_ewma == pytest.approx(0.010, rel=0.01)  # mostly replaced
+    
+    def test_estimate_decays_when_idle(self):
+        """Test an idle server's estimate fades so it gets probed again"""
+        server = Server("a", latency_decay=2.0)
+        server.record_latency(1.0, now=0.0)
+        assert server.latency_estimate(now=2.0) == pytest.approx(math.exp(-1))
+        assert server.latency_ewma == 1.0  # reading does not change state
+
+
+class TestPowerOfTwoChoicesBalancer:
+    """Test cases for the P2C peak-EWMA balancer"""
+    
+    def test_prefers_fast_server(self):
+        """Test the faster of two servers always wins"""
+        fast, slow = Server("fast"), Server("slow")
+        fast.record_latency(0.01, now=0.0)
+        slow.record_latency(0.10, now=0.0)
+        balancer = PowerOfTwoChoicesBalancer([slow, fast], clock=lambda: 0.0,
+                                             rng=random.Random(0))
+        assert {balancer.get_server().id for _ in range(20)} == {"fast"}
+    
+    def test_cost_grows_with_in_flight_requests(self):
+        """Test a fast but busy server loses to a slower idle one"""
+        fast, slow = Server("fast"), Server("slow")
+        fast.record_latency(0.01, now=0.0)
+        slow.record_latency(0.03, now=0.0)
+        balancer = PowerOfTwoChoicesBalancer([fast, slow], clock=lambda: 0.0)
+        for _ in range(3):
+            fast.handle_request()
+        
+        assert balancer.cost(fast) == pytest.approx(0.04)
+        assert balancer.get_server() is slow
+    
+    def test_unanswered_busy_server_penalised(self):
+        """Test a server with requests in flight but no sample is avoided"""
+        new, known = Server("new"), Server("known")
+        known.record_latency(1.0, now=0.0)
+        new.handle_request()
+        balancer = PowerOfTwoChoicesBalancer([new, known], clock=lambda: 0.0)
+        assert balancer.get_server() is known
+    
+    def test_samples_two_distinct_servers(self):
+        """Test every server gets picked when all cost the same"""
+        servers = [Server(f"s{i}") for i in range(5)]
+        balancer = PowerOfTwoChoicesBalancer(servers, rng=random.Random(2))
+        assert {balancer.get_server().id for _ in range(200)} == {s.id for s in servers}
+    
+    def test_acquire_records_latency(self):
+        """Test acquire() counts the connection and records its duration"""
+        now = [5.0]
+        server = Server("a")
+        balancer = PowerOfTwoChoicesBalancer([server], clock=lambda: now[0])
+        
+        with balancer.acquire() as picked:
+            assert server.active_connections == 1
+            now[0] = 5.25
+        assert picked is server
+        assert server.active_connections == 0
+        assert server.latency_estimate(5.25) == pytest.approx(0.25)
+    
+    def test_empty(self):
+        """Test an empty balancer raises"""
+        with pytest.raises(ValueError):
+            PowerOfTwoChoicesBalancer([]).get_server()
+
+
+BALANCERS = {
+    "round-robin": RoundRobinBalancer,
+    "least-conn": LeastConnectionsBalancer,
+    "least-conn-heap": LeastConnectionsHeapBalancer,
+    "smooth-wrr": SmoothWeightedRoundRobinBalancer,
+    "precomputed-wrr": lambda servers: SmoothWeightedRoundRobinBalancer(servers, precompute=True),
+    "consistent-hash": ConsistentHashBalancer,
+    "p2c": lambda servers: PowerOfTwoChoicesBalancer(servers, rng=random.Random(0)),
+}
+
+
+def pick(balancer, i):
+    if isinstance(balancer, ConsistentHashBalancer):
+        server = balancer.get_server(f"key-{i}")
+    else:
+        server = balancer.get_server()
+    server.handle_request()  # spread least-connections picks
+    return server
+
+
+class TestAvailability:
+    """Test cases for skipping servers taken out of rotation"""
+    
+    @pytest.mark.parametrize("name", list(BALANCERS))
+    def test_unavailable_servers_skipped(self, name):
+        """Test no balancer picks a server while it is unavailable"""
+        servers = [Server(f"s{i}") for i in range(5)]
+        balancer = BALANCERS[name](servers)
+        servers[1].set_available(False)
+        servers[3].set_available(False)
+        
+        chosen = {pick(balancer, i).id for i in range(300)}
+        assert chosen == {"s0", "s2", "s4"}
+        
+        servers[1].set_available(True)
+        assert "s1" in {pick(balancer, i).id for i in range(300)}
+    
+    @pytest.mark.parametrize("name", list(BALANCERS))
+    def test_all_unavailable(self, name):
+        """Test a pool with nothing in rotation raises"""
+        servers = [Server(f"s{i}") for i in range(3)]
+        balancer = BALANCERS[name](servers)
+        for server in servers:
+            server.set_available(False)
+        with pytest.raises(ValueError):
+            pick(balancer, 0)
+    
+    def test_heap_resifts_on_availability(self):
+        """Test the heap moves only the changed server, without a rebuild"""
+        servers = [Server(f"s{i}") for i in range(6)]
+        balancer = LeastConnectionsHeapBalancer(servers)
+        heap = balancer.heap
+        
+        servers[0].set_available(False)
+        assert balancer.get_server() is servers[1]
+        assert balancer.heap is heap
+        assert_heap_ordered(balancer)
+        
+        servers[0].set_available(True)
+        assert balancer.get_server() is servers[0]
+    
+    def test_consistent_hash_keeps_other_keys(self):
+        """Test an unavailable server's keys move, nobody else's"""
+        servers = [Server(f"s{i}") for i in range(5)]
+        balancer = ConsistentHashBalancer(servers)
+        before = route(balancer)
+        servers[2].set_available(False)
+        after = route(balancer)
+        
+        assert all(before[key] == "s2" for key in KEYS if before[key] != after[key])
+        servers[2].set_available(True)
+        assert route(balancer) == before
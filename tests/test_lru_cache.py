@@ -72,6 +72,37 @@ class TestLRUCache:
         lru.put(2, 2)  # Should evict key 1
         assert lru.get(1) == -1
         assert lru.get(2) == 2
+    
+    def test_delete_and_len(self):
+        """Test delete frees a slot and len tracks size"""
+        lru = LRUCache(2)
+        
+        lru.put(1, 1)
+        lru.put(2, 2)
+        assert len(lru) == 2
+        
+        assert lru.delete(1) is True
+        assert lru.delete(1) is False
+        assert len(lru) == 1
+        
+        lru.put(3, 3)  # Fits without evicting key 2
+        assert lru.get(2) == 2
+        assert lru.get(3) == 3
+    
+    def test_stats(self):
+        """Test hit/miss/eviction counters"""
+        lru = LRUCache(1)
+        
+        lru.put(1, 1)
+        lru.get(1)
+        lru.get(2)
+        lru.put(2, 2)  # Evicts key 1
+        
+        stats = lru.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+        assert stats["size"] == 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+Unit tests for the memoize decorator
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.memoize import memoize
+from dsa.dynamic_programming.climbing_stairs import climb_stairs_memo, climb_stairs_optimized
+from dsa.dynamic_programming.coin_change import coin_change, coin_change_memo
+
+
+class TestMemoize:
+    """Test cases for memoize"""
+    
+    @pytest.mark.parametrize("policy", ["lru", "lfu"])
+    def test_hits_and_misses(self, policy):
+        """Test repeated calls are served from the cache"""
+        calls = []
+        
+        @memoize(policy=policy, maxsize=10)
+        def square(x):
+            calls.append(x)
+            return x * x
+        
+        assert square(3) == 9
+        assert square(3) == 9
+        assert calls == [3]
+        
+        info = square.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    
+    def test_maxsize_bounds_table(self):
+        """Test the memo table never grows past maxsize"""
+        @memoize(policy="lru", maxsize=5)
+        def identity(x):
+            return x
+        
+        for i in range(100):
+            identity(i)
+        assert identity.cache_info().currsize == 5
+    
+    def test_caches_none_and_minus_one(self):
+        """Test results equal to the caches' miss markers are still cached"""
+        calls = []
+        
+        @memoize(policy="lru", maxsize=10)
+        def marker(x):
+            calls.append(x)
+            return None if x else -1
+        
+        for _ in range(3):
+            marker(0)
+            marker(1)
+        assert calls == [0, 1]
+    
+    def test_kwargs_are_part_of_key(self):
+        """Test keyword arguments distinguish calls"""
+        @memoize(maxsize=10)
+        def power(base, exp=2):
+            return base ** exp
+        
+        assert power(2) == 4
+        assert power(2, exp=3) == 8
+        assert power.cache_info().misses == 2
+    
+    def test_ttl_policy_expires(self):
+        """Test entries expire under the ttl policy"""
+        calls = []
+        
+        @memoize(policy="ttl", ttl=60)
+        def value(x):
+            calls.append(x)
+            return x
+        
+        value(1)
+        value(1)
+        assert calls == [1]
+        assert value.cache_info().maxsize is None  # bounded by age, not size
+        
+        with pytest.raises(ValueError):
+            memoize(policy="ttl")(lambda: None)
+    
+    def test_bypass_and_clear(self):
+        """Test bypass skips the cache and cache_clear resets it"""
+        calls = []
+        
+        @memoize(maxsize=10)
+        def double(x):
+            calls.append(x)
+            return 2 * x
+        
+        double(1)
+        assert double.bypass(1) == 2
+        assert calls == [1, 1]
+        assert double.cache_info().hits == 0
+        
+        double.cache_clear()
+        assert double.cache_info().currsize == 0
+        double(1)
+        assert calls == [1, 1, 1]
+    
+    def test_invalid_arguments(self):
+        """Test unknown policies and non-positive sizes are rejected"""
+        with pytest.raises(ValueError):
+            memoize(policy="mru")(lambda: None)
+        with pytest.raises(ValueError):
+            memoize(maxsize=0)
+    
+    def test_thread_safety(self):
+        """Test concurrent callers keep consistent counters"""
+        @memoize(policy="lfu", maxsize=50)
+        def cube(x):
+            return x ** 3
+        
+        def worker():
+            for i in range(2000):
+                assert cube(i % 100) == (i % 100) ** 3
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        info = cube.cache_info()
+        assert info.hits + info.misses == 16000
+        assert info.currsize <= 50
+
+
+class TestMemoizedDP:
+    """Test the DP functions retrofitted with memoize"""
+    
+    def test_climb_stairs(self):
+        """Test bounded memo still matches the iterative answer"""
+        for n in (1, 2, 10, 300):
+            assert climb_stairs_memo(n) == climb_stairs_optimized(n)
+        assert climb_stairs_memo.cache_info().currsize <= 256
+    
+    def test_deep_recursion(self):
+        """Test bottom-up fill keeps the stack shallow well past the recursion limit"""
+        n = sys.getrecursionlimit() * 3
+        assert climb_stairs_memo(n) == climb_stairs_optimized(n)
+        assert climb_stairs_memo.cache_info().currsize <= 256
+        assert coin_change_memo([1, 2], n) == coin_change([1, 2], n) == n // 2
+    
+    def test_coin_change(self):
+        """Test top-down coin change matches bottom-up"""
+        for coins, amount in (([1, 2, 5], 11), ([2], 3), ([1, 5, 10, 25], 299), ([3], 0)):
+            assert coin_change_memo(coins, amount) == coin_change(coins, amount)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
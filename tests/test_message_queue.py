@@ -0,0 +1,452 @@
+"""
+Unit tests for message queues
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.message_queue import MessageQueue, PriorityQueue
+
+
+class TestMessageQueue:
+    """Test cases for Message Queue"""
+    
+    def test_fifo(self):
+        """Test messages come out in insertion order"""
+        mq = MessageQueue()
+        for i in range(5):
+            mq.put(i)
+        
+        assert [mq.get() for _ in range(5)] == [0, 1, 2, 3, 4]
+        assert mq.empty()
+    
+    def test_nowait(self):
+        """Test put_nowait/get_nowait never block"""
+        mq = MessageQueue(max_size=2)
+        
+        start = time.monotonic()
+        assert [mq.put_nowait(i) for i in range(3)] == [True, True, False]
+        assert [mq.get_nowait() for _ in range(3)] == [0, 1, None]
+        assert time.monotonic() - start < 0.05
+    
+    def test_zero_timeout_does_not_block(self):
+        """Test timeout=0 means 'do not wait' rather than 'wait forever'"""
+        mq = MessageQueue(max_size=1)
+        mq.put("a")
+        
+        assert mq.put("b", timeout=0) is False
+        mq.get()
+        assert mq.get(timeout=0) is None
+    
+    def test_get_timeout_is_accurate(self):
+        """Test get gives up close to its deadline, not at a polling tick"""
+        mq = MessageQueue()
+        
+        start = time.monotonic()
+        assert mq.get(timeout=0.15) is None
+        assert 0.15 <= time.monotonic() - start < 0.2
+    
+    def test_put_blocks_until_room(self):
+        """Test a producer on a full queue resumes as soon as a slot frees"""
+        mq = MessageQueue(max_size=1)
+        mq.put("a")
+        done = []
+        producer = threading.Thread(target=lambda: done.append(mq.put("b", timeout=1.0)))
+        producer.start()
+        
+        time.sleep(0.05)
+        assert done == []
+        assert mq.get() == "a"
+        producer.join(timeout=1.0)
+        
+        assert done == [True]
+        assert mq.get() == "b"
+    
+    def test_fast_wakeup(self):
+        """Test a blocked consumer is woken promptly by put"""
+        mq = MessageQueue()
+        woke = []
+        
+        def consumer():
+            mq.get()
+            woke.append(time.monotonic())
+        
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        time.sleep(0.05)
+        sent = time.monotonic()
+        mq.put("x")
+        thread.join(timeout=1.0)
+        
+        assert woke[0] - sent < 0.05
+    
+    def test_task_done_and_join(self):
+        """Test join waits until every message is marked done"""
+        mq = MessageQueue()
+        for i in range(3):
+            mq.put(i)
+        
+        assert mq.join(timeout=0) is False
+        
+        def worker():
+            while True:
+                message = mq.get(timeout=0.2)
+                if message is None:
+                    return
+                mq.task_done()
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert mq.join(timeout=1.0) is True
+        thread.join()
+    
+    def test_task_done_too_many(self):
+        """Test task_done without a matching put is an error"""
+        mq = MessageQueue()
+        mq.put(1)
+        mq.get()
+        mq.task_done()
+        
+        with pytest.raises(ValueError):
+            mq.task_done()
+    
+    def test_many_producers_consumers(self):
+        """Test every message is delivered exactly once through a small queue"""
+        mq = MessageQueue(max_size=8)
+        received = []
+        lock = threading.Lock()
+        
+        def producer(base):
+            for i in range(500):
+                mq.put(base + i)
+        
+        def consumer():
+            while True:
+                message = mq.get(timeout=0.3)
+                if message is None:
+                    return
+                with lock:
+                    received.append(message)
+                mq.task_done()
+        
+        threads = [threading.Thread(target=producer, args=(n * 1000,)) for n in range(4)]
+        threads += [threading.Thread(target=consumer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert sorted(received) == sorted(n * 1000 + i for n in range(4) for i in range(500))
+        assert mq.join(timeout=0)
+
+
+class TestMessageQueueBatch:
+    """Test cases for put_batch/get_batch"""
+    
+    def test_put_batch_get_batch(self):
+        """Test a batch round trip keeps order"""
+        mq = MessageQueue()
+        
+        assert mq.put_batch(range(10)) == 10
+        assert mq.get_batch(4) == [0, 1, 2, 3]
+        assert mq.get_batch(100, max_wait=0) == [4, 5, 6, 7, 8, 9]
+        assert mq.get_batch(100, max_wait=0) == []
+    
+    def test_get_batch_returns_when_full(self):
+        """Test get_batch returns as soon as the batch is complete"""
+        mq = MessageQueue()
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(mq.get_batch(3, max_wait=5.0)))
+        consumer.start()
+        
+        start = time.monotonic()
+        for i in range(3):
+            mq.put(i)
+        consumer.join(timeout=1.0)
+        
+        assert result == [[0, 1, 2]]
+        assert time.monotonic() - start < 0.5
+    
+    def test_get_batch_partial_on_timeout(self):
+        """Test get_batch returns what it has when max_wait expires"""
+        mq = MessageQueue()
+        mq.put_batch(["a", "b"])
+        
+        start = time.monotonic()
+        assert mq.get_batch(10, max_wait=0.1) == ["a", "b"]
+        assert time.monotonic() - start >= 0.1
+    
+    def test_get_batch_capped_at_max_size(self):
+        """Test a batch larger than the queue can hold does not wait forever"""
+        mq = MessageQueue(max_size=4)
+        mq.put_batch(range(4))
+        
+        assert mq.get_batch(100) == [0, 1, 2, 3]
+    
+    def test_put_batch_waits_for_room(self):
+        """Test put_batch fills a bounded queue as consumers make room"""
+        mq = MessageQueue(max_size=3)
+        received = []
+        
+        def consumer():
+            while len(received) < 10:
+                received.extend(mq.get_batch(2, max_wait=0.5))
+        
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        assert mq.put_batch(range(10), timeout=2.0) == 10
+        thread.join(timeout=2.0)
+        
+        assert received == list(range(10))
+    
+    def test_put_batch_timeout(self):
+        """Test put_batch reports how many fit before timing out"""
+        mq = MessageQueue(max_size=3)
+        
+        assert mq.put_batch(range(5), timeout=0.05) == 3
+        assert mq.size() == 3
+    
+    def test_batch_waiter_does_not_starve_get(self):
+        """Test a plain get() is served while a batch consumer is waiting"""
+        mq = MessageQueue()
+        batch, single = [], []
+        threads = [
+            threading.Thread(target=lambda: batch.append(mq.get_batch(100, max_wait=1.0))),
+            threading.Thread(target=lambda: single.append(mq.get(timeout=1.0))),
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        
+        start = time.monotonic()
+        mq.put("x")
+        threads[1].join(timeout=2.0)
+        
+        assert time.monotonic() - start < 0.5
+        mq.put("y")
+        threads[0].join(timeout=2.0)
+        assert sorted(single + batch[0]) == ["x", "y"]
+    
+    def test_batch_counts_for_join(self):
+        """Test batched messages are tracked by task_done/join"""
+        mq = MessageQueue()
+        mq.put_batch(range(3))
+        mq.get_batch(3)
+        for _ in range(3):
+            mq.task_done()
+        
+        assert mq.join(timeout=0)
+
+
+class TestMessageQueueDelayed:
+    """Test cases for delayed and scheduled delivery"""
+    
+    def test_delayed_message_hidden_until_due(self):
+        """Test a delayed message appears when due, not before"""
+        mq = MessageQueue()
+        mq.put("later", delay=0.1)
+        
+        assert mq.get_nowait() is None
+        assert mq.delayed_size() == 1
+        
+        start = time.monotonic()
+        assert mq.get(timeout=1.0) == "later"
+        assert 0.05 <= time.monotonic() - start < 0.2
+        assert mq.delayed_size() == 0
+    
+    def test_due_order(self):
+        """Test messages are released by due time, ties in put order"""
+        mq = MessageQueue()
+        mq.put("c", delay=0.15)
+        mq.put("a", delay=0.05)
+        mq.put("b1", delay=0.1)
+        mq.put("b2", delay=0.1)
+        mq.put("now")
+        
+        assert [mq.get(timeout=1.0) for _ in range(5)] == ["now", "a", "b1", "b2", "c"]
+    
+    def test_earlier_message_wakes_timer(self):
+        """Test scheduling an earlier deadline is not stuck behind a later one"""
+        mq = MessageQueue()
+        mq.put("slow", delay=5.0)
+        time.sleep(0.02)
+        mq.put("fast", delay=0.05)
+        
+        start = time.monotonic()
+        assert mq.get(timeout=1.0) == "fast"
+        assert time.monotonic() - start < 0.3
+    
+    def test_put_at_wall_clock(self):
+        """Test put_at takes a time.time() timestamp"""
+        mq = MessageQueue()
+        mq.put_at("scheduled", time.time() + 0.05)
+        mq.put_at("overdue", time.time() - 10)
+        
+        assert mq.get_nowait() == "overdue"
+        assert mq.get(timeout=1.0) == "scheduled"
+    
+    def test_due_messages_bypass_max_size(self):
+        """Test the timer never blocks on a full queue"""
+        mq = MessageQueue(max_size=1)
+        mq.put("fill")
+        mq.put("delayed", delay=0.02)
+        time.sleep(0.1)
+        
+        assert mq.size() == 2
+        assert mq.put_nowait("extra") is False
+    
+    def test_join_waits_for_delayed(self):
+        """Test scheduled messages are unfinished tasks from the start"""
+        mq = MessageQueue()
+        mq.put("job", delay=0.05)
+        
+        assert mq.join(timeout=0) is False
+        assert mq.get(timeout=1.0) == "job"
+        mq.task_done()
+        assert mq.join(timeout=0) is True
+    
+    def test_single_timer_thread(self):
+        """Test many delayed messages share one timer thread that exits when idle"""
+        mq = MessageQueue()
+        before = threading.active_count()
+        for i in range(1000):
+            mq.put(i, delay=0.05 + i / 100_000)
+        
+        assert threading.active_count() - before == 1
+        assert sorted(mq.get_batch(1000, max_wait=2.0)) == list(range(1000))
+        time.sleep(0.05)
+        assert mq._timer is None
+        
+        mq.put("again", delay=0.01)
+        assert mq.get(timeout=1.0) == "again"
+    
+    def test_timer_failure_reported_and_recovers(self, monkeypatch):
+        """Test a storage error surfaces, keeps the messages and frees the timer"""
+        class FlakyQueue(MessageQueue):
+            failures = 1
+            
+            def _put_batch(self, messages):
+                if self.failures:
+                    self.failures -= 1
+                    raise OSError("disk full")
+                super()._put_batch(messages)
+        
+        errors = []
+        monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+        mq = FlakyQueue()
+        mq.put("retry", delay=0.01)
+        time.sleep(0.1)
+        
+        assert [type(e) for e in errors] == [OSError]
+        assert mq._timer is None
+        assert mq.delayed_size() == 1  # put back, not lost
+        
+        mq.put("next", delay=0.01)  # starts a fresh timer
+        assert mq.get_batch(2, max_wait=1.0) == ["retry", "next"]
+
+
+class TestPriorityQueue:
+    """Test cases for Priority Queue"""
+    
+    def test_priority_order(self):
+        """Test higher priority comes out first"""
+        pq = PriorityQueue()
+        pq.put("low", priority=1)
+        pq.put("high", priority=10)
+        pq.put("medium", priority=5)
+        
+        assert [pq.get() for _ in range(3)] == ["high", "medium", "low"]
+    
+    def test_fifo_within_priority(self):
+        """Test equal priorities keep insertion order"""
+        pq = PriorityQueue()
+        for i in range(5):
+            pq.put(f"a{i}", priority=1)
+            pq.put(f"b{i}", priority=2)
+        
+        assert pq.get_many(10) == [f"b{i}" for i in range(5)] + [f"a{i}" for i in range(5)]
+    
+    def test_uncomparable_messages(self):
+        """Test messages are never compared with each other"""
+        pq = PriorityQueue()
+        pq.put({"id": 1})
+        pq.put({"id": 2})
+        
+        assert pq.get() == {"id": 1}
+    
+    def test_get_empty_non_blocking(self):
+        """Test default get returns None at once on an empty queue"""
+        pq = PriorityQueue()
+        
+        start = time.monotonic()
+        assert pq.get() is None
+        assert time.monotonic() - start < 0.05
+    
+    def test_get_timeout(self):
+        """Test get waits for the timeout and then gives up"""
+        pq = PriorityQueue()
+        
+        start = time.monotonic()
+        assert pq.get(timeout=0.1) is None
+        assert time.monotonic() - start >= 0.1
+    
+    def test_blocking_get_woken_by_put(self):
+        """Test a waiting consumer receives a message put later"""
+        pq = PriorityQueue()
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(pq.get(timeout=None)))
+        consumer.start()
+        
+        time.sleep(0.05)
+        pq.put("hello")
+        consumer.join(timeout=1.0)
+        
+        assert result == ["hello"]
+    
+    def test_put_many(self):
+        """Test bulk put merges correctly into existing messages"""
+        pq = PriorityQueue()
+        pq.put("x", priority=3)
+        pq.put_many([("a", 1), ("b", 5), ("c", 3)])
+        pq.put_many([("d", 4)])
+        pq.put_many([])
+        
+        assert pq.size() == 5
+        assert pq.get_many(10) == ["b", "d", "x", "c", "a"]
+    
+    def test_get_many_limits(self):
+        """Test get_many returns at most max_items"""
+        pq = PriorityQueue()
+        pq.put_many((i, 0) for i in range(10))
+        
+        assert pq.get_many(3) == [0, 1, 2]
+        assert pq.get_many(0) == []
+        assert pq.size() == 7
+    
+    def test_concurrent_consumers(self):
+        """Test each message is delivered exactly once across threads"""
+        pq = PriorityQueue()
+        received = []
+        lock = threading.Lock()
+        
+        def consumer():
+            while True:
+                batch = pq.get_many(50, timeout=0.2)
+                if not batch:
+                    return
+                with lock:
+                    received.extend(batch)
+        
+        threads = [threading.Thread(target=consumer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        pq.put_many((i, i % 7) for i in range(5000))
+        for t in threads:
+            t.join()
+        
+        assert sorted(received) == list(range(5000))
@@ -0,0 +1,203 @@
+"""
+Unit tests for the persistent (two-tier) cache
+"""
+
+import os
+import pytest
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dsa.design_patterns.lru_cache import LRUCache
+from system_design.cache_strategies import TimeBasedCache
+from system_design.persistent_cache import SegmentStore, TieredCache
+
+
+class TestSegmentStore:
+    """Test cases for the on-disk segment store"""
+    
+    def test_put_get_delete(self, tmp_path):
+        """Test basic round trip, overwrite and tombstones"""
+        with SegmentStore(str(tmp_path)) as store:
+            store.put("a", {"x": 1})
+            store.put("b", None)
+            store.put("a", {"x": 2})
+            
+            assert store.get("a") == {"x": 2}
+            assert store.get_entry("b") == (None, None)
+            assert store.get("missing", "default") == "default"
+            
+            assert store.delete("a") is True
+            assert store.delete("a") is False
+            assert store.get("a") is None
+    
+    def test_reopen_after_clean_close(self, tmp_path):
+        """Test data and index survive a restart"""
+        with SegmentStore(str(tmp_path)) as store:
+            for i in range(100):
+                store.put(i, i * i)
+            store.delete(7)
+        
+        with SegmentStore(str(tmp_path)) as store:
+            assert store.get(9) == 81
+            assert store.get(7) is None
+            assert store.get(99) == 9801
+    
+    def test_index_grows(self, tmp_path):
+        """Test the mmap index doubles past its load factor"""
+        with SegmentStore(str(tmp_path), initial_slots=16) as store:
+            for i in range(500):
+                store.put(f"key{i}", i)
+            
+            assert store.slots >= 1024
+            assert all(store.get(f"key{i}") == i for i in range(500))
+        
+        with SegmentStore(str(tmp_path)) as store:
+            assert store.get("key321") == 321
+    
+    def test_expiry(self, tmp_path):
+        """Test expired records are not returned"""
+        with SegmentStore(str(tmp_path)) as store:
+            store.put("old", 1, expires_at=time.time() - 1)
+            store.put("new", 2, expires_at=time.time() + 60)
+            
+            assert store.get("old") is None
+            assert store.get("new") == 2
+    
+    def test_compaction_drops_dead_records(self, tmp_path):
+        """Test compaction shrinks the log and keeps live data"""
+        with SegmentStore(str(tmp_path)) as store:
+            for round_ in range(10):
+                for i in range(50):
+                    store.put(i, (round_, i))
+            store.delete(0)
+            size_before = store.log_size
+            
+            store.compact()
+            
+            assert store.log_size < size_before / 5
+            assert store.get(0) is None
+            assert store.get(49) == (9, 49)
+        
+        with SegmentStore(str(tmp_path)) as store:
+            assert store.get(10) == (9, 10)
+    
+    def test_auto_compaction(self, tmp_path):
+        """Test compaction triggers once dead bytes dominate the log"""
+        with SegmentStore(str(tmp_path), min_compact_bytes=10_000) as store:
+            for _ in range(200):
+                store.put("hot", "x" * 100)
+            
+            assert store.generation > 1
+            assert store.get("hot") == "x" * 100
+    
+    def test_dead_bytes_survive_reopen(self, tmp_path):
+        """Test garbage written before a restart still counts toward compaction"""
+        with SegmentStore(str(tmp_path)) as store:
+            for round_ in range(5):
+                for i in range(20):
+                    store.put(i, (round_, i))
+            store.delete(0)
+            dead_before = store.dead_bytes
+        assert dead_before > 0
+        
+        with SegmentStore(str(tmp_path)) as store:
+            assert store.dead_bytes == dead_before
+        
+        with SegmentStore(str(tmp_path), min_compact_bytes=0, compact_ratio=0.5) as store:
+            store.put("trigger", 1)
+            assert store.generation > 1
+            assert store.get(19) == (4, 19)
+    
+    def test_recovery_after_crash(self, tmp_path):
+        """Test an unclean shutdown with a torn tail record recovers"""
+        store = SegmentStore(str(tmp_path))
+        for i in range(20):
+            store.put(i, str(i))
+        # Simulate a crash: no close(), then a half-written record
+        store.log.flush()
+        with open(store.log_path, "ab") as f:
+            f.write(b"\x01\x02\x03 torn record")
+        size_with_garbage = os.path.getsize(store.log_path)
+        
+        recovered = SegmentStore(str(tmp_path))
+        try:
+            assert os.path.getsize(recovered.log_path) < size_with_garbage
+            assert recovered.get(19) == "19"
+            recovered.put("after", "crash")
+            assert recovered.get("after") == "crash"
+        finally:
+            recovered.close()
+    
+    def test_generation_mismatch_rebuilds_index(self, tmp_path):
+        """Test a stale index from before compaction is rebuilt"""
+        with SegmentStore(str(tmp_path)) as store:
+            store.put("a", 1)
+        stale_index = (tmp_path / "index.map").read_bytes()
+        
+        with SegmentStore(str(tmp_path)) as store:
+            store.put("a", 2)
+            store.compact()
+        (tmp_path / "index.map").write_bytes(stale_index)
+        
+        with SegmentStore(str(tmp_path)) as store:
+            assert store.get("a") == 2
+
+
+class TestTieredCache:
+    """Test cases for the two-tier cache"""
+    
+    def test_lru_front_warm_restart(self, tmp_path):
+        """Test a restarted process serves hits straight from disk"""
+        cache = TieredCache(LRUCache(2), SegmentStore(str(tmp_path)))
+        for i in range(5):
+            cache.put(i, -1 if i == 0 else i)  # -1 is LRUCache's miss marker
+        assert cache.get(0) == -1
+        assert cache.store_hits == 1
+        cache.close()
+        
+        cache = TieredCache(LRUCache(2), SegmentStore(str(tmp_path)))
+        try:
+            assert cache.get(3) == 3  # From disk
+            assert cache.get(3) == 3  # Promoted into memory
+            assert (cache.store_hits, cache.front_hits) == (1, 1)
+            assert cache.get(42, "none") == "none"
+        finally:
+            cache.close()
+    
+    def test_ttl_through_lru_front(self, tmp_path):
+        """Test a per-entry TTL expires even when the front has no TTL support"""
+        cache = TieredCache(LRUCache(10), SegmentStore(str(tmp_path)))
+        try:
+            cache.put("a", 1)
+            cache.put("b", 2, ttl=0.05)
+            assert cache.get("b") == 2
+            time.sleep(0.1)
+            
+            assert cache.get("b") is None
+            assert cache.front.get("b") == -1  # evicted from the front
+            assert cache.get("a") == 1
+        finally:
+            cache.close()
+    
+    def test_ttl_front(self, tmp_path):
+        """Test TimeBasedCache front and store share the expiry"""
+        cache = TieredCache(TimeBasedCache(default_ttl=60), SegmentStore(str(tmp_path)))
+        try:
+            cache.put("a", 1)
+            cache.put("b", 2, ttl=0.05)
+            time.sleep(0.1)
+            
+            assert cache.get("a") == 1
+            assert cache.get("b") is None
+            
+            assert cache.delete("a") is True
+            assert cache.get("a") is None
+        finally:
+            cache.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,196 @@
+"""
+Unit tests for topic-based pub/sub
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.pubsub import PubSub, Topic, partition_for
+
+
+@pytest.fixture
+def broker():
+    broker = PubSub()
+    broker.create_topic("events", partitions=4)
+    return broker
+
+
+class TestTopic:
+    """Test cases for topics and partitioning"""
+    
+    def test_key_always_same_partition(self):
+        """Test keys map to a stable partition and keep their order"""
+        topic = Topic("t", partitions=8)
+        placements = [topic.publish(i, key="user-1") for i in range(5)]
+        
+        assert {p for p, _ in placements} == {partition_for("user-1", 8)}
+        assert [offset for _, offset in placements] == [0, 1, 2, 3, 4]
+    
+    def test_partition_for_is_stable(self):
+        """Test the mapping does not depend on the process hash seed"""
+        assert partition_for("user-1", 8) == partition_for(b"user-1", 8) == 4
+    
+    def test_unkeyed_round_robin(self):
+        """Test messages without a key are spread evenly"""
+        topic = Topic("t", partitions=4)
+        topic.publish_batch((i, None) for i in range(8))
+        
+        assert [len(p.log) for p in topic.partitions] == [2, 2, 2, 2]
+    
+    def test_retention(self):
+        """Test old messages are trimmed and offsets keep counting"""
+        topic = Topic("t", partitions=1, retention=4)
+        for i in range(20):
+            topic.publish(i)
+        partition = topic.partitions[0]
+        
+        assert 4 <= len(partition.log) < 6
+        assert partition.end_offset == 20
+        assert partition.log[-1].value == 19
+    
+    def test_invalid_partitions(self):
+        with pytest.raises(ValueError):
+            Topic("t", partitions=0)
+
+
+class TestConsumerGroups:
+    """Test cases for consumer groups"""
+    
+    def test_group_receives_everything_once(self, broker):
+        """Test a group's members split the messages between them"""
+        consumers = [broker.subscribe("events", "g", f"c{i}") for i in range(2)]
+        for i in range(100):
+            broker.publish("events", i, key=i)
+        
+        received = [m.value for c in consumers for m in c.poll(max_items=1000, timeout=0)]
+        
+        assert sorted(received) == list(range(100))
+        assert sorted(consumers[0].assignment + consumers[1].assignment) == [0, 1, 2, 3]
+    
+    def test_fan_out_shares_messages(self, broker):
+        """Test every group sees every message, as the same objects"""
+        a = broker.subscribe("events", "a", "a0")
+        b = broker.subscribe("events", "b", "b0")
+        payload = {"big": "payload"}
+        broker.publish("events", payload, key="k")
+        
+        got_a, got_b = a.poll(timeout=0), b.poll(timeout=0)
+        
+        assert got_a == got_b
+        assert got_a[0] is got_b[0]
+        assert got_a[0].value is payload
+    
+    def test_backlog_does_not_starve_other_partitions(self, broker):
+        """Test each poll starts at the next partition, so quiet ones are served"""
+        consumer = broker.subscribe("events", "g", "c0")
+        keys = {}
+        for i in range(100):
+            keys.setdefault(partition_for(i, 4), i)
+        for _ in range(1000):
+            broker.publish("events", "backlog", key=keys[0])  # first partition polled
+        for p in (1, 2, 3):
+            broker.publish("events", f"quiet-{p}", key=keys[p])
+        
+        seen = {m.partition for _ in range(4) for m in consumer.poll(max_items=10, timeout=0)}
+        assert seen == {0, 1, 2, 3}
+    
+    def test_range_assignment(self, broker):
+        """Test partitions are split into contiguous ranges"""
+        consumers = [broker.subscribe("events", "g", f"c{i}") for i in range(3)]
+        
+        assert [c.assignment for c in consumers] == [[0, 1], [2], [3]]
+        
+        extra = broker.subscribe("events", "g", "c3")
+        idle = broker.subscribe("events", "g", "c4")
+        assert extra.assignment == [3]
+        assert idle.assignment == []
+    
+    def test_rebalance_on_leave_resumes_from_commit(self, broker):
+        """Test partitions of a leaving member move on from the committed offset"""
+        c0 = broker.subscribe("events", "g", "c0", auto_commit=False)
+        c1 = broker.subscribe("events", "g", "c1", auto_commit=False)
+        broker.topic("events").publish_batch((i, None) for i in range(8))
+        
+        c1_first = c1.poll(max_items=2, timeout=0)
+        c1.commit()
+        c1.poll(timeout=0)  # delivered but never committed
+        c1.close()
+        
+        taken_over = [m for m in c0.poll(max_items=100, timeout=0) if m.partition in (2, 3)]
+        
+        assert c0.assignment == [0, 1, 2, 3]
+        assert len(c1_first) == 2
+        assert sorted(m.value for m in taken_over) == sorted(
+            v for v in range(8) if v % 4 in (2, 3) and v not in [m.value for m in c1_first])
+    
+    def test_commit_after_rebalance_keeps_owned_partitions(self, broker):
+        """Test a manual commit after another member joins still records progress"""
+        c0 = broker.subscribe("events", "g", "c0", auto_commit=False)
+        broker.topic("events").publish_batch((i, None) for i in range(8))
+        assert len(c0.poll(timeout=0)) == 8
+        
+        c1 = broker.subscribe("events", "g", "c1", auto_commit=False)
+        c0.commit()
+        
+        group = broker.topic("events").group("g")
+        assert group.committed == {0: 2, 1: 2}
+        assert sorted(m.value for m in c1.poll(timeout=0)) == [2, 3, 6, 7]
+    
+    def test_auto_commit_and_lag(self, broker):
+        """Test auto_commit commits the previous poll on the next one"""
+        consumer = broker.subscribe("events", "g", "c0")
+        group = broker.topic("events").group("g")
+        for i in range(10):
+            broker.publish("events", i)
+        
+        consumer.poll(timeout=0)
+        assert group.lag() == 10
+        consumer.poll(timeout=0)
+        assert group.lag() == 0
+    
+    def test_duplicate_member(self, broker):
+        broker.subscribe("events", "g", "c0")
+        
+        with pytest.raises(ValueError):
+            broker.subscribe("events", "g", "c0")
+    
+    def test_poll_timeout_and_wakeup(self, broker):
+        """Test poll waits like MessageQueue.get and wakes on publish"""
+        consumer = broker.subscribe("events", "g", "c0")
+        
+        start = time.monotonic()
+        assert consumer.poll(timeout=0.1) == []
+        assert time.monotonic() - start >= 0.1
+        
+        result = []
+        thread = threading.Thread(target=lambda: result.extend(consumer.poll(timeout=2.0)))
+        thread.start()
+        time.sleep(0.05)
+        broker.publish("events", "hello")
+        thread.join(timeout=2.0)
+        
+        assert [m.value for m in result] == ["hello"]
+    
+    def test_consumer_behind_retention_skips_ahead(self):
+        """Test a slow consumer continues from the oldest retained message"""
+        broker = PubSub()
+        broker.create_topic("t", partitions=1, retention=5)
+        consumer = broker.subscribe("t", "g", "c0")
+        for i in range(50):
+            broker.publish("t", i)
+        
+        values = [m.value for m in consumer.poll(max_items=100, timeout=0)]
+        
+        assert values[-1] == 49
+        assert values == list(range(values[0], 50))
+    
+    def test_unknown_topic(self, broker):
+        with pytest.raises(ValueError):
+            broker.publish("missing", 1)
+        with pytest.raises(ValueError):
+            broker.create_topic("events")
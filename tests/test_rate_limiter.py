@@ -0,0 +1,200 @@
+"""
+Unit tests for rate limiters
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.rate_limiter import (
+    GCRA, MultiTenantLimiter, ShardedRateLimiter, SlidingWindowCounter, SlidingWindowLog, TokenBucket
+)
+from tests.conftest import FakeClock
+
+
+class TestTokenBucket:
+    """Test cases for Token Bucket"""
+    
+    def test_burst_then_limit(self):
+        """Test bucket allows a burst up to capacity"""
+        bucket = TokenBucket(capacity=3, refill_rate=0.001)
+        
+        assert [bucket.allow_request() for _ in range(4)] == [True, True, True, False]
+    
+    def test_is_idle(self):
+        """Test a bucket is idle only once it could have refilled"""
+        bucket = TokenBucket(capacity=10, refill_rate=1.0)
+        bucket.allow_request(5)
+        now = bucket.last_refill
+        
+        assert not bucket.is_idle(now)
+        assert not bucket.is_idle(now + 4.0)
+        assert bucket.is_idle(now + 5.0)
+        assert not bucket.is_idle(now + 5.0, idle_timeout=10.0)
+
+
+class TestShardedRateLimiter:
+    """Test cases for Sharded Rate Limiter"""
+    
+    def test_per_user_limits(self):
+        """Test each user gets an independent bucket"""
+        limiter = ShardedRateLimiter(capacity=2, refill_rate=0.001, num_shards=4)
+        
+        assert limiter.allow_request("alice")
+        assert limiter.allow_request("alice")
+        assert not limiter.allow_request("alice")
+        assert limiter.allow_request("bob")
+        assert len(limiter) == 2
+    
+    def test_allow_many(self):
+        """Test batch decisions come back in input order"""
+        limiter = ShardedRateLimiter(capacity=2, refill_rate=0.001)
+        
+        results = limiter.allow_many(["a", "a", "b", "a", "b", "b"])
+        assert results == [True, True, True, False, True, False]
+    
+    def test_evict_idle(self):
+        """Test only full, unused buckets are evicted"""
+        limiter = ShardedRateLimiter(capacity=5, refill_rate=0.001, idle_timeout=0.0)
+        limiter.allow_request("fresh", tokens=0)
+        limiter.allow_request("busy", tokens=3)
+        
+        assert limiter.evict_idle() == 1
+        assert len(limiter) == 1
+        # The busy user's state survived eviction
+        assert limiter.allow_request("busy", tokens=2)
+        assert not limiter.allow_request("busy")
+    
+    def test_eviction_racing_a_request(self):
+        """Test a request that spends from a just-evicted bucket is redone on the live one"""
+        limiter = ShardedRateLimiter(capacity=1, refill_rate=0.001, idle_timeout=0.0)
+        limiter.allow_request("alice", tokens=0)
+        bucket = limiter.shards[hash("alice") % limiter.num_shards]["alice"]
+        
+        # A sweep lands between the lock-free lookup and the spend
+        spend = bucket.allow_request
+        
+        def allow_after_sweep(tokens=1):
+            assert limiter.evict_idle() == 1
+            return spend(tokens)
+        
+        bucket.allow_request = allow_after_sweep
+        
+        assert limiter.allow_request("alice")
+        assert not limiter.allow_request("alice")  # no second burst
+        assert len(limiter) == 1
+    
+    def test_shards_sweep_as_they_grow(self):
+        """Test one-off users do not grow the table without bound"""
+        limiter = ShardedRateLimiter(capacity=1, refill_rate=1.0, num_shards=2,
+                                     idle_timeout=0.0, min_sweep_size=16)
+        for i in range(10_000):
+            limiter.allow_request(f"user{i}", tokens=0)
+        
+        assert len(limiter) < 100
+    
+    def test_concurrent_requests(self):
+        """Test the total allowed never exceeds capacity under contention"""
+        limiter = ShardedRateLimiter(capacity=100, refill_rate=0.001, num_shards=8)
+        allowed = []
+        
+        def worker():
+            allowed.append(sum(limiter.allow_many(["shared"] * 100)))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sum(allowed) == 100
+
+
+class TestSlidingWindowCounter:
+    """Test cases for Sliding Window Counter"""
+    
+    def test_limit_within_window(self):
+        """Test the limit applies inside the first window"""
+        clock = FakeClock()
+        limiter = SlidingWindowCounter(max_requests=3, window_seconds=10, clock=clock)
+        
+        assert [limiter.allow_request() for _ in range(4)] == [True, True, True, False]
+    
+    def test_previous_window_is_weighted(self):
+        """Test the previous window counts in proportion to its overlap"""
+        clock = FakeClock()
+        limiter = SlidingWindowCounter(max_requests=10, window_seconds=10, clock=clock)
+        for _ in range(10):
+            assert limiter.allow_request()
+        
+        # 2.5s into the next window: 75% of the previous 10 still count
+        clock.now += 12.5
+        allowed = sum(limiter.allow_request() for _ in range(10))
+        assert allowed == 2
+    
+    def test_sub_windows_slide_smoothly(self):
+        """Test finer slices release capacity slice by slice"""
+        clock = FakeClock()
+        limiter = SlidingWindowCounter(max_requests=10, window_seconds=10,
+                                       sub_windows=10, clock=clock)
+        for _ in range(10):
+            assert limiter.allow_request()
+        
+        clock.now += 11.0  # The first slice has fully left the window
+        assert limiter.allow_request()
+    
+    def test_is_idle(self):
+        """Test a counter is idle once its slices leave the window"""
+        clock = FakeClock()
+        limiter = SlidingWindowCounter(max_requests=5, window_seconds=10, clock=clock)
+        assert limiter.is_idle(clock.now)
+        
+        limiter.allow_request()
+        assert not limiter.is_idle(clock.now + 5)
+        assert limiter.is_idle(clock.now + 20)
+
+
+class TestGCRA:
+    """Test cases for GCRA"""
+    
+    def test_burst_then_sustained_rate(self):
+        """Test burst requests pass, then one per emission interval"""
+        clock = FakeClock()
+        limiter = GCRA(max_requests=10, window_seconds=10, burst=3, clock=clock)
+        
+        assert [limiter.allow_request() for _ in range(4)] == [True, True, True, False]
+        clock.now += 1.0
+        assert limiter.allow_request()
+        assert not limiter.allow_request()
+    
+    def test_is_idle(self):
+        """Test GCRA is idle once its TAT has passed"""
+        clock = FakeClock()
+        limiter = GCRA(max_requests=10, window_seconds=10, clock=clock)
+        limiter.allow_request(tokens=5)
+        
+        assert not limiter.is_idle(clock.now)
+        assert limiter.is_idle(clock.now + 5)
+
+
+class TestMultiTenantLimiter:
+    """Test cases for the generic multi-tenant wrapper"""
+    
+    @pytest.mark.parametrize("factory", [
+        lambda: SlidingWindowLog(2, 60),
+        lambda: SlidingWindowCounter(2, 60),
+        lambda: GCRA(2, 60),
+    ])
+    def test_wraps_any_limiter(self, factory):
+        """Test each key gets its own limiter of the given kind"""
+        limiter = MultiTenantLimiter(factory, num_shards=4)
+        
+        assert limiter.allow_many(["a", "a", "a", "b"]) == [True, True, False, True]
+        assert len(limiter) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
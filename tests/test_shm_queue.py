@@ -0,0 +1,161 @@
+"""
+Unit tests for the shared memory queue
+"""
+
+import multiprocessing
+from collections import deque
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from system_design.shm_queue import SharedMemoryQueue
+
+
+def _produce(queue, base, count):
+    for i in range(count):
+        queue.put((base + i).to_bytes(4, "little") * 10)
+    queue.close()
+
+
+def _consume(queue, results):
+    got = []
+    while True:
+        with queue.get_view() as view:
+            if len(view) == 0:
+                break
+            got.append(int.from_bytes(view[:4], "little"))
+    results.put(got)
+    queue.close()
+
+
+@pytest.fixture
+def queue():
+    with SharedMemoryQueue(capacity=256) as q:
+        yield q
+
+
+class TestSharedMemoryQueue:
+    """Test cases for SharedMemoryQueue"""
+    
+    def test_fifo(self, queue):
+        """Test records come back in order and intact"""
+        for i in range(5):
+            assert queue.put(bytes([i]) * (i + 1))
+        
+        assert queue.size() == 5
+        assert [queue.get() for _ in range(5)] == [bytes([i]) * (i + 1) for i in range(5)]
+        assert queue.get_nowait() is None
+    
+    def test_wraparound(self, queue):
+        """Test records keep flowing through many laps of a small ring"""
+        expected = deque()
+        for i in range(200):
+            payload = bytes([i % 256]) * (1 + i % 50)
+            assert queue.put(payload)
+            expected.append(payload)
+            if i % 3 == 2:
+                for _ in range(3):
+                    assert queue.get() == expected.popleft()
+        
+        assert [queue.get() for _ in range(len(expected))] == list(expected)
+        assert queue.empty()
+    
+    def test_padding_keeps_records_contiguous(self, queue):
+        """Test a record that would straddle the end is written at the start"""
+        queue.put(b"a" * 100)
+        queue.put(b"b" * 100)
+        assert queue.get() == b"a" * 100
+        
+        # 24 bytes left at the tail: this record needs padding + a wrap
+        queue.put(b"c" * 60)
+        assert queue.get() == b"b" * 100
+        with queue.get_view() as view:
+            assert view.tobytes() == b"c" * 60
+    
+    def test_full_ring_back_pressure(self, queue):
+        """Test put fails when full and succeeds once space is freed"""
+        while queue.put_nowait(b"x" * 56):
+            pass
+        
+        start = time.monotonic()
+        assert queue.put(b"y", timeout=0.1) is False
+        assert time.monotonic() - start >= 0.1
+        
+        queue.get()
+        assert queue.put_nowait(b"y")
+    
+    def test_blocked_put_woken_by_get(self, queue):
+        """Test a producer blocked on a full ring resumes after a get"""
+        while queue.put_nowait(b"x" * 56):
+            pass
+        done = []
+        producer = threading.Thread(target=lambda: done.append(queue.put(b"late", timeout=2.0)))
+        producer.start()
+        
+        time.sleep(0.05)
+        queue.get()
+        producer.join(timeout=2.0)
+        
+        assert done == [True]
+    
+    def test_view_is_zero_copy_and_holds_space(self, queue):
+        """Test a view reads shared memory in place and pins its space"""
+        queue.put(b"z" * 200)
+        
+        with queue.get_view() as view:
+            assert isinstance(view, memoryview)
+            assert view.obj is not None
+            assert view.tobytes() == b"z" * 200
+            assert queue.put_nowait(b"w" * 100) is False  # space still claimed
+        assert queue.put_nowait(b"w" * 100) is True
+    
+    def test_get_view_timeout(self, queue):
+        """Test get_view yields None when nothing arrives"""
+        with queue.get_view(timeout=0.05) as view:
+            assert view is None
+    
+    def test_largest_record(self, queue):
+        """Test a record of capacity - 8 bytes fits, a bigger one is rejected"""
+        queue.put(b"a")
+        queue.get()
+        
+        assert queue.put(b"m" * 248)
+        assert queue.get() == b"m" * 248
+        with pytest.raises(ValueError):
+            queue.put(b"m" * 249)
+    
+    def test_large_payload_copied_outside_lock(self):
+        """Test records above the inline threshold round-trip too"""
+        with SharedMemoryQueue(capacity=1 << 16) as q:
+            payload = bytes(range(256)) * 40
+            q.put(payload)
+            assert q.get() == payload
+    
+    def test_multiple_processes(self):
+        """Test several producer and consumer processes share one ring"""
+        results = multiprocessing.Queue()
+        with SharedMemoryQueue(capacity=1024) as q:
+            consumers = [multiprocessing.Process(target=_consume, args=(q, results)) for _ in range(2)]
+            producers = [multiprocessing.Process(target=_produce, args=(q, n * 10_000, 300))
+                         for n in range(2)]
+            for p in consumers + producers:
+                p.start()
+            for p in producers:
+                p.join(timeout=20)
+            for _ in consumers:
+                q.put(b"")
+            got = [results.get(timeout=20) for _ in consumers]
+            for p in consumers:
+                p.join(timeout=20)
+        
+        received = sorted(v for part in got for v in part)
+        assert received == sorted(n * 10_000 + i for n in range(2) for i in range(300))
+        for part in got:
+            # Each producer's records arrive in order within a consumer
+            for n in range(2):
+                mine = [v for v in part if v // 10_000 == n]
+                assert mine == sorted(mine)
@@ -0,0 +1,134 @@
+"""
+Memoization decorator with bounded, pluggable eviction policies
+
+Replaces ad-hoc memo dicts, which grow forever in long-running processes.
+The memo table is one of the repository's caches:
+    'lru' -> dsa.design_patterns.lru_cache.LRUCache (bounded by maxsize)
+    'lfu' -> system_design.cache_strategies.LFUCache (bounded by maxsize)
+    'ttl' -> system_design.cache_strategies.TimeBasedCache (bounded by age)
+"""
+
+from collections import namedtuple
+from functools import wraps
+from threading import Lock, local
+from typing import Any, Callable, Optional
+
+from dsa.design_patterns.lru_cache import LRUCache
+from system_design.cache_strategies import LFUCache, TimeBasedCache
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "policy"])
+
+_KWARGS_MARK = object()  # separates positional from keyword arguments in keys
+_FAST_TYPES = {int, str}
+
+
+def _make_key(args: tuple, kwargs: dict) -> Any:
+    """Hashable key for a call; a lone int/str argument is used as-is"""
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    if len(args) == 1 and type(args[0]) in _FAST_TYPES:
+        return args[0]
+    return args
+
+
+def _make_cache(policy: str, maxsize: Optional[int], ttl: Optional[float]):
+    """Build the backing cache for a policy name"""
+    capacity = float("inf") if maxsize is None else maxsize
+    if policy == "lru":
+        return LRUCache(capacity)
+    if policy == "lfu":
+        return LFUCache(capacity)
+    if policy == "ttl":
+        if ttl is None:
+            raise ValueError("policy='ttl' requires ttl (seconds)")
+        return TimeBasedCache(default_ttl=ttl)
+    raise ValueError(f"Unknown policy {policy!r}; use 'lru', 'lfu' or 'ttl'")
+
+
+def memoize(policy: str = "lru", maxsize: Optional[int] = 128,
+            ttl: Optional[float] = None, fill_from: Optional[int] = None) -> Callable:
+    """
+    Decorator caching results by call arguments
+
+    policy: 'lru', 'lfu' or 'ttl'
+    maxsize: Entry limit for 'lru'/'lfu' (None = unbounded)
+    ttl: Seconds an entry lives, required for 'ttl'
+    fill_from: For recursions over a single int n, an outermost miss first
+        computes fill_from..n-1 in ascending order, so every nested call
+        hits the cache and the stack stays shallow however large n is
+
+    The wrapped function gains:
+        cache_info()  -> CacheInfo(hits, misses, maxsize, currsize, policy)
+        cache_clear() -> drop all entries and reset counters
+        bypass(...)   -> call the original function without the cache
+
+    Thread-safe: the lock only guards cache lookups and stores, never the
+    call itself, so recursive memoized functions do not deadlock. Two
+    threads missing on the same key may both compute it.
+    """
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be at least 1 (or None for unbounded)")
+
+    def decorator(func: Callable) -> Callable:
+        lock = Lock()
+        state = {"cache": _make_cache(policy, maxsize, ttl), "hits": 0, "misses": 0}
+        filling = local()  # per thread: is a bottom-up fill in progress
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(args, kwargs)
+            with lock:
+                # Values are stored as 1-tuples so a cached None or -1 is
+                # never mistaken for the caches' miss markers
+                entry = state["cache"].get(key)
+                if isinstance(entry, tuple):
+                    state["hits"] += 1
+                    return entry[0]
+                state["misses"] += 1
+
+            if fill_from is not None and type(key) is int and not getattr(filling, "active", False):
+                filling.active = True
+                try:
+                    for k in range(fill_from, key):
+                        wrapper(k)
+                finally:
+                    filling.active = False
+
+            result = func(*args, **kwargs)
+
+            with lock:
+                cache = state["cache"]
+                cache.put(key, (result,))
+                if policy == "ttl":
+                    cache.cleanup()  # O(expired): keeps the table bounded by age
+            return result
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                # The TTL cache is bounded by age, not entry count
+                return CacheInfo(state["hits"], state["misses"],
+                                 None if policy == "ttl" else maxsize,
+                                 len(state["cache"]), policy)
+
+        def cache_clear() -> None:
+            with lock:
+                state["cache"] = _make_cache(policy, maxsize, ttl)
+                state["hits"] = state["misses"] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.bypass = func
+        return wrapper
+
+    return decorator
+
+
+# Example usage
+if __name__ == "__main__":
+    @memoize(policy="lru", maxsize=64)
+    def fib(n: int) -> int:
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    print(f"fib(300) = {fib(300)}")
+    print(fib.cache_info())  # currsize never exceeds 64
+    print(f"bypass fib(20) = {fib.bypass(20)}")  # inner calls still hit the cache
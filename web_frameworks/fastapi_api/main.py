@@ -11,6 +11,9 @@ import jwt
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 import asyncio
+import math
+
+from system_design.async_rate_limiter import AsyncRateLimiter, RateLimitMiddleware
 
 app = FastAPI(title="Todo API", version="1.0.0")
 security = HTTPBearer()
@@ -21,6 +24,13 @@ SECRET_KEY = "your-secret-key-here"  # Use environment variable in production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Rate limiting: per client IP on every route, per user on the todo API.
+# Requests queue for up to RATE_LIMIT_MAX_WAIT seconds, then get 429.
+RATE_LIMIT_MAX_WAIT = 0.5
+ip_limiter = AsyncRateLimiter(capacity=60, refill_rate=10.0)
+user_limiter = AsyncRateLimiter(capacity=20, refill_rate=5.0)
+app.add_middleware(RateLimitMiddleware, limiter=ip_limiter, max_wait=RATE_LIMIT_MAX_WAIT)
+
 # In-memory storage (use database in production)
 users_db = {}
 todos_db = {}
@@ -105,6 +115,17 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return username
 
 
+async def rate_limited_user(current_user: str = Depends(get_current_user)):
+    """Dependency: current user, throttled by the per-user limiter"""
+    if not await user_limiter.acquire(current_user, max_wait=RATE_LIMIT_MAX_WAIT):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(user_limiter.retry_after(current_user)))}
+        )
+    return current_user
+
+
 # Routes
 @app.post("/api/register", status_code=status.HTTP_201_CREATED)
 async def register(user: UserRegister):
@@ -143,7 +164,7 @@ async def login(user: UserLogin):
 
 
 @app.get("/api/todos", response_model=List[Todo])
-async def get_todos(current_user: str = Depends(get_current_user)):
+async def get_todos(current_user: str = Depends(rate_limited_user)):
     """Get all todos for current user"""
     user_todos = [
         Todo(**todo) for todo in todos_db.values() 
@@ -155,7 +176,7 @@ async def get_todos(current_user: str = Depends(get_current_user)):
 @app.post("/api/todos", response_model=Todo, status_code=status.HTTP_201_CREATED)
 async def create_todo(
     todo: TodoCreate,
-    current_user: str = Depends(get_current_user)
+    current_user: str = Depends(rate_limited_user)
 ):
     """Create a new todo"""
     global todo_id_counter
@@ -177,7 +198,7 @@ async def create_todo(
 @app.get("/api/todos/{todo_id}", response_model=Todo)
 async def get_todo(
     todo_id: int,
-    current_user: str = Depends(get_current_user)
+    current_user: str = Depends(rate_limited_user)
 ):
     """Get a specific todo"""
     todo = todos_db.get(todo_id)
@@ -201,7 +222,7 @@ async def get_todo(
 async def update_todo(
     todo_id: int,
     todo_update: TodoUpdate,
-    current_user: str = Depends(get_current_user)
+    current_user: str = Depends(rate_limited_user)
 ):
     """Update a todo"""
     todo = todos_db.get(todo_id)
@@ -231,7 +252,7 @@ async def update_todo(
 @app.delete("/api/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(
     todo_id: int,
-    current_user: str = Depends(get_current_user)
+    current_user: str = Depends(rate_limited_user)
 ):
     """Delete a todo"""
     todo = todos_db.get(todo_id)